@@ -1,15 +1,29 @@
+import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+from itertools import islice
+from cache import MISSING, LRUCache
+from changelog import Change
 from classes import Course, LocalCourse, OffsiteCourse, Teacher
+from migrations import LOGGED_TABLES, STATISTICS, migrate
+from pool import ConnectionPool
+from profiles import PROFILES, apply_pragmas, connect, is_private_memory, pragmas
+from snapshot import Snapshot
+from statements import STATEMENTS, StatementRegistry
+from tracing import QueryStats, SlowQueryLog
 
 
 def get_courses_dec(func):
-    """Decorator to return the list of courses as string"""
-    def wrapper(self) -> str:
-        courses = func(self)  # save the return value of the function
-        result = ""
-        for course in courses:
-            result += self.get_course_str(course['id_course']) + '\n'
-        return result
+    """Decorator to return the courses selected by the query as string
+
+    Decorated function returns name of the statement that selects id_course of the courses to display,
+    arguments of the function are bound to the statement"""
+    def wrapper(self, *args) -> str:
+        return self.get_courses_report(func(self, *args), args)  # build the listing from the returned statement
 
     return wrapper
 
@@ -26,44 +40,443 @@ def check_dec(func):
     return wrapper
 
 
+def cache_dec(func):
+    """Decorator to read the result through the cache of Academy if it has one
+
+    Results for rows that do not exist (None) are not cached, so inserts of new rows need no invalidation"""
+    @wraps(func)
+    def wrapper(self, value):
+        if self.cache is None:
+            return func(self, value)
+        key = (func.__name__, value)
+        result = self.cache.get(key)
+        if result is MISSING:
+            result = func(self, value)
+            if result is not None:
+                self.cache.put(key, result)
+        return result
+
+    return wrapper
+
+
+def snapshot_dec(func):
+    """Decorator to serve the result from the snapshot of Academy if it has an up-to-date one"""
+    @wraps(func)
+    def wrapper(self, *args):
+        if self.snapshot is not None and not self.snapshot.stale:
+            return getattr(self.snapshot, func.__name__)(*args)
+        return func(self, *args)
+
+    return wrapper
+
+
+def write_dec(func):
+    """Decorator to let only one thread at a time write to the database
+
+    Snapshot of Academy becomes stale after the write"""
+    def wrapper(self, *args, **kwargs):
+        with self.write_lock:
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                if self.snapshot is not None:
+                    self.snapshot.stale = True
+
+    return wrapper
+
+
 class Academy:
     """Class that implements Software Academy functionality"""
 
     __db_location = "D:\\sqlite\\db\\python_courses.db"
     __password = "admin"
-    __id_course = 1
+    __id_course = None
+    __page_keys = {'Courses': ('id_course', ('id_course',)),  # table -> (ID column, sort keys)
+                   'LocalCourses': ('id_course', ('id_course', 'name')),
+                   'OffsiteCourses': ('id_course', ('id_course', 'name')),
+                   'Teachers': ('id_teacher', ('id_teacher', 'surname'))}
+
+    def __init__(self, db_location: str = None, pool_size: int = 0, cache_size: int = 0, cache_ttl: float = None,
+                 profile: str = None, id_block: int = 100):
+        """Constructor of Academy that starts work with database
+
+        Works with the database at db_location or with the default one if it is not given. Location is a path,
+        :memory: or file: URI such as file:academy?mode=memory&cache=shared. Nothing is opened until the first
+        statement: then Academy connects, tables of an empty database are created and the schema is migrated.
+        If pool_size is above 0 Academy can be shared between threads: queries are read through a pool
+        of pool_size connections to the database in WAL mode and writes go through a single connection.
+        If cache_size is above 0 get_teacher, get_course, get_program and get_course_teachers are read through
+        LRU cache of cache_size entries that live cache_ttl seconds (until invalidated if cache_ttl is None).
+        If profile is given PRAGMA settings of the named profile of profiles.PROFILES are applied.
+        Courses inserted one by one get IDs from blocks of id_block IDs reserved in the database, so writers
+        in other processes never get the same IDs; IDs of a block left unused when Academy is closed are skipped"""
+        if not isinstance(id_block, int):
+            raise TypeError
+        if id_block <= 0:
+            raise ValueError("Size of ID block must be integer and above 0")
+        if not isinstance(pool_size, int):
+            raise TypeError
+        if pool_size < 0:
+            raise ValueError("Size of the pool must be integer and not below 0")
+        if profile is not None and profile not in PROFILES:
+            raise ValueError(f"Profile must be one of: {', '.join(PROFILES)}")
+        db_location = db_location or Academy.__db_location
+        if pool_size and is_private_memory(db_location):
+            raise ValueError("Pooled connections can share a database in memory only through a cache=shared URI")
+        self.__statements = StatementRegistry(STATEMENTS)  # named queries of Academy
+        self.__cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+        self.__snapshot = None
+        self.__hooks = []  # functions called on every statement
+        self.__location = db_location
+        self.__pool_size = pool_size
+        self.__opened = None  # (write connection, its cursor, pool or None) once the database is opened
+        self.__write_lock = threading.RLock()  # shared with the pool, so it exists before the pool is opened
+        self.__profile = profile  # applied when the database is opened
+        self.__depth = 0  # number of transaction blocks the writer is in
+        self.__id_block = id_block
+        self.__ids = iter(())  # reserved course IDs not handed out yet
+
+    def __open(self) -> tuple:
+        """Opens the database on first use and returns the write connection, its cursor and the pool or None
 
-    def __init__(self):
-        """Constructor of Academy that starts work with database"""
-        self.__connection = sqlite3.connect(Academy.__db_location)  # connect to database
-        self.__connection.row_factory = self.dict_factory  # the result of the query will be perceived as a dictionary
-        self.__cursor = self.__connection.cursor()  # cursor to execute queries
+        Threads that need the database at the same time wait until one of them has opened it"""
+        with self.__write_lock:
+            if self.__opened is None:
+                pool = None
+                if self.__pool_size:
+                    pool = ConnectionPool(self.__location, self.__pool_size, self.dict_factory,
+                                          2 * len(self.__statements), self.__write_lock)
+                    connection = pool.writer
+                else:
+                    connection = connect(self.__location,  # connect to database
+                                         cached_statements=2 * len(self.__statements))
+                connection.row_factory = self.dict_factory  # the result of the query will be perceived as a dictionary
+                migrate(connection)  # bring the schema up to date
+                connection.execute("PRAGMA foreign_keys = ON")  # deletes and renames cascade by the schema rules
+                if self.__profile is not None:
+                    self.__apply(connection, pool, PROFILES[self.__profile])
+                self.__opened = connection, connection.cursor(), pool  # other threads see the database once it is ready
+            return self.__opened
+
+    @property
+    def __connection(self) -> sqlite3.Connection:
+        """Returns the write connection"""
+        return (self.__opened or self.__open())[0]
+
+    @property
+    def __cursor(self) -> sqlite3.Cursor:
+        """Returns cursor of the write connection to execute queries"""
+        return (self.__opened or self.__open())[1]
+
+    @property
+    def __pool(self) -> ConnectionPool:
+        """Returns pool of read connections or None if Academy is not pooled"""
+        return (self.__opened or self.__open())[2]
+
+    def open(self) -> None:
+        """Opens the database now instead of on the first statement, e.g. to find a wrong location at start"""
+        self.__open()
+
+    @property
+    def profile(self):
+        """Returns name of the PRAGMA profile applied to the connections or None if they have default settings"""
+        return self.__profile
+
+    def set_profile(self, name: str) -> dict:
+        """Applies PRAGMA settings of the named profile to all connections of Academy
+
+        Journal mode of pooled Academy stays WAL so that readers never wait for the writer.
+        Returns the settings of the write connection"""
+        if name not in PROFILES:
+            raise ValueError(f"Profile must be one of: {', '.join(PROFILES)}")
+        settings = self.__configure(PROFILES[name])
+        self.__profile = name
+        return settings
+
+    def __configure(self, settings: dict) -> dict:
+        """Applies PRAGMA settings to all connections and returns the settings of the write connection"""
+        with self.write_lock:
+            return self.__apply(self.__connection, self.__pool, settings)
+
+    @staticmethod
+    def __apply(connection: sqlite3.Connection, pool: ConnectionPool, settings: dict) -> dict:
+        """Applies PRAGMA settings to the write connection and the pool and returns the settings of the first"""
+        if pool:
+            pool.configure(lambda reader: apply_pragmas(reader, settings, journal_mode=False))
+        return apply_pragmas(connection, settings, journal_mode=not pool)
+
+    @contextmanager
+    def use_profile(self, name: str):
+        """Applies the named PRAGMA profile for the duration of the with block, e.g. around a bulk import
+
+        Profile or settings Academy had before are restored after the block"""
+        previous = self.__profile, pragmas(self.__connection)
+        settings = self.set_profile(name)
+        try:
+            yield settings
+        finally:
+            self.__configure(previous[1])
+            self.__profile = previous[0]
 
     def close(self) -> None:
-        """Closes connection with database"""
-        self.__connection.close()
+        """Closes connection with database, Academy that has not run any statement has nothing to close"""
+        if self.__opened is None:
+            return
+        connection, _, pool = self.__opened
+        if pool:
+            pool.close()
+        else:
+            connection.close()
+
+    def __query(self, query: str) -> str:
+        """Returns the query registered under the name or the query itself if it is not a statement name"""
+        if query in self.__statements:
+            return self.__statements.query(query)
+        return query
+
+    def add_query_hook(self, hook) -> None:
+        """Adds function called after every statement with its name, query, parameters, row count and duration
+
+        Name of a raw query is the query itself. Without hooks statements are not timed at all"""
+        if not callable(hook):
+            raise TypeError
+        self.__hooks = self.__hooks + [hook]  # readers in other threads keep iterating the old list
+
+    def remove_query_hook(self, hook) -> None:
+        """Removes the function from the functions called after every statement"""
+        self.__hooks = [added for added in self.__hooks if added is not hook]
+
+    def trace(self, slow_threshold: float = None, logger=None) -> QueryStats:
+        """Starts collecting latency percentiles of every statement shape
+
+        If slow_threshold is given statements running longer than slow_threshold seconds are logged with their
+        query plan to the logger. Returns the statistics collector, remove_query_hook with it stops collecting"""
+        stats = QueryStats()
+        self.add_query_hook(stats)
+        if slow_threshold is not None:
+            self.add_query_hook(SlowQueryLog(self, slow_threshold, logger))
+        return stats
+
+    def __notify(self, statement: str, sql: str, params, rows: int, start: float) -> None:
+        """Calls the query hooks for the statement that started at start"""
+        seconds = time.perf_counter() - start
+        for hook in self.__hooks:
+            hook(statement, sql, params, rows, seconds)
+
+    def __fetch(self, target, query: str, params=(), one: bool = False):
+        """Executes query or named statement on the cursor or connection and fetches all rows or a single one"""
+        sql = self.__query(query)
+        if not self.__hooks:
+            cursor = target.execute(sql, params)
+            return cursor.fetchone() if one else cursor.fetchall()
+        start = time.perf_counter()
+        cursor = target.execute(sql, params)
+        result = cursor.fetchone() if one else cursor.fetchall()
+        self.__notify(query, sql, params, (result is not None) if one else len(result), start)
+        return result
 
-    def commit(self, queries: str) -> None:
-        """Sends a COMMIT statement to the server, committing the current transaction"""
-        self.__cursor.executescript(queries)
-        self.__connection.commit()
+    def execute(self, query: str, params=()) -> None:
+        """Executes a single query or named statement with bound parameters in the current transaction"""
+        sql = self.__query(query)
+        if not self.__hooks:
+            self.__cursor.execute(sql, params)
+            return
+        start = time.perf_counter()
+        self.__cursor.execute(sql, params)
+        self.__notify(query, sql, params, self.__cursor.rowcount, start)
 
-    def fetchall(self, queries: str) -> list:
+    def executemany(self, query: str, seq_of_params) -> None:
+        """Executes a single query or named statement for every sequence of parameters in the current transaction"""
+        sql = self.__query(query)
+        if not self.__hooks:
+            self.__cursor.executemany(sql, seq_of_params)
+            return
+        start = time.perf_counter()
+        self.__cursor.executemany(sql, seq_of_params)
+        self.__notify(query, sql, None, self.__cursor.rowcount, start)
+
+    def commit(self, queries: str = None, params=None) -> None:
+        """Sends a COMMIT statement to the server, committing the current transaction
+
+        Executes named statement or query with bound parameters or script of queries without parameters before it"""
+        if queries in self.__statements or params is not None:
+            self.execute(queries, params or ())
+        elif queries:
+            start = time.perf_counter()
+            self.__cursor.executescript(queries)
+            if self.__hooks:
+                self.__notify(queries, queries, None, -1, start)
+        if not self.__depth:  # inside a transaction block the block commits
+            self.__connection.commit()
+
+    def __rollback(self) -> None:
+        """Rolls back the current transaction or leaves it to the transaction block Academy is in"""
+        if not self.__depth:
+            self.__connection.rollback()
+            self.__ids = iter(())  # the reservation of the block may have been rolled back too
+
+    @contextmanager
+    def transaction(self):
+        """Groups writes of the with block into one transaction
+
+        Methods called in the block do not commit, the writes are committed when the block ends or rolled back
+        if it raises. Nested blocks are savepoints: an error in an inner block undoes only its writes.
+        Readers of a pooled Academy see the writes after the outermost block ends"""
+        with self.write_lock:
+            self.__depth += 1
+            self.execute(f"SAVEPOINT block{self.__depth}")
+            try:
+                yield self
+            except BaseException:
+                self.execute(f"ROLLBACK TO block{self.__depth}")
+                self.execute(f"RELEASE block{self.__depth}")
+                if self.__depth == 1:
+                    self.__connection.rollback()
+                if self.__cache is not None:
+                    self.__cache.clear()  # lookups made in the block may have cached rolled back rows
+                self.__ids = iter(())  # the reservation of the block may have been rolled back too
+                raise
+            else:
+                self.execute(f"RELEASE block{self.__depth}")
+                if self.__depth == 1:
+                    self.__connection.commit()
+            finally:
+                self.__depth -= 1
+                if self.__snapshot is not None:
+                    self.__snapshot.stale = True
+
+    def fetchall(self, queries: str, params=()) -> list:
         """Fetches all the rows of a executed query result"""
-        self.__cursor.execute(queries)
-        return self.__cursor.fetchall()
+        if self.__pool:
+            with self.__pool.reader() as connection:  # check out a read connection of the pool
+                return self.__fetch(connection, queries, params)
+        return self.__fetch(self.__cursor, queries, params)
 
-    def fetchone(self, query: str):
+    def fetchone(self, query: str, params=()):
         """Fetches a single record
 
         Executes query and fetches a single record or return None if no more rows are available"""
-        self.__cursor.execute(query)
-        return self.__cursor.fetchone()
+        if self.__pool:
+            with self.__pool.reader() as connection:  # check out a read connection of the pool
+                return self.__fetch(connection, query, params, one=True)
+        return self.__fetch(self.__cursor, query, params, one=True)
+
+    @property
+    def cache(self) -> LRUCache:
+        """Returns cache of Academy lookups or None if Academy has no cache"""
+        return self.__cache
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """Returns in-memory snapshot of the catalogue or None if it was not loaded"""
+        return self.__snapshot
+
+    def data_version(self) -> int:
+        """Returns data version of the database that changes when other connections commit to it"""
+        with self.__write_lock:  # the version is tracked per connection, so it is always read from the main one
+            return self.__connection.execute("PRAGMA data_version").fetchone()['data_version']
+
+    def load_snapshot(self) -> Snapshot:
+        """Reads the whole catalogue into memory in one read transaction
+
+        All get_* and get_*_str reads are served from the snapshot until Academy writes to the database
+        or refresh_snapshot finds that other connections have changed it"""
+        data_version = self.data_version()  # read before the data so that a concurrent commit is not missed
+        with self.__reader() as connection:
+            started = not connection.in_transaction
+            if started:
+                connection.execute("BEGIN")  # all tables are read from the same state of the database
+            try:
+                tables = [self.__fetch(connection, name) for name in (
+                    'all_local', 'all_offsite', 'all_teachers', 'all_courses_teachers', 'all_program', 'all_topics',
+                    'all_rooms')]
+            finally:
+                if started:
+                    connection.rollback()
+        self.__snapshot = Snapshot(*tables, data_version)
+        return self.__snapshot
+
+    def snapshot_is_current(self) -> bool:
+        """Returns whether the snapshot is loaded and matches the database"""
+        return (self.__snapshot is not None and not self.__snapshot.stale
+                and self.__snapshot.data_version == self.data_version())
+
+    def refresh_snapshot(self) -> bool:
+        """Reloads the snapshot if it does not match the database
+
+        Returns whether the snapshot was reloaded"""
+        if self.snapshot_is_current():
+            return False
+        self.load_snapshot()
+        return True
+
+    def drop_snapshot(self) -> None:
+        """Stops serving reads from the snapshot and frees it"""
+        self.__snapshot = None
+
+    def __invalidate_course(self, id_course: int) -> None:
+        """Removes cached lookups of the course"""
+        if self.__cache is not None:
+            self.__cache.invalidate(('get_course', id_course), ('get_program', id_course),
+                                    ('get_course_teachers', id_course))
+
+    @contextmanager
+    def __reader(self):
+        """Yields connection to read from: a read connection of the pool or the connection of Academy"""
+        if self.__pool:
+            with self.__pool.reader() as connection:
+                yield connection
+        else:
+            yield self.__connection
+
+    def __pages(self, query: str, params=(), page_size: int = 1000):
+        """Yields result of the query by pages of page_size rows together with the connection it is read from"""
+        if not isinstance(page_size, int):
+            raise TypeError
+        if page_size <= 0:
+            raise ValueError("Page size must be integer and above 0")
+        with self.__reader() as connection:
+            cursor = connection.cursor()  # own cursor so that other queries do not reset the result
+            start = time.perf_counter()
+            cursor.execute(self.__query(query), params)
+            if self.__hooks:
+                self.__notify(query, self.__statements[query] if query in self.__statements else query, params, -1,
+                              start)
+            while page := cursor.fetchmany(page_size):
+                yield connection, page
+
+    def iter_rows(self, query: str, params=(), page_size: int = 1000):
+        """Yields rows of a executed query result fetching page_size rows at a time"""
+        for _, page in self.__pages(query, params, page_size):
+            yield from page
+
+    @property
+    def write_lock(self) -> threading.RLock:
+        """Returns lock held by the thread that writes to the database"""
+        return self.__write_lock
+
+    def explain(self, query: str, params=()) -> list[str]:
+        """Returns steps of the query plan of a query or named statement"""
+        if query in self.__statements:
+            query = self.__statements[query]
+        # a cursor of its own: a slow query hook reads the plan before the caller reads row count of the write cursor
+        with self.__reader() as connection:
+            return [step['detail'] for step in self.__fetch(connection, f"EXPLAIN QUERY PLAN {query}", params)]
+
+    @property
+    def statements(self) -> StatementRegistry:
+        """Returns registry of named queries of Academy"""
+        return self.__statements
+
+    @property
+    def statement_counters(self) -> dict:
+        """Returns number of executions of every named query"""
+        return self.__statements.counters
 
     @property
     def id_course(self) -> int:
-        """Returns ID of the course that program currently works with"""
-        return Academy.__id_course
+        """Returns ID of the course last inserted one by one or None if Academy has not inserted any"""
+        return self.__id_course
 
     @staticmethod
     def dict_factory(cursor, row) -> dict:
@@ -80,52 +493,542 @@ class Academy:
             return True
         return False
 
+    @write_dec
     def clear_all(self) -> None:
         """Clears all tables of database"""
-        self.commit("DELETE FROM Courses;"
-                    "DELETE FROM LocalCourses;"
-                    "DELETE FROM OffsiteCourses;"
-                    "DELETE FROM CoursesTeachers;"
-                    "DELETE FROM Program;"
-                    "DELETE FROM Rooms;"
-                    "DELETE FROM Teachers;"
-                    "DELETE FROM Topics;")
-
-    def __insert(self, course: Course) -> None:
-        """Insert course information into Program, Topics, CoursesTeachers"""
-        for topic in course.program:
-            self.commit(f"INSERT OR IGNORE INTO Program VALUES({self.__id_course}, \"{topic}\"); \
-                        INSERT OR IGNORE INTO Topics VALUES(\"{topic}\");")
-        for teacher in course.teachers:
-            self.add_teacher(teacher)
-            self.commit(f"INSERT OR IGNORE INTO CoursesTeachers VALUES({self.__id_course}, \
-                        (SELECT id_teacher FROM Teachers WHERE surname == \"{teacher.surname}\" AND \
-                        name == \"{teacher.name}\" AND patronymic == \"{teacher.patronymic}\" AND \
-                        birth_date == \"{teacher.birth_date}\"));")
-        self.__id_course += 1
+        # statements are executed one by one: a script would commit the transaction block Academy may be in
+        for table in ('SessionTeachers', 'Sessions', 'Courses', 'LocalCourses', 'OffsiteCourses', 'CoursesTeachers',
+                      'Program', 'Rooms', 'Teachers', 'Topics'):
+            self.execute(f"DELETE FROM {table}")
+        self.commit()
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    @staticmethod
+    def teacher_params(teacher: Teacher) -> tuple:
+        """Returns teacher identity as parameters of a statement"""
+        return teacher.surname, teacher.name, teacher.patronymic, teacher.birth_date
+
+    def __reserve_ids(self, count: int) -> int:
+        """Reserves count consecutive course IDs in the current transaction and returns the first of them"""
+        return self.__fetch(self.__cursor, 'reserve_course_ids', (count,), one=True)['next_id'] - count
+
+    def __next_id(self) -> int:
+        """Returns the next reserved course ID, reserving a new block of IDs when the current one is used up"""
+        id_course = next(self.__ids, None)
+        if id_course is None:
+            id_course = self.__reserve_ids(self.__id_block)
+            self.__ids = iter(range(id_course + 1, id_course + self.__id_block))
+        return id_course
+
+    def __insert(self, course: Course, statement: str, place) -> None:
+        """Insert course into Courses, the table of its kind, Program, Topics, CoursesTeachers and commit it
+
+        Place is the room of a local course or the address of an offsite one"""
+        id_course = self.__next_id()
+
+        def insert() -> None:
+            self.execute('insert_course', (id_course,))
+            self.execute(statement, (id_course, course.name, place))
+            for topic in course.program:
+                self.execute('insert_topic', (topic,))  # program refers to the topic
+                self.execute('insert_program', (id_course, topic))
+            for teacher in course.teachers:
+                self.execute('insert_teacher', Academy.teacher_params(teacher))
+                self.execute('insert_course_teacher', (id_course, *Academy.teacher_params(teacher)))
 
+        self.__transaction(insert)
+        self.__id_course = id_course
+        self.__invalidate_course(id_course)  # the course may have been looked up with empty program
+
+    @write_dec
     def insert_local(self, course: LocalCourse) -> None:
         """Insert course into database as local"""
-        while self.fetchone(f'SELECT id_course FROM Courses WHERE id_course == {self.__id_course}'):
-            self.__id_course += 1
         if not isinstance(course, LocalCourse):
             raise TypeError
-        room = course.room
-        self.commit(f"INSERT INTO Courses VALUES({self.__id_course}); \
-                    INSERT OR IGNORE INTO LocalCourses VALUES({self.__id_course}, \"{course.name}\", \
-                    CASE WHEN {room} IN (SELECT * FROM Rooms) THEN {room} END);")
-        self.__insert(course)
+        self.__insert(course, 'insert_local', course.room)
 
+    @write_dec
     def insert_offsite(self, course: OffsiteCourse) -> None:
         """Insert course into database as offsite"""
-        while self.fetchone(f'SELECT id_course FROM Courses WHERE id_course == {self.__id_course}'):
-            self.__id_course += 1
         if not isinstance(course, OffsiteCourse):
             raise TypeError
-        self.commit(f"INSERT INTO Courses VALUES({self.__id_course}); \
-                    INSERT OR IGNORE INTO OffsiteCourses VALUES({self.__id_course}, \"{course.name}\", \
-                                                                                            \"{course.address}\");")
-        self.__insert(course)
+        self.__insert(course, 'insert_offsite', course.address)
+
+    @write_dec
+    def import_courses(self, courses, batch_size: int = 1000) -> list:
+        """Insert local and offsite courses from the iterable in a single transaction
+
+        Courses are taken from the iterable lazily and inserted by batches of batch_size with one statement
+        execution per table. Returns list of dictionaries with number, size and duration of every batch"""
+        if not isinstance(batch_size, int):
+            raise TypeError
+        if batch_size <= 0:
+            raise ValueError("Batch size must be integer and above 0")
+        courses = iter(courses)
+        imported = []  # IDs reserved for the batches
+        stats = []
+        try:
+            while batch := list(islice(courses, batch_size)):
+                start = time.perf_counter()
+                for course in batch:
+                    if not isinstance(course, (LocalCourse, OffsiteCourse)):
+                        raise TypeError
+                id_course = self.__reserve_ids(len(batch))  # every batch reserves IDs of its courses at once
+                imported.append(range(id_course, id_course + len(batch)))
+                self.executemany('insert_course', ((value,) for value in imported[-1]))
+                self.__insert_rows(enumerate(batch, id_course))
+                stats.append({'batch': len(stats) + 1, 'courses': len(batch),
+                              'seconds': time.perf_counter() - start})
+            self.commit()
+        except Exception:
+            self.__rollback()
+            raise
+        finally:
+            for ids in imported:
+                for id_course in ids:
+                    self.__invalidate_course(id_course)
+        return stats
+
+    def __insert_rows(self, courses) -> None:
+        """Inserts rows of the (course ID, course) pairs into all tables but Courses with one statement execution
+        per table in the current transaction"""
+        local, offsite, program, teachers, courses_teachers = [], [], [], {}, []
+        for id_course, course in courses:
+            if isinstance(course, LocalCourse):
+                local.append((id_course, course.name, course.room))
+            else:
+                offsite.append((id_course, course.name, course.address))
+            program.extend((id_course, topic) for topic in course.program)
+            for teacher in course.teachers:
+                params = Academy.teacher_params(teacher)
+                teachers[params] = None  # keeps the first appearance order
+                courses_teachers.append((id_course, *params))
+        self.executemany('insert_topic', {(topic,): None for _, topic in program})  # program refers to topics
+        self.executemany('insert_program', program)
+        self.executemany('insert_teacher', teachers)
+        self.executemany('insert_course_teacher', courses_teachers)
+        # courses go last so that search index triggers see their program and teachers at once
+        self.executemany('insert_local', local)
+        self.executemany('insert_offsite', offsite)
+
+    def __select(self, ids) -> int:
+        """Puts the IDs into temporary table Selected the set-based statements work on
+
+        Returns number of distinct IDs"""
+        ids = list(ids)
+        for value in ids:
+            if not isinstance(value, int):
+                raise TypeError
+            if value <= 0:
+                raise ValueError("Teacher ID or Course ID must be integer and above 0")
+        self.execute('create_selected')
+        self.execute('clear_selected')
+        self.executemany('insert_selected', ((value,) for value in ids))
+        return len(set(ids))
+
+    def __collect_orphans(self) -> None:
+        """Remembers teachers and topics of the selected courses that may be left without courses"""
+        for table in ('teachers', 'topics'):
+            self.execute(f'create_orphan_{table}')
+            self.execute(f'clear_orphan_{table}')
+            self.execute(f'collect_orphan_{table}')
+
+    def __delete_orphans(self) -> list[int]:
+        """Deletes remembered teachers and topics no course refers to anymore
+
+        Returns IDs of deleted teachers"""
+        self.execute('delete_orphan_topics')
+        return [row['id_teacher'] for row in self.__fetch(self.__cursor, 'delete_orphan_teachers')]
+
+    def __invalidate_teachers(self, ids) -> None:
+        """Removes cached lookups of the teachers"""
+        if self.__cache is not None:
+            self.__cache.invalidate(*(('get_teacher', id_teacher) for id_teacher in ids))
+
+    def __transaction(self, func):
+        """Returns result of func called in a transaction that is committed after it or rolled back on error"""
+        try:
+            result = func()
+            self.commit()
+            return result
+        except Exception:
+            self.__rollback()
+            raise
+
+    @write_dec
+    def delete_courses(self, ids, collect_garbage: bool = True) -> int:
+        """Deletes the courses by IDs together with their programs and teachers lists in one transaction
+
+        Rows referring to the courses are deleted by ON DELETE CASCADE rules. If collect_garbage is True
+        teachers and topics of the courses that are left without courses are deleted too.
+        Returns number of deleted courses"""
+        def delete() -> tuple:
+            self.__select(ids)
+            if collect_garbage:
+                self.__collect_orphans()
+            # course rows go first: search index triggers of the cascaded program and teachers rows find nothing
+            # to update instead of rewriting the index entry of the course for every row
+            self.execute('delete_selected_local')
+            self.execute('delete_selected_offsite')
+            self.execute('delete_selected_courses')
+            deleted = self.__cursor.rowcount
+            return deleted, self.__delete_orphans() if collect_garbage else []
+
+        ids = list(ids)
+        deleted, teachers = self.__transaction(delete)
+        for id_course in ids:
+            self.__invalidate_course(id_course)
+        self.__invalidate_teachers(teachers)
+        return deleted
+
+    def delete_course(self, id_course: int, collect_garbage: bool = True) -> bool:
+        """Deletes the course by ID, returns whether it existed"""
+        return self.delete_courses([id_course], collect_garbage) == 1
+
+    @write_dec
+    def update_courses(self, courses: dict, collect_garbage: bool = True) -> None:
+        """Replaces name, room or address, program and teachers of the courses by ID with those of the course
+        objects in one transaction, local course can become offsite and vice versa
+
+        courses maps course ID to LocalCourse or OffsiteCourse. If collect_garbage is True teachers and topics
+        the courses had that are left without courses are deleted. Raises ValueError if a course does not exist"""
+        for course in courses.values():
+            if not isinstance(course, (LocalCourse, OffsiteCourse)):
+                raise TypeError
+
+        def update() -> list:
+            selected = self.__select(courses)
+            if self.__fetch(self.__cursor, 'count_selected_courses', one=True)['count'] != selected:
+                raise ValueError("Course with such ID does not exist")
+            if collect_garbage:
+                self.__collect_orphans()
+            for table in ('local', 'offsite', 'program', 'courses_teachers'):
+                self.execute(f'delete_selected_{table}')
+            self.__insert_rows(courses.items())
+            return self.__delete_orphans() if collect_garbage else []
+
+        teachers = self.__transaction(update)
+        for id_course in courses:
+            self.__invalidate_course(id_course)
+        self.__invalidate_teachers(teachers)
+
+    def update_course(self, id_course: int, course: Course, collect_garbage: bool = True) -> None:
+        """Replaces name, room or address, program and teachers of the course by ID with those of the course"""
+        self.update_courses({id_course: course}, collect_garbage)
+
+    @write_dec
+    def remove_teachers(self, ids) -> int:
+        """Removes the teachers by IDs from Academy and from the courses they teach in one transaction
+
+        Returns number of removed teachers"""
+        def remove() -> tuple:
+            self.__select(ids)
+            courses = [row['id_course'] for row in self.__fetch(self.__cursor, 'selected_teachers_courses')]
+            self.execute('delete_selected_teachers')  # teachers lists are cleaned up by ON DELETE CASCADE
+            return self.__cursor.rowcount, courses
+
+        ids = list(ids)
+        removed, courses = self.__transaction(remove)
+        self.__invalidate_teachers(ids)
+        if self.__cache is not None:
+            self.__cache.invalidate(*(('get_course_teachers', id_course) for id_course in courses))
+        return removed
+
+    def remove_teacher(self, id_teacher: int) -> bool:
+        """Removes the teacher by ID, returns whether the teacher existed"""
+        return self.remove_teachers([id_teacher]) == 1
+
+    @write_dec
+    def rename_topics(self, names: dict) -> None:
+        """Renames the topics in one transaction, names maps old name to new one
+
+        Programs follow the renamed topic by ON UPDATE CASCADE rule, renaming to an existing topic merges them.
+        Chained and swapped renames are rejected, rename through an unused name in a separate call instead"""
+        for old, new in names.items():
+            if not (isinstance(old, str) and isinstance(new, str)):
+                raise TypeError
+            if not new:
+                raise ValueError("No data")
+        names = [(old, new) for old, new in names.items() if old != new]
+        if {old for old, _ in names} & {new for _, new in names}:
+            raise ValueError("New names of topics must not be renamed too")
+
+        def rename() -> None:
+            self.executemany('rename_topic', names)
+            # topics renamed to existing ones were ignored above, their programs are moved and the topics deleted
+            self.executemany('move_program_topic', names)
+            self.executemany('delete_duplicate_program', {(new,): None for _, new in names})
+            self.executemany('delete_topic', ((old,) for old, _ in names))
+
+        self.__transaction(rename)
+        if self.__cache is not None:
+            self.__cache.clear()  # any course may study the topic
+
+    def rename_topic(self, old: str, new: str) -> None:
+        """Renames the topic, renaming to an existing topic merges them"""
+        self.rename_topics({old: new})
+
+    def changes_since(self, cursor: int = 0, tables=None, page_size: int = 1000):
+        """Yields changes of the catalogue logged after the cursor in the order they were made
+
+        A consumer remembers cursor of the last change it has applied and continues from it, tables limit
+        changes to those of the named tables. Changes are read by one range scan of the log"""
+        if not isinstance(cursor, int):
+            raise TypeError
+        if cursor < 0:
+            raise ValueError("Cursor must be integer and not below 0")
+        if tables is None:
+            statement, params = 'changes_since', (cursor,)
+        else:
+            tables = list(tables)
+            for table in tables:
+                if table not in LOGGED_TABLES:
+                    raise ValueError(f"Changes are logged only for tables: {', '.join(LOGGED_TABLES)}")
+            statement, params = 'changes_since_tables', (cursor, json.dumps(tables))
+        for _, page in self.__pages(statement, params, page_size):
+            for entry in page:
+                yield Change.from_log(entry)
+
+    def change_cursor(self) -> int:
+        """Returns cursor of the last logged change
+
+        A consumer takes it before reading the whole catalogue and continues from it with changes_since"""
+        return self.fetchone('change_cursor')['cursor']
+
+    @write_dec
+    def prune_changes(self, cursor: int) -> None:
+        """Deletes changes up to the cursor from the log once all consumers have applied them"""
+        if not isinstance(cursor, int):
+            raise TypeError
+        self.commit('prune_changes', (cursor,))
+
+    def stats(self, limit: int = 10) -> dict:
+        """Returns numbers of local and offsite courses, limit teachers with the most courses, limit most taught
+        topics and number of courses held in every room
+
+        Numbers are read from summary tables kept up to date by triggers, nothing is aggregated on reading"""
+        if not isinstance(limit, int):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Limit must be integer and above 0")
+        return {'courses': {row['kind']: row['courses'] for row in self.fetchall('stats_courses')},
+                'teachers': self.fetchall('stats_teachers', (limit,)),
+                'topics': self.fetchall('stats_topics', (limit,)),
+                'rooms': self.fetchall('stats_rooms')}
+
+    def stats_str(self, limit: int = 10) -> str:
+        """Returns statistics of Academy as string"""
+        return Academy.format_stats(self.stats(limit))
+
+    @staticmethod
+    def format_stats(stats: dict) -> str:
+        """Returns statistics as string from the result of stats
+
+        Returns string as
+        Courses: local ..., offsite ...
+        Teachers with the most courses: ...
+        Most taught topics: ...
+        Rooms: ..."""
+        result = f"Courses: local {stats['courses'].get('local', 0)}, offsite {stats['courses'].get('offsite', 0)}\n"
+        result += "Teachers with the most courses:\n"
+        for teacher in stats['teachers']:
+            result += f"{Academy.format_teacher(teacher)} - {teacher['courses']}\n"
+        result += "Most taught topics: "
+        for topic in stats['topics']:
+            result += f"#{topic['id_topic']} ({topic['courses']}) "
+        result += "\nRooms: "
+        for room in stats['rooms']:
+            result += f"№{room['room']} ({room['courses']}) "
+        return result + '\n'
+
+    def check_stats(self, repair: bool = False) -> dict:
+        """Computes the summary tables from scratch and compares them with the ones kept by triggers
+
+        Returns rows every differing table misses and rows it has but should not as
+        {table: {'missing': [...], 'unexpected': [...]}}. If repair is True differing tables are rebuilt"""
+        with self.write_lock:  # the tables are compared and rebuilt in the same state of the database
+            differences = {}
+            for table, (_, query) in STATISTICS.items():
+                missing = self.__fetch(self.__cursor, f"SELECT * FROM ({query}) EXCEPT SELECT * FROM {table}")
+                unexpected = self.__fetch(self.__cursor, f"SELECT * FROM {table} EXCEPT SELECT * FROM ({query})")
+                if missing or unexpected:
+                    differences[table] = {'missing': missing, 'unexpected': unexpected}
+            if repair and differences:
+                try:
+                    for table in differences:
+                        self.execute(f"DELETE FROM {table}")
+                        self.execute(f"INSERT INTO {table} {STATISTICS[table][1]}")
+                    self.commit()
+                except Exception:
+                    self.__rollback()
+                    raise
+            return differences
+
+    @staticmethod
+    def session_time(value) -> str:
+        """Returns datetime or ISO 8601 string as time of a session: YYYY-MM-DD HH:MM
+
+        Times are compared as strings, so they must not have a time zone"""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if not isinstance(value, datetime):
+            raise TypeError
+        if value.tzinfo is not None:
+            raise ValueError("Time of a session must not have a time zone")
+        return value.isoformat(' ', 'minutes')
+
+    def __schedule(self, id_course: int, start: str, end: str) -> int:
+        """Inserts the session with the room and teachers of the course in the current transaction
+
+        Raises sqlite3.IntegrityError if the room or a teacher is busy at the time. Returns ID of the session"""
+        row = self.__fetch(self.__cursor, 'insert_session', (id_course, start, end), one=True)
+        if row is None:
+            raise ValueError("Course with such ID does not exist")
+        try:
+            self.execute('insert_session_teachers', (row['id_session'],))
+        except sqlite3.IntegrityError:
+            self.execute('delete_session', (row['id_session'],))
+            raise
+        return row['id_session']
+
+    @write_dec
+    def schedule_sessions(self, sessions, skip_conflicts: bool = False) -> list:
+        """Schedules sessions given as (course ID, start, end) in one transaction
+
+        Session takes place in the room of the local course and is taught by the teachers of the course.
+        If a session overlaps another one of its room or of one of its teachers ValueError is raised
+        and nothing is scheduled, or the session is skipped if skip_conflicts is True.
+        Returns IDs of the sessions, None in place of the skipped ones"""
+        checked = []
+        for id_course, start, end in sessions:
+            if not isinstance(id_course, int):
+                raise TypeError
+            if id_course <= 0:
+                raise ValueError("Course ID must be integer and above 0")
+            start, end = Academy.session_time(start), Academy.session_time(end)
+            if start >= end:
+                raise ValueError("Session must end after it starts")
+            checked.append((id_course, start, end))
+
+        def schedule() -> list:
+            ids = []
+            for id_course, start, end in checked:
+                try:
+                    ids.append(self.__schedule(id_course, start, end))
+                except sqlite3.IntegrityError as err:  # raised by the conflict triggers
+                    if not skip_conflicts:
+                        raise ValueError(f"Session of course {id_course} from {start} to {end} cannot be scheduled: "
+                                         f"{err}") from err
+                    ids.append(None)
+            return ids
+
+        return self.__transaction(schedule)
+
+    def schedule_session(self, id_course: int, start, end) -> int:
+        """Schedules session of the course from start to end, returns ID of the session
+
+        Raises ValueError if the room or a teacher of the course is busy at the time"""
+        return self.schedule_sessions([(id_course, start, end)])[0]
+
+    @write_dec
+    @check_dec
+    def cancel_session(self, id_session: int) -> bool:
+        """Deletes the session by ID, returns whether it existed"""
+        self.execute('delete_session', (id_session,))
+        cancelled = self.__cursor.rowcount > 0
+        self.commit()
+        return cancelled
+
+    def __resources(self, id_course: int) -> tuple:
+        """Returns room of the course or None and IDs of its teachers"""
+        local = self.fetchone('local', (id_course,))
+        teachers = [row['id_teacher'] for row in self.fetchall('course_teachers', (id_course,))]
+        return (local['room'] if local else None), teachers
+
+    def find_conflicts(self, id_course: int, start, end) -> list:
+        """Returns sessions of the room and teachers of the course that overlap time from start to end
+
+        Every room and teacher is looked up with one range of its index, so the time does not grow
+        with the number of their sessions"""
+        start, end = Academy.session_time(start), Academy.session_time(end)
+        room, teachers = self.__resources(id_course)
+        conflicts = {}
+        if room is not None:
+            conflicts.update((row['id_session'], row) for row in self.fetchall('room_sessions', (room, start, end)))
+        for id_teacher in teachers:
+            conflicts.update((row['id_session'], row)
+                             for row in self.fetchall('teacher_sessions', (id_teacher, start, end)))
+        return sorted(conflicts.values(), key=lambda row: row['start_time'])
+
+    def find_free_slot(self, id_course: int, after, duration: timedelta, before=None):
+        """Returns the earliest start after which the room and all teachers of the course are free for duration
+        or None if there is no such time ending before before
+
+        Every step looks up the latest session of a room or teacher starting before the slot ends, a busy slot
+        moves to the end of that session"""
+        if not isinstance(duration, timedelta):
+            raise TypeError
+        if duration <= timedelta(0):
+            raise ValueError("Duration must be above 0")
+        start = datetime.fromisoformat(Academy.session_time(after))
+        before = Academy.session_time(before) if before is not None else None
+        room, teachers = self.__resources(id_course)
+        probes = [('room_previous_session', room)] if room is not None else []
+        probes += [('teacher_previous_session', id_teacher) for id_teacher in teachers]
+        while True:
+            end = Academy.session_time(start + duration)
+            if before is not None and end > before:
+                return None
+            busy = Academy.session_time(start)
+            for statement, key in probes:
+                previous = self.fetchone(statement, (key, end))
+                if previous is not None and previous['end_time'] > busy:
+                    busy = previous['end_time']
+            if busy == Academy.session_time(start):
+                return busy
+            start = datetime.fromisoformat(busy)
+
+    @staticmethod
+    def __time_range(start, end) -> tuple[str, str]:
+        """Returns bounds of a timetable, the whole timetable if they are None"""
+        return (Academy.session_time(start) if start is not None else '',
+                Academy.session_time(end) if end is not None else '9999')
+
+    @check_dec
+    def get_course_sessions(self, id_course: int) -> list:
+        """Returns sessions of the course ordered by time"""
+        return self.fetchall('course_sessions', (id_course,))
+
+    def get_room_timetable(self, room: int, start=None, end=None) -> list:
+        """Returns sessions in the room that overlap time from start to end ordered by time"""
+        return self.fetchall('room_sessions', (room, *Academy.__time_range(start, end)))
+
+    def get_teacher_timetable(self, id_teacher: int, start=None, end=None) -> list:
+        """Returns sessions of the teacher that overlap time from start to end ordered by time"""
+        return self.fetchall('teacher_sessions', (id_teacher, *Academy.__time_range(start, end)))
+
+    @staticmethod
+    def format_timetable(sessions: list) -> str:
+        """Returns sessions as string
+
+        Returns string as
+        start - end: #ID_session Name (room Room)"""
+        result = ""
+        if not sessions:
+            result += "No sessions\n"
+        for session in sessions:
+            result += f"{session['start_time']} - {session['end_time']}: #{session['id_session']} {session['name']}"
+            result += f" (room {session['room']})\n" if session['room'] is not None else "\n"
+        return result
+
+    def get_room_timetable_str(self, room: int, start=None, end=None) -> str:
+        """Returns sessions in the room that overlap time from start to end as string"""
+        return Academy.format_timetable(self.get_room_timetable(room, start, end))
+
+    def get_teacher_timetable_str(self, id_teacher: int, start=None, end=None) -> str:
+        """Returns sessions of the teacher that overlap time from start to end as string"""
+        return Academy.format_timetable(self.get_teacher_timetable(id_teacher, start, end))
 
     def get_all_courses(self) -> dict:
         """Returns all courses held in Academy"""
@@ -141,31 +1044,35 @@ class Academy:
         result += Academy.get_all_offsite_str(self)
         return result
 
+    @snapshot_dec
     def get_all_local(self) -> list:
         """Returns all local courses held in Academy"""
-        return self.fetchall("SELECT * FROM LocalCourses")
+        return self.fetchall('all_local')
 
     @get_courses_dec
-    def get_all_local_str(self) -> list:
+    def get_all_local_str(self) -> str:
         """Returns all local courses held in Academy as string"""
-        return self.get_all_local()
+        return 'all_local_ids'
 
+    @snapshot_dec
     def get_all_offsite(self) -> list:
         """Returns all offsite courses held in Academy"""
-        return self.fetchall("SELECT * FROM OffsiteCourses")
+        return self.fetchall('all_offsite')
 
     @get_courses_dec
-    def get_all_offsite_str(self) -> list:
+    def get_all_offsite_str(self) -> str:
         """Returns all offsite courses held in Academy as string"""
-        return self.get_all_offsite()
+        return 'all_offsite_ids'
 
     @check_dec
+    @snapshot_dec
+    @cache_dec
     def get_course(self, id_course: int) -> Course:
         """Returns course information found by course ID"""
-        local = self.fetchone(f"SELECT * FROM LocalCourses WHERE id_course == {id_course}")
+        local = self.fetchone('local', (id_course,))
         if local:
             return local
-        offsite = self.fetchone(f"SELECT * FROM OffsiteCourses WHERE id_course == {id_course}")
+        offsite = self.fetchone('offsite', (id_course,))
         if offsite:
             return offsite
 
@@ -178,30 +1085,302 @@ class Academy:
         Teachers: ...
         Program: ..."""
         course = Academy.get_course(self, id_course)
+        return Academy.format_course(course, Academy.get_course_teachers_str(self, id_course),
+                                     Academy.get_program_str(self, id_course))
+
+    @staticmethod
+    def format_course(course: dict, teachers: str, program: str) -> str:
+        """Returns course information as string from course row, its teachers and program strings"""
         result = f"{course['id_course']} |\n\"{course['name']}\" "
         if 'room' in course.keys():
             result += f"- local course\nRoom: {course['room']}\n"
         if 'address' in course.keys():
             result += f"- offsite course\nAddress: {course['address']}\n"
-        result += "Teachers: " + Academy.get_course_teachers_str(self, id_course)
-        result += "Program: " + Academy.get_program_str(self, id_course)
+        result += "Teachers: " + teachers
+        result += "Program: " + program
         return result
 
+    def get_courses_report(self, courses_statement: str, params=()) -> str:
+        """Returns courses selected by the named statement as string
+
+        Builds the same string as get_course_str for every selected course joined by a new line,
+        but with a fixed number of set-based queries instead of several queries per course"""
+        return ''.join(self.iter_courses_report(courses_statement, params))
+
+    def iter_courses_report(self, courses_statement: str, params=()):
+        """Yields every course selected by the named statement as string of get_courses_report
+
+        All the courses are read at once like in get_courses_report, the strings are yielded one by one
+        so that reports of several databases can be interleaved"""
+        if self.__snapshot is not None and not self.__snapshot.stale:
+            courses = self.__snapshot.course_ids(courses_statement, params)
+            if courses is not None:
+                for id_course in courses:
+                    yield self.get_course_str(id_course) + '\n'
+                return
+        courses = self.fetchall(courses_statement, params)
+        local = {row['id_course']: row for row in self.fetchall(
+            self.__statements.derive('report_local', courses_statement), params)}
+        offsite = {row['id_course']: row for row in self.fetchall(
+            self.__statements.derive('report_offsite', courses_statement), params)}
+        teachers, program = Academy.__group_by_course(
+            self.fetchall(self.__statements.derive('report_teachers', courses_statement), params),
+            self.fetchall(self.__statements.derive('report_program', courses_statement), params))
+        for row in courses:
+            id_course = row['id_course']
+            course = local.get(id_course) or offsite.get(id_course)  # local course wins like in get_course
+            if not course:
+                raise TypeError
+            yield Academy.format_course(course, ''.join(teachers.get(id_course, ())),
+                                        ''.join(program.get(id_course, ()))) + '\n'
+
+    @staticmethod
+    def __group_by_course(teachers_rows: list, program_rows: list) -> tuple[dict, dict]:
+        """Returns teachers and topics of courses grouped by course ID and formatted as in get_course_str"""
+        teachers = {}
+        for row in teachers_rows:
+            teachers.setdefault(row['id_course'], []).append(row['teacher'] + '\n')
+        program = {}
+        for row in program_rows:
+            program.setdefault(row['id_course'], []).append('#' + row['id_topic'] + ' ')
+        return teachers, program
+
+    def __iter_courses_str(self, courses_statement: str, page_size: int):
+        """Yields courses of the named statement ordered by ID as strings of get_course_str followed by a new line
+
+        Teachers and programs are read for the ID range of every page of courses"""
+        for connection, page in self.__pages(courses_statement, (), page_size):
+            bounds = (page[0]['id_course'], page[-1]['id_course'])
+            teachers, program = Academy.__group_by_course(self.__fetch(connection, 'range_teachers', bounds),
+                                                          self.__fetch(connection, 'range_program', bounds))
+            for course in page:
+                yield Academy.format_course(course, ''.join(teachers.get(course['id_course'], ())),
+                                            ''.join(program.get(course['id_course'], ()))) + '\n'
+
+    def iter_local(self, page_size: int = 1000):
+        """Yields local courses held in Academy"""
+        return self.iter_rows('all_local', page_size=page_size)
+
+    def iter_offsite(self, page_size: int = 1000):
+        """Yields offsite courses held in Academy"""
+        return self.iter_rows('all_offsite', page_size=page_size)
+
+    def iter_teachers(self, page_size: int = 1000):
+        """Yields teachers that teach at Academy"""
+        return self.iter_rows('all_teachers', page_size=page_size)
+
+    def iter_topics(self, page_size: int = 1000):
+        """Yields topics that were studied at Academy"""
+        return self.iter_rows('all_topics', page_size=page_size)
+
+    def iter_local_str(self, page_size: int = 500):
+        """Yields local courses held in Academy as strings the way get_all_local_str builds them"""
+        return self.__iter_courses_str('all_local', page_size)
+
+    def iter_offsite_str(self, page_size: int = 500):
+        """Yields offsite courses held in Academy as strings the way get_all_offsite_str builds them"""
+        return self.__iter_courses_str('all_offsite', page_size)
+
+    def iter_courses_str(self, page_size: int = 500):
+        """Yields all courses held in Academy as strings the way get_all_courses_str builds them"""
+        yield from self.iter_local_str(page_size)
+        yield from self.iter_offsite_str(page_size)
+
+    def iter_teachers_str(self, page_size: int = 1000):
+        """Yields teachers that teach at Academy as strings the way get_all_teachers_str builds them"""
+        for teacher in self.iter_teachers(page_size):
+            yield Academy.format_teacher(teacher) + '\n'
+
+    def iter_topics_str(self, page_size: int = 1000):
+        """Yields topics that were studied at Academy as strings the way get_topics_str builds them"""
+        for topic in self.iter_topics(page_size):
+            yield '#' + topic['id_topic'] + ' '
+
+    def iter_course_records(self, page_size: int = 500):
+        """Yields local and then offsite courses ordered by ID as records of loaders.course_from_record with their ID
+
+        Teachers and programs are read for the ID range of every page of courses"""
+        for statement, kind, place in (('all_local', 'local', 'room'), ('all_offsite', 'offsite', 'address')):
+            for connection, page in self.__pages(statement, (), page_size):
+                bounds = (page[0]['id_course'], page[-1]['id_course'])
+                teachers, program = {}, {}
+                for row in self.__fetch(connection, 'range_course_teachers', bounds):
+                    teachers.setdefault(row['id_course'], []).append(
+                        {key: row[key] for key in ('surname', 'name', 'patronymic', 'birth_date')})
+                for row in self.__fetch(connection, 'range_program', bounds):
+                    program.setdefault(row['id_course'], []).append(row['id_topic'])
+                for course in page:
+                    yield {'type': kind, 'id_course': course['id_course'], 'name': course['name'],
+                           place: course[place], 'program': program.get(course['id_course'], []),
+                           'teachers': teachers.get(course['id_course'], [])}
+
+    def iter_tables(self, page_size: int = 1000):
+        """Yields name of a table with a page of its rows for Teachers, LocalCourses, OffsiteCourses,
+        CoursesTeachers, Program, Topics and Rooms
+
+        Pooled Academy reads all tables in one read transaction, otherwise writes made between the pages
+        may be seen"""
+        if not isinstance(page_size, int):
+            raise TypeError
+        if page_size <= 0:
+            raise ValueError("Page size must be integer and above 0")
+        with self.__reader() as connection:
+            started = self.__pool is not None and not connection.in_transaction
+            if started:
+                connection.execute("BEGIN")  # all tables are read from the same state of the database
+            try:
+                for table, statement in (('Teachers', 'all_teachers'), ('LocalCourses', 'all_local'),
+                                         ('OffsiteCourses', 'all_offsite'), ('CoursesTeachers', 'all_courses_teachers'),
+                                         ('Program', 'all_program'), ('Topics', 'all_topics'), ('Rooms', 'all_rooms')):
+                    cursor = connection.cursor()
+                    start = time.perf_counter()
+                    cursor.execute(self.__query(statement))
+                    if self.__hooks:
+                        self.__notify(statement, self.__statements[statement], (), -1, start)
+                    while page := cursor.fetchmany(page_size):
+                        yield table, page
+            finally:
+                if started:
+                    connection.rollback()
+
+    def backup(self, path: str, pages_per_step: int = 256, progress=None, sleep: float = 0.0) -> int:
+        """Copies the database to path (a file, :memory: or file: URI) with the online backup API
+
+        Copies pages_per_step pages at a time and calls progress(status, remaining, total) after every step,
+        the database is not locked between steps so writers are not blocked for the whole copy, a step that finds
+        the database locked is retried after sleep seconds.
+        The copy is read through the write connection: pages written by Academy during the backup are copied
+        as they change, while a write by another process starts the copy again. Returns number of pages copied"""
+        if not isinstance(pages_per_step, int):
+            raise TypeError
+        if pages_per_step <= 0:
+            raise ValueError("Number of pages per step must be integer and above 0")
+        target = connect(path)
+        try:
+            self.__connection.backup(target, pages=pages_per_step, progress=progress, sleep=sleep)
+            return target.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            target.close()
+
+    def __page(self, table: str, columns: str, limit: int, after_id: int, sort: str, descending: bool) -> tuple:
+        """Returns name and parameters of the statement that selects a page of the table
+
+        Page holds at most limit rows that follow the row with ID after_id (the first page if it is None)
+        in order of sort key and ID. The rows are found by the index seek on the keyset instead of OFFSET,
+        so every page costs the same"""
+        id_column, sort_keys = Academy.__page_keys[table]
+        if not (isinstance(limit, int) and (after_id is None or isinstance(after_id, int))):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Page size must be integer and above 0")
+        if sort not in sort_keys:
+            raise ValueError(f"Pages of {table} can be sorted only by {', '.join(sort_keys)}")
+        order = 'DESC' if descending else 'ASC'
+        name = f"page:{table}:{columns}:{sort}:{order}:{after_id is not None}"
+        if name not in self.__statements:
+            where = ''
+            if after_id is not None and sort == id_column:
+                where = f"WHERE {id_column} {'<' if descending else '>'} ?1"
+            elif after_id is not None:
+                where = f"WHERE ({sort}, {id_column}) {'<' if descending else '>'} \
+                        ((SELECT {sort} FROM {table} WHERE {id_column} == ?1), ?1)"
+            order_by = id_column if sort == id_column else f"{sort} {order}, {id_column}"
+            self.__statements.register(name, f"SELECT {columns} FROM {table} {where} ORDER BY {order_by} {order} \
+                                       LIMIT ?2")
+        return name, (after_id, limit)
+
+    def get_courses_page(self, limit: int = 20, after_id: int = None, descending: bool = False) -> list:
+        """Returns page of at most limit IDs of courses that follow the course with ID after_id"""
+        return self.fetchall(*self.__page('Courses', 'id_course', limit, after_id, 'id_course', descending))
+
+    def get_courses_page_str(self, limit: int = 20, after_id: int = None, descending: bool = False) -> str:
+        """Returns page of at most limit courses that follow the course with ID after_id as string"""
+        return self.get_courses_report(*self.__page('Courses', 'id_course', limit, after_id, 'id_course', descending))
+
+    def get_local_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                       descending: bool = False) -> list:
+        """Returns page of at most limit local courses that follow the course with ID after_id in order of sort key"""
+        return self.fetchall(*self.__page('LocalCourses', '*', limit, after_id, sort, descending))
+
+    def get_local_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                           descending: bool = False) -> str:
+        """Returns page of at most limit local courses that follow the course with ID after_id as string"""
+        return self.get_courses_report(*self.__page('LocalCourses', 'id_course', limit, after_id, sort, descending))
+
+    def get_offsite_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                         descending: bool = False) -> list:
+        """Returns page of at most limit offsite courses that follow the course with ID after_id in order of sort key"""
+        return self.fetchall(*self.__page('OffsiteCourses', '*', limit, after_id, sort, descending))
+
+    def get_offsite_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                             descending: bool = False) -> str:
+        """Returns page of at most limit offsite courses that follow the course with ID after_id as string"""
+        return self.get_courses_report(*self.__page('OffsiteCourses', 'id_course', limit, after_id, sort, descending))
+
+    def get_teachers_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_teacher',
+                          descending: bool = False) -> list:
+        """Returns page of at most limit teachers that follow the teacher with ID after_id in order of sort key"""
+        return self.fetchall(*self.__page('Teachers', '*', limit, after_id, sort, descending))
+
+    def get_teachers_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_teacher',
+                              descending: bool = False) -> str:
+        """Returns page of at most limit teachers that follow the teacher with ID after_id as string"""
+        return ''.join(Academy.format_teacher(teacher) + '\n'
+                       for teacher in self.get_teachers_page(limit, after_id, sort, descending))
+
+    @staticmethod
+    def search_query(text: str) -> str:
+        """Returns FTS5 query that matches courses with all words of the text
+
+        Words are quoted so that punctuation in them has no special meaning, word ending with * matches
+        every word it is the prefix of"""
+        if not isinstance(text, str):
+            raise TypeError
+        words = []
+        for word in text.split():
+            prefix = word.endswith('*') and len(word) > 1
+            word = word.rstrip('*')
+            if word:
+                words.append('"' + word.replace('"', '""') + '"' + ('*' if prefix else ''))
+        if not words:
+            raise ValueError("No data")
+        return ' '.join(words)
+
+    def search(self, text: str, limit: int = 20) -> list:
+        """Returns at most limit courses whose name, address, teachers or topics contain all words of the text
+
+        Courses are ranked by relevance, matches in name weigh the most, then in topics, teachers and address"""
+        if not isinstance(limit, int):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Limit must be integer and above 0")
+        return self.fetchall('search', (Academy.search_query(text), limit))
+
+    def search_str(self, text: str, limit: int = 20) -> str:
+        """Returns at most limit courses found by search as string"""
+        if not isinstance(limit, int):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Limit must be integer and above 0")
+        return self.get_courses_report('search_ids', (Academy.search_query(text), limit))
+
+    @snapshot_dec
     def get_all_teachers(self) -> list:
         """Returns all teachers that teach at Academy"""
-        return self.fetchall("SELECT * FROM Teachers")
+        return self.fetchall('all_teachers')
 
     def get_all_teachers_str(self) -> str:
         """Returns all teachers that teach at Academy as string"""
-        result = ""
-        for teacher in self.get_all_teachers():
-            result += Academy.get_teacher_str(self, teacher['id_teacher']) + '\n'
-        return result
+        if self.__snapshot is not None and not self.__snapshot.stale:
+            return ''.join(Academy.format_teacher(teacher) + '\n' for teacher in self.get_all_teachers())
+        return ''.join(self.iter_teachers_str())
 
     @check_dec
+    @snapshot_dec
+    @cache_dec
     def get_teacher(self, id_teacher: int):
         """Returns teacher profile by ID"""
-        return self.fetchone(f"SELECT * FROM Teachers WHERE id_teacher == {id_teacher}")
+        return self.fetchone('teacher', (id_teacher,))
 
     @check_dec
     def get_teacher_str(self, id_teacher: int) -> str:
@@ -209,26 +1388,34 @@ class Academy:
 
         Returns string as
         Surname Name Patronymic (birth_date)"""
-        teacher = Academy.get_teacher(self, id_teacher)
+        return Academy.format_teacher(Academy.get_teacher(self, id_teacher))
+
+    @staticmethod
+    def format_teacher(teacher: dict) -> str:
+        """Returns teacher profile as string from teacher row
+
+        Returns string as
+        Surname Name Patronymic (birth_date)"""
         return f"{teacher['surname']} {teacher['name']} {teacher['patronymic']} ({teacher['birth_date']})"
 
     @check_dec
+    @snapshot_dec
     def get_teacher_courses(self, id_teacher: int) -> list:
         """Returns all courses teacher teaches by teacher ID"""
-        return self.fetchall(f"SELECT id_course FROM CoursesTeachers WHERE id_teacher == {id_teacher}")
+        return self.fetchall('teacher_courses', (id_teacher,))
 
     @check_dec
+    @get_courses_dec
     def get_teacher_courses_str(self, id_teacher: int) -> str:
         """Returns all courses teacher teaches by teacher ID as string"""
-        result = ""
-        for course in Academy.get_teacher_courses(self, id_teacher):
-            result += self.get_course_str(course['id_course']) + '\n'
-        return result
+        return 'teacher_courses'
 
     @check_dec
+    @snapshot_dec
+    @cache_dec
     def get_course_teachers(self, id_course: int) -> list:
         """Returns all teachers of the course by course ID"""
-        return self.fetchall(f"SELECT id_teacher FROM CoursesTeachers WHERE id_course == {id_course}")
+        return self.fetchall('course_teachers', (id_course,))
 
     @check_dec
     def get_course_teachers_str(self, id_course: int) -> str:
@@ -239,9 +1426,10 @@ class Academy:
             result += Academy.get_teacher_str(self, teacher['id_teacher']) + '\n'
         return result
 
+    @snapshot_dec
     def get_topics(self) -> list:
         """Returns all topics that were studied at Academy"""
-        return self.fetchall("SELECT * FROM Topics")
+        return self.fetchall('all_topics')
 
     def get_topics_str(self) -> str:
         """Returns all topics that were studied at Academy as string
@@ -253,9 +1441,10 @@ class Academy:
             result += '#' + topic['id_topic'] + ' '
         return result
 
+    @snapshot_dec
     def get_rooms(self) -> list:
         """Returns rooms in Academy that are available for local courses"""
-        return self.fetchall("SELECT * FROM Rooms")
+        return self.fetchall('all_rooms')
 
     def get_rooms_str(self) -> str:
         """Returns rooms in Academy that are available for local courses as string
@@ -264,18 +1453,23 @@ class Academy:
         №room1 №room2 ..."""
         result = ""
         for room in self.get_rooms():
-            result += '№' + room + ' '
+            result += f'№{room["room"]} '
         return result
 
+    @write_dec
     @check_dec
     def add_room(self, id_room: int) -> None:
-        """Adds room to the list of rooms in Academy that are available for local courses"""
-        self.commit(f"INSERT INTO Rooms VALUES({id_room})")
+        """Adds room to the list of rooms in Academy that are available for local courses
+
+        Cached lookups stay valid: room of a course is resolved when the course is inserted"""
+        self.commit('insert_room', (id_room,))
 
     @check_dec
+    @snapshot_dec
+    @cache_dec
     def get_program(self, id_course: int) -> list[str]:
         """Returns course program by course ID"""
-        return self.fetchall(f"SELECT id_topic FROM Program WHERE id_course == {id_course}")
+        return self.fetchall('program', (id_course,))
 
     @check_dec
     def get_program_str(self, id_course: int) -> str:
@@ -286,12 +1480,13 @@ class Academy:
             result += '#' + topic['id_topic'] + ' '
         return result
 
+    @write_dec
     def add_teacher(self, teacher: Teacher) -> None:
-        """Adds teacher to the list of teachers that teach at Academy"""
+        """Adds teacher to the list of teachers that teach at Academy
+
+        Cached lookups stay valid: new teacher does not change existing rows and missing rows are not cached"""
         if not isinstance(teacher, Teacher):
             raise TypeError
         if not teacher:
             raise ValueError("No data")
-        self.commit(f"INSERT OR IGNORE INTO Teachers(surname, name, patronymic, birth_date) \
-                        VALUES(\"{teacher.surname}\", \"{teacher.name}\", \"{teacher.patronymic}\", \
-                        \"{teacher. birth_date}\")")
+        self.commit('insert_teacher', Academy.teacher_params(teacher))
@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from academy import Academy
+
+# Academy methods that only read, concurrent calls of them with the same arguments share one call
+READ_METHODS = ('change_cursor', 'find_conflicts', 'find_free_slot', 'get_course_sessions', 'get_room_timetable',
+                'get_room_timetable_str', 'get_teacher_timetable', 'get_teacher_timetable_str', 'get_all_courses',
+                'get_all_courses_str', 'get_all_local', 'get_all_local_str', 'get_all_offsite',
+                'get_all_offsite_str', 'get_course', 'get_course_str', 'get_all_teachers', 'get_all_teachers_str',
+                'get_teacher', 'get_teacher_str', 'get_teacher_courses', 'get_teacher_courses_str',
+                'get_course_teachers', 'get_course_teachers_str', 'get_topics', 'get_topics_str', 'get_rooms',
+                'get_rooms_str', 'get_program', 'get_program_str')
+
+# Academy methods that change the database
+WRITE_METHODS = ('insert_local', 'insert_offsite', 'import_courses', 'add_room', 'add_teacher', 'backup',
+                 'delete_courses', 'delete_course', 'update_courses', 'update_course', 'remove_teachers',
+                 'remove_teacher', 'rename_topics', 'rename_topic', 'clear_all', 'prune_changes',
+                 'schedule_sessions', 'schedule_session', 'cancel_session')
+
+
+def awaitable(name: str, read: bool):
+    """Returns coroutine method that runs the Academy method of the name in the executor"""
+    async def method(self, *args, **kwargs):
+        return await (self.read if read else self.write)(name, *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = f"Returns result of Academy.{name} called in the executor"
+    return method
+
+
+class AsyncAcademy:
+    """Class that implements awaitable Software Academy functionality
+
+    Calls of Academy run on a dedicated executor so they do not block the event loop. Every method of
+    READ_METHODS and WRITE_METHODS is awaitable with the arguments of the Academy method"""
+
+    def __init__(self, db_location: str = None, pool_size: int = 4, max_workers: int = None):
+        """Constructor of AsyncAcademy
+
+        Opens pooled Academy at db_location with pool_size read connections and an executor of max_workers threads,
+        by default as many as there are read connections"""
+        self.__academy = Academy(db_location, pool_size=pool_size)
+        self.__executor = ThreadPoolExecutor(max_workers or pool_size, thread_name_prefix="academy")
+        self.__in_flight = {}  # (method name, arguments) -> [future of the call, number of waiting coroutines]
+
+    @property
+    def academy(self) -> Academy:
+        """Returns Academy the calls are run on"""
+        return self.__academy
+
+    async def read(self, name: str, *args, **kwargs):
+        """Returns result of the Academy read method called in the executor
+
+        Coroutines awaiting the same method with the same arguments share the call that is in flight and get
+        the same result object, a coroutine that changes the result copies it first.
+        Cancelled coroutine stops waiting, the call is cancelled too if it has not started and no one else waits"""
+        key = (name, args, tuple(sorted(kwargs.items())))
+        call = self.__in_flight.get(key)
+        if call is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.__executor, partial(getattr(self.__academy, name), *args, **kwargs))
+            call = self.__in_flight[key] = [future, 0]
+            future.add_done_callback(lambda _: self.__forget(key, call))
+        call[1] += 1
+        try:
+            return await asyncio.shield(call[0])  # cancelling one coroutine must not cancel the shared call
+        except asyncio.CancelledError:
+            if call[1] == 1:
+                call[0].cancel()
+                self.__forget(key, call)
+            raise
+        finally:
+            call[1] -= 1
+
+    def __forget(self, key: tuple, call: list) -> None:
+        """Stops sharing the call with coroutines that read later"""
+        if self.__in_flight.get(key) is call:
+            del self.__in_flight[key]
+
+    async def write(self, name: str, *args, **kwargs):
+        """Returns result of the Academy write method called in the executor
+
+        Reads in flight are not shared with coroutines that read after the write, they may miss its changes"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.__executor, partial(getattr(self.__academy, name), *args, **kwargs))
+        finally:
+            self.__in_flight.clear()
+
+    async def close(self) -> None:
+        """Waits for the calls in flight and closes connection with database"""
+        await asyncio.get_running_loop().run_in_executor(None, self.__executor.shutdown)
+        self.__academy.close()
+
+
+for method_name in READ_METHODS + WRITE_METHODS:
+    setattr(AsyncAcademy, method_name, awaitable(method_name, method_name in READ_METHODS))
@@ -0,0 +1,127 @@
+import json
+import time
+from itertools import islice
+from academy import Academy
+from classes import LocalCourse
+from factories import TeacherFactory
+from loaders import course_from_record
+
+# commands anyone can run: methods of Academy that read the catalogue or insert courses
+COMMANDS = ('get_all_courses', 'get_all_courses_str', 'get_all_local', 'get_all_local_str', 'get_all_offsite',
+            'get_all_offsite_str', 'get_course', 'get_course_str', 'get_all_teachers', 'get_all_teachers_str',
+            'get_teacher', 'get_teacher_str', 'get_teacher_courses', 'get_teacher_courses_str', 'get_course_teachers',
+            'get_course_teachers_str', 'get_program', 'get_program_str', 'get_topics', 'get_topics_str', 'get_rooms',
+            'get_rooms_str', 'get_courses_page', 'get_courses_page_str', 'get_local_page', 'get_local_page_str',
+            'get_offsite_page', 'get_offsite_page_str', 'get_teachers_page', 'get_teachers_page_str', 'search',
+            'search_str', 'stats', 'stats_str', 'changes_since', 'change_cursor', 'get_course_sessions',
+            'get_room_timetable', 'get_room_timetable_str', 'get_teacher_timetable', 'get_teacher_timetable_str',
+            'find_conflicts', 'insert_local', 'insert_offsite', 'insert_course', 'import_courses')
+# commands that need the password of the administrator as "password" of the command
+ADMIN_COMMANDS = ('add_room', 'add_teacher', 'clear_all', 'check_stats', 'delete_course', 'delete_courses',
+                  'update_course', 'update_courses', 'remove_teacher', 'remove_teachers', 'rename_topic',
+                  'rename_topics', 'prune_changes', 'schedule_session', 'schedule_sessions', 'cancel_session')
+
+
+def teacher_from_record(record: dict):
+    """Returns teacher created from the record as {"surname": ..., "name": ..., "patronymic": ..., "birth_date": ...}"""
+    return TeacherFactory.create_teacher(record['surname'], record['name'], record['patronymic'], record['birth_date'])
+
+
+def courses_by_id(records: dict) -> dict:
+    """Returns courses created from the records by course ID, IDs are JSON object keys and come as strings"""
+    return {int(id_course): course_from_record(record) for id_course, record in records.items()}
+
+
+# command -> converters of its positional arguments from JSON, None leaves the argument as it is
+ARGUMENTS = {'insert_local': (course_from_record,), 'insert_offsite': (course_from_record,),
+             'insert_course': (course_from_record,),
+             'import_courses': (lambda records: [course_from_record(record) for record in records],),
+             'update_course': (None, course_from_record), 'update_courses': (courses_by_id,),
+             'add_teacher': (teacher_from_record,)}
+
+
+def insert_course(academy: Academy, course) -> None:
+    """Inserts the course as local or offsite depending on its type"""
+    if isinstance(course, LocalCourse):
+        academy.insert_local(course)
+    else:
+        academy.insert_offsite(course)
+
+
+def to_json(value):
+    """Returns the result of a command as JSON value: generators become lists and named tuples become objects"""
+    if hasattr(value, '_asdict'):
+        return {key: to_json(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, '__iter__'):
+        return [to_json(item) for item in value]
+    return str(value)
+
+
+def run_command(academy: Academy, command: dict):
+    """Runs the command as {"command": name, "args": [...], "kwargs": {...}, "password": ...} and returns its result
+
+    Name is a method of Academy from COMMANDS or ADMIN_COMMANDS or insert_course that inserts local or offsite
+    course. Courses and teachers are given as records of loaders.course_from_record"""
+    name = command.get('command')
+    if name not in COMMANDS and name not in ADMIN_COMMANDS:
+        raise ValueError(f"Unknown command {name}")
+    if name in ADMIN_COMMANDS and not Academy.password_match(command.get('password')):
+        raise PermissionError("Wrong password. Access blocked")
+    args, kwargs = command.get('args', []), command.get('kwargs', {})
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        raise TypeError
+    converters = ARGUMENTS.get(name, ())
+    args = [converters[i](arg) if i < len(converters) and converters[i] else arg for i, arg in enumerate(args)]
+    if name == 'insert_course':
+        return insert_course(academy, *args, **kwargs)
+    return to_json(getattr(academy, name)(*args, **kwargs))
+
+
+def run_batch(academy: Academy, lines, output, group_size: int = 100) -> dict:
+    """Runs commands given as JSON lines and writes a JSON result line for every command to output
+
+    Commands are run by groups of group_size in one transaction per group, a command that fails is undone alone
+    and the group goes on. Result line is {"line": ..., "id": ..., "ok": true, "result": ...} or
+    {"line": ..., "id": ..., "ok": false, "error": ...}, id is copied from the command if it has one.
+    Returns number of commands, errors, groups, seconds and commands per second"""
+    if not isinstance(group_size, int):
+        raise TypeError
+    if group_size <= 0:
+        raise ValueError("Group size must be integer and above 0")
+    commands = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    count = errors = groups = 0
+    start = time.perf_counter()
+    while group := list(islice(commands, group_size)):
+        results = []
+        try:
+            with academy.transaction():
+                for number, line in group:
+                    result = {'line': number}
+                    try:
+                        command = json.loads(line)
+                        if not isinstance(command, dict):
+                            raise ValueError("Command must be a JSON object")
+                        if 'id' in command:
+                            result['id'] = command['id']
+                        with academy.transaction():  # savepoint: a failed command leaves the group as it was
+                            result['result'] = run_command(academy, command)
+                        result['ok'] = True
+                    except Exception as err:
+                        result.update(ok=False, error=f"{type(err).__name__}: {err}")
+                    results.append(result)
+        except Exception as err:  # the group was not committed, so none of its commands took effect
+            ids = {result['line']: result['id'] for result in results if 'id' in result}
+            results = [{'line': number, **({'id': ids[number]} if number in ids else {}), 'ok': False,
+                        'error': f"{type(err).__name__}: {err}"} for number, _ in group]
+        for result in results:
+            errors += not result['ok']
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+        count += len(group)
+        groups += 1
+    seconds = time.perf_counter() - start
+    return {'commands': count, 'errors': errors, 'groups': groups, 'seconds': seconds,
+            'commands_per_second': count / seconds if seconds else 0.0}
@@ -0,0 +1,1439 @@
+import argparse
+import asyncio
+import builtins
+import gc
+import inspect
+import os
+import json
+import platform
+import statistics
+import random
+import resource
+import runpy
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from itertools import cycle, islice
+from datetime import datetime, timedelta
+from academy import Academy
+from async_academy import AsyncAcademy
+from classes import LocalCourse, Teacher
+from export import export_columnar, export_jsonl
+from factories import CourseFactory, TeacherFactory
+from generator import Generator, letters
+from profiles import PROFILES
+from sharding import ShardedAcademy
+
+DB_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_courses.db")
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+# public method of Academy -> call of it by Academy, random generator and Generator of the data, writes go last
+SUITE_CALLS = {
+    'get_all_courses': lambda academy, rnd, data: academy.get_all_courses(),
+    'get_all_courses_str': lambda academy, rnd, data: academy.get_all_courses_str(),
+    'get_all_local': lambda academy, rnd, data: academy.get_all_local(),
+    'get_all_local_str': lambda academy, rnd, data: academy.get_all_local_str(),
+    'get_all_offsite': lambda academy, rnd, data: academy.get_all_offsite(),
+    'get_all_offsite_str': lambda academy, rnd, data: academy.get_all_offsite_str(),
+    'get_course': lambda academy, rnd, data: academy.get_course(rnd.randint(1, data['courses'])),
+    'get_course_str': lambda academy, rnd, data: academy.get_course_str(rnd.randint(1, data['courses'])),
+    'get_course_teachers': lambda academy, rnd, data: academy.get_course_teachers(rnd.randint(1, data['courses'])),
+    'get_course_teachers_str':
+        lambda academy, rnd, data: academy.get_course_teachers_str(rnd.randint(1, data['courses'])),
+    'get_program': lambda academy, rnd, data: academy.get_program(rnd.randint(1, data['courses'])),
+    'get_program_str': lambda academy, rnd, data: academy.get_program_str(rnd.randint(1, data['courses'])),
+    'get_all_teachers': lambda academy, rnd, data: academy.get_all_teachers(),
+    'get_all_teachers_str': lambda academy, rnd, data: academy.get_all_teachers_str(),
+    'get_teacher': lambda academy, rnd, data: academy.get_teacher(rnd.randint(1, data['teachers'])),
+    'get_teacher_str': lambda academy, rnd, data: academy.get_teacher_str(rnd.randint(1, data['teachers'])),
+    'get_teacher_courses': lambda academy, rnd, data: academy.get_teacher_courses(rnd.randint(1, data['teachers'])),
+    'get_teacher_courses_str':
+        lambda academy, rnd, data: academy.get_teacher_courses_str(rnd.randint(1, data['teachers'])),
+    'get_topics': lambda academy, rnd, data: academy.get_topics(),
+    'get_topics_str': lambda academy, rnd, data: academy.get_topics_str(),
+    'get_rooms': lambda academy, rnd, data: academy.get_rooms(),
+    'get_rooms_str': lambda academy, rnd, data: academy.get_rooms_str(),
+    'get_courses_report': lambda academy, rnd, data: academy.get_courses_report('all_local_ids'),
+    'get_courses_page': lambda academy, rnd, data: academy.get_courses_page(20, rnd.randint(0, data['courses'])),
+    'get_courses_page_str':
+        lambda academy, rnd, data: academy.get_courses_page_str(20, rnd.randint(0, data['courses'])),
+    'get_local_page': lambda academy, rnd, data: academy.get_local_page(20, rnd.randint(0, data['courses'])),
+    'get_local_page_str': lambda academy, rnd, data: academy.get_local_page_str(20, rnd.randint(0, data['courses'])),
+    'get_offsite_page': lambda academy, rnd, data: academy.get_offsite_page(20, rnd.randint(0, data['courses'])),
+    'get_offsite_page_str':
+        lambda academy, rnd, data: academy.get_offsite_page_str(20, rnd.randint(0, data['courses'])),
+    'get_teachers_page': lambda academy, rnd, data: academy.get_teachers_page(20, rnd.randint(0, data['teachers'])),
+    'get_teachers_page_str':
+        lambda academy, rnd, data: academy.get_teachers_page_str(20, rnd.randint(0, data['teachers'])),
+    'iter_rows': lambda academy, rnd, data: sum(1 for _ in academy.iter_rows('all_teachers')),
+    'iter_local': lambda academy, rnd, data: sum(1 for _ in academy.iter_local()),
+    'iter_local_str': lambda academy, rnd, data: sum(1 for _ in academy.iter_local_str()),
+    'iter_offsite': lambda academy, rnd, data: sum(1 for _ in academy.iter_offsite()),
+    'iter_offsite_str': lambda academy, rnd, data: sum(1 for _ in academy.iter_offsite_str()),
+    'iter_courses_str': lambda academy, rnd, data: sum(1 for _ in academy.iter_courses_str()),
+    'iter_teachers': lambda academy, rnd, data: sum(1 for _ in academy.iter_teachers()),
+    'iter_teachers_str': lambda academy, rnd, data: sum(1 for _ in academy.iter_teachers_str()),
+    'iter_topics': lambda academy, rnd, data: sum(1 for _ in academy.iter_topics()),
+    'iter_topics_str': lambda academy, rnd, data: sum(1 for _ in academy.iter_topics_str()),
+    'iter_course_records': lambda academy, rnd, data: sum(1 for _ in academy.iter_course_records()),
+    'iter_tables': lambda academy, rnd, data: sum(1 for _ in academy.iter_tables()),
+    'backup': lambda academy, rnd, data: academy.backup(os.path.join(data['directory'], "backup.db")),
+    'changes_since': lambda academy, rnd, data: sum(1 for _ in academy.changes_since(academy.change_cursor() - 1000)),
+    'change_cursor': lambda academy, rnd, data: academy.change_cursor(),
+    'stats': lambda academy, rnd, data: academy.stats(),
+    'stats_str': lambda academy, rnd, data: academy.stats_str(),
+    'format_stats': lambda academy, rnd, data: Academy.format_stats(data['stats']),
+    'check_stats': lambda academy, rnd, data: academy.check_stats(),
+    'search': lambda academy, rnd, data: academy.search(rnd.choice(data['words'])),
+    'search_str': lambda academy, rnd, data: academy.search_str(rnd.choice(data['words'])),
+    'search_query': lambda academy, rnd, data: Academy.search_query(rnd.choice(data['words'])),
+    'format_course': lambda academy, rnd, data: Academy.format_course(
+        {'id_course': 1, 'name': "Python", 'room': 1}, "Teachers: -\n", "Program: -\n"),
+    'format_teacher': lambda academy, rnd, data: Academy.format_teacher(
+        {'id_teacher': 1, 'surname': "Ivanenko", 'name': "Olena", 'patronymic': "Petrivna",
+         'birth_date': "1980-01-21"}),
+    'teacher_params': lambda academy, rnd, data: Academy.teacher_params(data['teacher']),
+    'password_match': lambda academy, rnd, data: Academy.password_match("admin"),
+    'dict_factory': lambda academy, rnd, data: academy.fetchone("SELECT 1 AS one"),
+    'fetchall': lambda academy, rnd, data: academy.fetchall('program', (rnd.randint(1, data['courses']),)),
+    'fetchone': lambda academy, rnd, data: academy.fetchone('local', (rnd.randint(1, data['courses']),)),
+    'explain': lambda academy, rnd, data: academy.explain('teacher_courses', (1,)),
+    'data_version': lambda academy, rnd, data: academy.data_version(),
+    'load_snapshot': lambda academy, rnd, data: (academy.load_snapshot(), academy.drop_snapshot()),
+    'snapshot_is_current': lambda academy, rnd, data: academy.snapshot_is_current(),
+    'refresh_snapshot': lambda academy, rnd, data: (academy.refresh_snapshot(), academy.drop_snapshot()),
+    'drop_snapshot': lambda academy, rnd, data: academy.drop_snapshot(),
+    'trace': lambda academy, rnd, data: academy.remove_query_hook(academy.trace()),
+    'add_query_hook': lambda academy, rnd, data: (academy.add_query_hook(count_query),
+                                                  academy.remove_query_hook(count_query)),  # hooks do not pile up
+    'remove_query_hook': lambda academy, rnd, data: academy.remove_query_hook(count_query),
+    'set_profile': lambda academy, rnd, data: academy.set_profile('durable'),
+    'use_profile': lambda academy, rnd, data: use_profile_block(academy),
+    'session_time': lambda academy, rnd, data: Academy.session_time("2026-09-01T10:00"),
+    'schedule_session': lambda academy, rnd, data: academy.schedule_session(*random_session(rnd, data)),
+    'schedule_sessions': lambda academy, rnd, data: academy.schedule_sessions(
+        [random_session(rnd, data) for _ in range(100)], skip_conflicts=True),
+    'cancel_session': lambda academy, rnd, data: academy.cancel_session(rnd.randint(1, 1000)),
+    'find_conflicts': lambda academy, rnd, data: academy.find_conflicts(*random_session(rnd, data)),
+    'find_free_slot': lambda academy, rnd, data: academy.find_free_slot(
+        rnd.randint(1, data['courses']), random_session(rnd, data)[1], timedelta(minutes=90)),
+    'get_course_sessions': lambda academy, rnd, data: academy.get_course_sessions(rnd.randint(1, data['courses'])),
+    'get_room_timetable': lambda academy, rnd, data: academy.get_room_timetable(rnd.randint(1, data['rooms'])),
+    'get_room_timetable_str':
+        lambda academy, rnd, data: academy.get_room_timetable_str(rnd.randint(1, data['rooms'])),
+    'get_teacher_timetable':
+        lambda academy, rnd, data: academy.get_teacher_timetable(rnd.randint(1, data['teachers'])),
+    'get_teacher_timetable_str':
+        lambda academy, rnd, data: academy.get_teacher_timetable_str(rnd.randint(1, data['teachers'])),
+    'format_timetable': lambda academy, rnd, data: Academy.format_timetable(
+        [{'id_session': 1, 'name': "Python", 'room': 1, 'start_time': "2026-09-01 10:00",
+          'end_time': "2026-09-01 11:30"}]),
+    'insert_local': lambda academy, rnd, data: academy.insert_local(
+        CourseFactory.create_local(f"Course {rnd.random()}", 1, "loops", "classes")),
+    'insert_offsite': lambda academy, rnd, data: academy.insert_offsite(
+        CourseFactory.create_offsite(f"Course {rnd.random()}", "1 Franka street", "loops", "classes")),
+    'import_courses': lambda academy, rnd, data: academy.import_courses(
+        Generator(data['teachers'], 100, seed=rnd.randrange(2 ** 32)).courses()),
+    'add_room': lambda academy, rnd, data: academy.add_room(data['rooms'] + rnd.randrange(1, 2 ** 31)),
+    'add_teacher': lambda academy, rnd, data: academy.add_teacher(
+        TeacherFactory.create_teacher(f"Newteacher{letters(rnd.randrange(2 ** 40))}", "Olena", "Petrivna",
+                                      "1980-01-21")),
+    'execute': lambda academy, rnd, data: academy.execute('insert_room', (data['rooms'] + rnd.randrange(1, 2 ** 31),)),
+    'executemany': lambda academy, rnd, data: academy.executemany(
+        'insert_room', [(data['rooms'] + rnd.randrange(1, 2 ** 31),) for _ in range(100)]),
+    'commit': lambda academy, rnd, data: academy.commit('insert_room', (data['rooms'] + rnd.randrange(1, 2 ** 31),)),
+    'update_course': lambda academy, rnd, data: academy.update_course(
+        rnd.randint(1, data['courses']),
+        CourseFactory.create_offsite(f"Course {rnd.random()}", "1 Franka street", "loops")),
+    'update_courses': lambda academy, rnd, data: academy.update_courses(
+        {id_course: CourseFactory.create_local(f"Course {rnd.random()}", 1, "classes")
+         for id_course in rnd.sample(range(1, data['courses'] + 1), min(100, data['courses']))}),
+    'rename_topic': lambda academy, rnd, data: academy.rename_topic(rnd.choice(data['topics']),
+                                                                    f"topic {rnd.random()}"),
+    'rename_topics': lambda academy, rnd, data: academy.rename_topics(
+        {topic: f"topic {rnd.random()}" for topic in rnd.sample(data['topics'], 5)}),
+    'remove_teacher': lambda academy, rnd, data: academy.remove_teacher(rnd.randint(1, data['teachers'])),
+    'remove_teachers': lambda academy, rnd, data: academy.remove_teachers(
+        rnd.sample(range(1, data['teachers'] + 1), min(20, data['teachers']))),
+    'delete_course': lambda academy, rnd, data: academy.delete_course(rnd.randint(1, data['courses'])),
+    'delete_courses': lambda academy, rnd, data: academy.delete_courses(
+        rnd.sample(range(1, data['courses'] + 1), min(100, data['courses']))),
+    'prune_changes': lambda academy, rnd, data: academy.prune_changes(academy.change_cursor() // 2),
+    'iter_courses_report': lambda academy, rnd, data: sum(1 for _ in academy.iter_courses_report('all_local_ids')),
+    'transaction': lambda academy, rnd, data: transaction_block(academy, data['rooms'] + rnd.randrange(1, 2 ** 31)),
+    'clear_all': lambda academy, rnd, data: academy.clear_all(),
+}
+SUITE_UNTIMED = {'open', 'close'}  # public methods the suite does not time
+SUITE_ONCE = {'clear_all'}  # methods timed by a single call: their effect is not repeatable
+
+# menu option of main.py -> input of one use of the option, {course}, {teacher}, {room}, {letters}, {session}
+# and {session_end} are replaced
+MENU_ACTIONS = {
+    '1. insert local course': "1\nPython {room}\nloops, classes\n1\n1\nIvanenko\nOlena\nPetrivna\n1980-01-21\n\n",
+    '3. display all courses': "3\nn\nn\nq\n\n",
+    '4. display all local courses': "4\nn\nn\nq\n\n",
+    '5. display all offsite courses': "5\nn\nn\nq\n\n",
+    '6. find course by ID': "6\n{course}\n\n",
+    '7. display all teachers': "7\nn\nn\nq\n\n",
+    '8. find teacher by ID': "8\n{teacher}\n\n",
+    '9. courses of the teacher': "9\n{teacher}\n\n",
+    '10. teachers of the course': "10\n{course}\n\n",
+    '11. program of the course': "11\n{course}\n\n",
+    '12. display topics': "12\n\n",
+    '13. display rooms': "13\n\n",
+    '14. add room': "14\nadmin\n{room}\n\n",
+    '15. add teacher': "15\nadmin\nNewteacher{letters}\nOlena\nPetrivna\n1980-01-21\n\n",
+    '17. search courses': "17\npython loo*\n\n",
+    '18. display statistics': "18\n\n",
+    '19. check statistics': "19\nadmin\n\n",
+    '20. room timetable': "20\n1\n\n\n",
+    '21. schedule session': "21\nadmin\n{course}\n{session}\n{session_end}\n\n",
+    '16. clear database': "16\nadmin\n\n",  # the last one: the database is empty after it
+}
+
+
+# run in a fresh interpreter: prints seconds of the import of academy, construction of Academy and its first query
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from academy import Academy
+imported = time.perf_counter()
+academy = Academy(sys.argv[1])
+constructed = time.perf_counter()
+academy.get_course(1)
+queried = time.perf_counter()
+academy.close()
+print(json.dumps({'import': imported - start, 'construct': constructed - imported,
+                  'first_query': queried - constructed}))
+"""
+
+
+class CountingAcademy(Academy):
+    """Academy that counts queries sent to the database"""
+
+    def __init__(self, db_location: str = None):
+        """Constructs CountingAcademy with zero queries sent"""
+        super().__init__(db_location)
+        self.queries = 0
+
+    def fetchall(self, queries: str, params=()) -> list:
+        """Counts and fetches all the rows of a executed query result"""
+        self.queries += 1
+        return super().fetchall(queries, params)
+
+    def fetchone(self, query: str, params=()):
+        """Counts and fetches a single record"""
+        self.queries += 1
+        return super().fetchone(query, params)
+
+
+def make_db(directory: str, name: str = "bench.db") -> str:
+    """Returns location of an empty database with the schema of python_courses.db"""
+    location = os.path.join(directory, name)
+    shutil.copy(DB_TEMPLATE, location)
+    connection = sqlite3.connect(location)
+    for table in ("Courses", "LocalCourses", "OffsiteCourses", "CoursesTeachers", "Program", "Rooms", "Teachers",
+                  "Topics"):
+        connection.execute(f"DELETE FROM {table}")
+    connection.commit()
+    connection.close()
+    return location
+
+
+def seed(location: str, courses: int, teachers_per_course: int = 2, topics_per_course: int = 3,
+         seed_value: int = 0) -> None:
+    """Fills the database with generated courses, teachers, rooms and topics"""
+    rnd = random.Random(seed_value)
+    teachers = max(1, courses // 5)
+    topics = [f"topic{i}" for i in range(50)]
+    rooms = list(range(1, 21))
+    connection = sqlite3.connect(location)
+    connection.executemany("INSERT INTO Rooms VALUES(?)", ((room,) for room in rooms))
+    connection.executemany("INSERT INTO Topics VALUES(?)", ((topic,) for topic in topics))
+    connection.executemany("INSERT INTO Teachers VALUES(?, ?, ?, ?, ?)",
+                           ((i, f"Surname{chr(97 + i % 26)}", "Name", "Patronymic",
+                             f"19{50 + i % 50}-0{1 + i % 9}-2{i % 10}") for i in range(1, teachers + 1)))
+    connection.executemany("INSERT INTO Courses VALUES(?)", ((i,) for i in range(1, courses + 1)))
+    connection.executemany("INSERT INTO LocalCourses VALUES(?, ?, ?)",
+                           ((i, f"Course {i}", rnd.choice(rooms)) for i in range(1, courses + 1) if i % 2))
+    connection.executemany("INSERT INTO OffsiteCourses VALUES(?, ?, ?)",
+                           ((i, f"Course {i}", f"{i} Main street") for i in range(1, courses + 1) if not i % 2))
+    connection.executemany("INSERT INTO CoursesTeachers VALUES(?, ?)",
+                           ((i, rnd.randint(1, teachers)) for i in range(1, courses + 1)
+                            for _ in range(teachers_per_course)))
+    connection.executemany("INSERT INTO Program VALUES(?, ?)",
+                           ((i, topic) for i in range(1, courses + 1)
+                            for topic in rnd.sample(topics, topics_per_course)))
+    connection.commit()
+    connection.close()
+
+
+def legacy_all_courses_str(academy: Academy) -> str:
+    """Returns all courses as string built with a query per course, teacher and program"""
+    result = ""
+    for course in academy.get_all_local() + academy.get_all_offsite():
+        result += academy.get_course_str(course['id_course']) + '\n'
+    return result
+
+
+def bench_report(sizes: list, legacy_limit: int) -> None:
+    """Compares query count and wall time of the report engine with the per-course queries"""
+    print(f"{'courses':>10} {'engine queries':>15} {'engine s':>10} {'legacy queries':>15} {'legacy s':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            location = make_db(directory)
+            seed(location, size)
+            academy = CountingAcademy(location)
+            start = time.perf_counter()
+            report = academy.get_all_courses_str()
+            engine_time = time.perf_counter() - start
+            engine_queries, academy.queries = academy.queries, 0
+            legacy_queries, legacy_time = "-", "-"
+            if size <= legacy_limit:
+                start = time.perf_counter()
+                legacy = legacy_all_courses_str(academy)
+                legacy_time = f"{time.perf_counter() - start:.3f}"
+                legacy_queries = academy.queries
+                if legacy != report:
+                    raise AssertionError("Report engine output differs from get_course_str output")
+            academy.close()
+            print(f"{size:>10} {engine_queries:>15} {engine_time:>10.3f} {legacy_queries:>15} {legacy_time:>10}")
+
+
+def bench_lookups(size: int, lookups: int) -> None:
+    """Times repeated lookups of menu options 6-11 and compares named statements with formatted queries"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        rnd = random.Random(0)
+        course_ids = [rnd.randint(1, size) for _ in range(lookups)]
+        teachers = [teacher['id_teacher'] for teacher in academy.get_all_teachers()]
+        teacher_ids = [rnd.choice(teachers) for _ in range(lookups)]
+        start = time.perf_counter()
+        for id_course in course_ids:
+            academy.fetchone(f"SELECT * FROM LocalCourses WHERE id_course == {id_course}")
+        formatted_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for id_course in course_ids:
+            academy.fetchone('local', (id_course,))
+        named_time = time.perf_counter() - start
+        print(f"get_course lookup x{lookups}: formatted {formatted_time:.3f} s, named {named_time:.3f} s")
+        academy.statements.reset_counters()
+        menu = {
+            "6. get_course_str": lambda i: academy.get_course_str(course_ids[i]),
+            "8. get_teacher_str": lambda i: academy.get_teacher_str(teacher_ids[i]),
+            "9. get_teacher_courses_str": lambda i: academy.get_teacher_courses_str(teacher_ids[i]),
+            "10. get_course_teachers_str": lambda i: academy.get_course_teachers_str(course_ids[i]),
+            "11. get_program_str": lambda i: academy.get_program_str(course_ids[i]),
+        }
+        for option, action in menu.items():
+            start = time.perf_counter()
+            for i in range(lookups):
+                action(i)
+            print(f"{option:<30} x{lookups}: {time.perf_counter() - start:.3f} s")
+        for name, count in academy.statement_counters.items():
+            if count:
+                print(f"{name:<40} {count:>10}")
+        academy.close()
+
+
+def generate_courses(count: int, seed_value: int = 0):
+    """Yields generated local and offsite courses with teachers"""
+    rnd = random.Random(seed_value)
+    topics = [f"topic{i}" for i in range(50)]
+    identities = range(max(2, min(count // 5 + 1, 5850)))  # teachers repeat with period 5850 of the number
+    for i in range(1, count + 1):
+        if i % 2:
+            course = CourseFactory.create_local(f"Course {i}", rnd.randint(1, 20), *rnd.sample(topics, 3))
+        else:
+            course = CourseFactory.create_offsite(f"Course {i}", f"{i} Main street", *rnd.sample(topics, 3))
+        for j in rnd.sample(identities, 2):  # a course has distinct teachers
+            course.add_teacher(TeacherFactory.create_teacher(f"Surname{chr(97 + j % 26)}", "Name", "Patronymic",
+                                                             f"19{50 + j % 50}-0{1 + j % 9}-2{j % 10}"))
+        yield course
+
+
+def bench_import(sizes: list, batch_size: int, legacy_limit: int) -> None:
+    """Compares bulk import_courses with insert_local and insert_offsite per course"""
+    print(f"{'courses':>10} {'import s':>10} {'batches':>8} {'slowest batch s':>16} {'per course s':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            academy = Academy(make_db(directory))
+            start = time.perf_counter()
+            stats = academy.import_courses(generate_courses(size), batch_size)
+            import_time = time.perf_counter() - start
+            legacy_time = "-"
+            if size <= legacy_limit:
+                academy.clear_all()
+                start = time.perf_counter()
+                for course in generate_courses(size):
+                    if hasattr(course, 'room'):
+                        academy.insert_local(course)
+                    else:
+                        academy.insert_offsite(course)
+                legacy_time = f"{time.perf_counter() - start:.3f}"
+            academy.close()
+            slowest = max((batch['seconds'] for batch in stats), default=0)
+            print(f"{size:>10} {import_time:>10.3f} {len(stats):>8} {slowest:>16.3f} {legacy_time:>13}")
+
+
+def bench_concurrency(size: int, threads: int, pool_sizes: list, requests: int) -> None:
+    """Measures get_course_str throughput of threads sharing a pooled Academy"""
+    print(f"{'pool size':>10} {'threads':>8} {'requests/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        for pool_size in pool_sizes:
+            academy = Academy(location, pool_size=pool_size)
+
+            def worker(seed_value: int) -> None:
+                rnd = random.Random(seed_value)
+                for _ in range(requests // threads):
+                    academy.get_course_str(rnd.randint(1, size))
+
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            academy.close()
+            print(f"{pool_size:>10} {threads:>8} {requests // threads * threads / elapsed:>12.0f}")
+
+
+def bench_async(size: int, coroutines: int, distinct: int, pool_size: int) -> None:
+    """Measures latency of concurrent coroutines reading courses through AsyncAcademy"""
+    async def run(location: str) -> None:
+        academy = AsyncAcademy(location, pool_size=pool_size)
+        rnd = random.Random(0)
+        ids = [rnd.randint(1, min(size, distinct)) for _ in range(coroutines)]
+        latencies = []
+
+        async def request(id_course: int) -> None:
+            start = time.perf_counter()
+            await academy.get_course_str(id_course)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(id_course) for id_course in ids))
+        elapsed = time.perf_counter() - start
+        calls = academy.academy.statement_counters['local']  # get_course_str looks up LocalCourses once
+        await academy.close()
+        latencies.sort()
+        print(f"{coroutines} coroutines over {distinct} courses in {elapsed:.3f} s, {calls} get_course_str calls")
+        print(f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        asyncio.run(run(location))
+
+
+def bench_cache(size: int, lookups: int, cache_sizes: list, ttl: float) -> None:
+    """Times repeated get_course_str and get_teacher_str lookups with caches of different sizes"""
+    print(f"{'cache size':>10} {'seconds':>8} {'hits':>8} {'misses':>8} {'evictions':>10} {'expirations':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        for cache_size in cache_sizes:
+            academy = Academy(location, cache_size=cache_size, cache_ttl=ttl)
+            rnd = random.Random(0)
+            start = time.perf_counter()
+            for _ in range(lookups):
+                academy.get_course_str(int(rnd.paretovariate(1.2)) % size + 1)  # a few courses are popular
+            elapsed = time.perf_counter() - start
+            stats = academy.cache.stats if academy.cache else {}
+            academy.close()
+            print(f"{cache_size:>10} {elapsed:>8.3f} {stats.get('hits', '-'):>8} {stats.get('misses', '-'):>8} "
+                  f"{stats.get('evictions', '-'):>10} {stats.get('expirations', '-'):>12}")
+
+
+def bench_pages(size: int, limit: int, repeats: int) -> None:
+    """Compares cost of keyset pages with OFFSET pages at growing depth"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        print(f"{'page':>10} {'keyset ms':>10} {'offset ms':>10}")
+        for depth in (0, size // 200, size // 20, size // 2 - limit):
+            after_id = academy.fetchone("SELECT id_course FROM LocalCourses ORDER BY name, id_course "
+                                        "LIMIT 1 OFFSET ?", (depth,))['id_course'] if depth else None
+            start = time.perf_counter()
+            for _ in range(repeats):
+                academy.get_local_page(limit, after_id, 'name')
+            keyset = (time.perf_counter() - start) / repeats * 1000
+            start = time.perf_counter()
+            for _ in range(repeats):
+                academy.fetchall("SELECT * FROM LocalCourses ORDER BY name, id_course LIMIT ? OFFSET ?", (limit, depth))
+            offset = (time.perf_counter() - start) / repeats * 1000
+            print(f"{depth // limit + 1:>10} {keyset:>10.3f} {offset:>10.3f}")
+        academy.close()
+
+
+def bench_search(size: int, limit: int, repeats: int) -> None:
+    """Compares Academy.search with a LIKE scan over courses, teachers and topics"""
+    like = ("SELECT id_course FROM (SELECT id_course, name, '' AS address FROM LocalCourses "
+            "UNION ALL SELECT id_course, name, address FROM OffsiteCourses) AS Listing "
+            "WHERE name LIKE ?1 OR address LIKE ?1 "
+            "OR id_course IN (SELECT id_course FROM Program WHERE id_topic LIKE ?1) "
+            "OR id_course IN (SELECT id_course FROM CoursesTeachers JOIN Teachers USING(id_teacher) "
+            "WHERE surname LIKE ?1 OR name LIKE ?1 OR patronymic LIKE ?1) LIMIT ?2")
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        print(f"{'query':>15} {'search ms':>10} {'found':>6} {'LIKE ms':>10} {'found':>6}")
+        for text in ("topic7", "Surnameq", f"Course {size // 2}", "Main"):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                found = academy.search(text, limit)
+            search_time = (time.perf_counter() - start) / repeats * 1000
+            start = time.perf_counter()
+            for _ in range(repeats):
+                like_found = academy.fetchall(like, (f"%{text}%", limit))
+            like_time = (time.perf_counter() - start) / repeats * 1000
+            print(f"{text:>15} {search_time:>10.3f} {len(found):>6} {like_time:>10.3f} {len(like_found):>6}")
+        academy.close()
+
+
+def bench_snapshot(size: int, lookups: int) -> None:
+    """Compares reads served from the in-memory snapshot with reads through SQL"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        rnd = random.Random(0)
+        course_ids = [rnd.randint(1, size) for _ in range(lookups)]
+        teachers = [teacher['id_teacher'] for teacher in academy.get_all_teachers()]
+        teacher_ids = [rnd.choice(teachers) for _ in range(lookups)]
+        reads = {
+            "get_course": lambda i: academy.get_course(course_ids[i]),
+            "get_course_str": lambda i: academy.get_course_str(course_ids[i]),
+            "get_teacher_str": lambda i: academy.get_teacher_str(teacher_ids[i]),
+            "get_teacher_courses_str": lambda i: academy.get_teacher_courses_str(teacher_ids[i]),
+            "get_program_str": lambda i: academy.get_program_str(course_ids[i]),
+        }
+        results = {}
+        for mode in ("live", "snapshot"):
+            if mode == "snapshot":
+                start = time.perf_counter()
+                academy.load_snapshot()
+                print(f"snapshot of {size} courses loaded in {time.perf_counter() - start:.3f} s")
+            for name, read in reads.items():
+                start = time.perf_counter()
+                for i in range(lookups):
+                    read(i)
+                results.setdefault(name, []).append(time.perf_counter() - start)
+        print(f"{'read':<25} {'live s':>8} {'snapshot s':>11} {'speedup':>8}")
+        for name, (live, snapshot) in results.items():
+            print(f"{name:<25} {live:>8.3f} {snapshot:>11.3f} {live / snapshot:>8.1f}")
+        academy.close()
+
+
+def bench_tracing(size: int, lookups: int) -> None:
+    """Measures the cost of query hooks on repeated lookups and prints collected statistics"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        rnd = random.Random(0)
+        course_ids = [rnd.randint(1, size) for _ in range(lookups)]
+        timings = {}
+        for mode in ("disabled", "stats", "stats + slow log"):
+            if mode == "stats":
+                stats = academy.trace()
+            elif mode == "stats + slow log":
+                academy.remove_query_hook(stats)
+                stats = academy.trace(slow_threshold=1.0)
+            start = time.perf_counter()
+            for id_course in course_ids:
+                academy.get_course_str(id_course)
+            timings[mode] = time.perf_counter() - start
+        for mode, elapsed in timings.items():
+            print(f"{mode:<20} {elapsed:.3f} s ({(elapsed / timings['disabled'] - 1) * 100:+.1f}%)")
+        print(stats.report_str())
+        academy.close()
+
+
+def bench_profiles(size: int, inserts: int, lookups: int) -> None:
+    """Compares PRAGMA profiles on a database file and in memory
+
+    Measures bulk import, inserts committed one by one, lookups by ID and listing of all courses"""
+    print(f"{'storage':<8} {'profile':<15} {'import s':>9} {'inserts/s':>10} {'lookups/s':>10} {'listing s':>10}")
+    for storage in ("file", "memory"):
+        for profile in PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                academy = Academy(make_db(directory) if storage == "file" else ":memory:", profile=profile)
+                start = time.perf_counter()
+                academy.import_courses(generate_courses(size))
+                import_time = time.perf_counter() - start
+                start = time.perf_counter()
+                for course in generate_courses(inserts, seed_value=1):
+                    if hasattr(course, 'room'):
+                        academy.insert_local(course)
+                    else:
+                        academy.insert_offsite(course)
+                insert_rate = inserts / (time.perf_counter() - start)
+                rnd = random.Random(0)
+                start = time.perf_counter()
+                for _ in range(lookups):
+                    academy.get_course_str(rnd.randint(1, size))
+                lookup_rate = lookups / (time.perf_counter() - start)
+                start = time.perf_counter()
+                academy.get_all_courses_str()
+                listing_time = time.perf_counter() - start
+                academy.close()
+            print(f"{storage:<8} {profile:<15} {import_time:>9.3f} {insert_rate:>10.0f} {lookup_rate:>10.0f} "
+                  f"{listing_time:>10.3f}")
+
+
+def use_profile_block(academy: Academy) -> None:
+    """Enters and leaves the with block of Academy.use_profile"""
+    with academy.use_profile('read-mostly'):
+        pass
+
+
+HOOKED_QUERIES = Counter()  # statement name -> number of statements seen by count_query
+
+
+def count_query(name: str, *_) -> None:
+    """Query hook of the suite that counts statements instead of writing them out in the middle of the timings"""
+    HOOKED_QUERIES[name] += 1
+
+
+def transaction_block(academy: Academy, room: int) -> None:
+    """Adds the room and a teacher in one with block of Academy.transaction"""
+    with academy.transaction():
+        academy.add_room(room)
+        academy.add_teacher(TeacherFactory.create_teacher(f"Newteacher{letters(room)}", "Olena", "Petrivna",
+                                                          "1980-01-21"))
+
+
+def random_session(rnd: random.Random, data: dict) -> tuple:
+    """Returns random course ID, start and end of a 90-minute session within a thousand years
+
+    Sessions of the suite are spread so widely that they almost never conflict"""
+    start = datetime(2000, 1, 1) + timedelta(minutes=15 * rnd.randrange(35_000_000))
+    return rnd.randint(1, data['courses']), start, start + timedelta(minutes=90)
+
+
+def time_calls(call, repeats: int, budget: float) -> dict:
+    """Calls call repeats times or until budget seconds are spent, at least once
+
+    Returns number of calls and mean, median and minimum duration of a call in seconds"""
+    durations = []
+    spent = 0.0
+    while len(durations) < repeats and (spent < budget or not durations):
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+        spent += durations[-1]
+    return {'calls': len(durations), 'mean': statistics.fmean(durations), 'median': statistics.median(durations),
+            'min': min(durations)}
+
+
+def run_menu(location: str, script: str) -> float:
+    """Runs main.py on the database with the script as its input and returns the duration in seconds"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN, location], input=script + "0\n", text=True, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def menu_worker(location: str) -> None:
+    """Runs the menu of main.py in this process on the database with the scripts of actions read from stdin
+
+    Input is a JSON list of [action, script] pairs. An action is timed from the input of its option number
+    to the prompt of the next option, so start of the interpreter and the database is left out.
+    Prints durations in seconds of every action as JSON"""
+    lines = []  # (index of the action whose option number the line is or None, line)
+    actions = json.load(sys.stdin)
+    for index, (_, script) in enumerate(actions):
+        lines.extend((index if number == 0 else None, line) for number, line in enumerate(script.split('\n')[:-1]))
+    lines.append((None, "0"))
+    durations = [[] for _ in actions]
+    current = [None, 0.0]  # action being run and its start
+
+    def scripted_input(prompt: str = "") -> str:
+        if prompt.startswith("Enter number of the option") and current[0] is not None:
+            durations[current[0]].append(time.perf_counter() - current[1])
+            current[0] = None
+        index, line = lines.pop(0) if lines else (None, "0")
+        if index is not None:
+            current[:] = [index, time.perf_counter()]
+        return line
+
+    builtins.input = scripted_input
+    sys.argv = [MAIN, location]
+    output = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            runpy.run_path(MAIN, run_name='__main__')
+        except SystemExit:  # option 0 exits the menu
+            pass
+        finally:
+            sys.stdout = output
+    result = {}
+    for (action, _), seconds in zip(actions, durations):
+        result.setdefault(action, []).extend(seconds)
+    print(json.dumps(result))
+
+
+def suite_size(directory: str, courses: int, repeats: int, budget: float, menu_repeats: int, seed_value: int) -> dict:
+    """Times every public method of Academy and every menu action of main.py on generated data of the size"""
+    data = {'courses': courses, 'teachers': max(1, courses // 5), 'rooms': 50,
+            'words': ["python", "loops", "data*", "ivanenko", "franka street", "web testing"],
+            'teacher': TeacherFactory.create_teacher("Ivanenko", "Olena", "Petrivna", "1980-01-21")}
+    generator = Generator(data['teachers'], courses, data['rooms'], seed=seed_value)
+    data['topics'] = generator.topics()
+    data['directory'] = directory
+    location = make_db(directory, f"suite{courses}.db")
+    academy = Academy(location)
+    start = time.perf_counter()
+    generator.fill(academy)
+    result = {'fill': time.perf_counter() - start, 'methods': {}, 'menu': {}}
+    data['stats'] = academy.stats()  # format_stats is timed apart from the reads of stats
+    public = {name for name, member in inspect.getmembers(Academy)
+              if not name.startswith('_') and callable(member) and not isinstance(member, property)}
+    result['untimed'] = sorted(public - set(SUITE_CALLS) - SUITE_UNTIMED)  # methods added without a suite call
+    rnd = random.Random(seed_value)
+    menu_location = os.path.join(directory, f"menu{courses}.db")
+    academy.close()
+    shutil.copy(location, menu_location)  # writes of the methods must not change the data the menu runs on
+    academy = Academy(location)
+    for name, call in SUITE_CALLS.items():
+        result['methods'][name] = time_calls(lambda: call(academy, rnd, data), 1 if name in SUITE_ONCE else repeats,
+                                             budget)
+    academy.close()
+    baseline = min(run_menu(menu_location, "") for _ in range(3))  # start and exit of main.py
+    actions = []
+    for action, script in MENU_ACTIONS.items():
+        for _ in range(1 if action.startswith('16.') else menu_repeats):
+            _, start, end = random_session(rnd, data)
+            actions.append((action, script.format(
+                course=rnd.randint(1, courses), teacher=rnd.randint(1, data['teachers']),
+                room=data['rooms'] + rnd.randrange(1, 2 ** 31), letters=letters(rnd.randrange(2 ** 40)),
+                session=Academy.session_time(start), session_end=Academy.session_time(end))))
+    output = subprocess.run([sys.executable, __file__, "menu-worker", menu_location], input=json.dumps(actions),
+                            capture_output=True, text=True, check=True).stdout  # all actions in one process
+    for action, durations in json.loads(output).items():
+        result['menu'][action] = {'calls': len(durations), 'mean': statistics.fmean(durations),
+                                  'median': statistics.median(durations)}
+    result['menu_startup'] = baseline
+    return result
+
+
+def bench_suite(sizes: list, repeats: int, budget: float, menu_repeats: int, seed_value: int, output: str) -> None:
+    """Times every public method of Academy and menu action of main.py at the sizes and writes results as JSON"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(MAIN)).stdout.strip() or None
+    except OSError:
+        commit = None
+    results = {'meta': {'commit': commit, 'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                        'platform': platform.platform(), 'seed': seed_value, 'repeats': repeats},
+               'sizes': {}}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            result = suite_size(directory, size, repeats, budget, menu_repeats, seed_value)
+            results['sizes'][str(size)] = result
+        print(f"{size} courses: filled in {result['fill']:.3f} s, main.py starts in {result['menu_startup']:.3f} s")
+        for group in ('methods', 'menu'):
+            for name, stats in result[group].items():
+                print(f"  {name:<32} {stats['calls']:>6} calls {stats['mean'] * 1000:>12.3f} ms")
+        if result['untimed']:
+            print(f"  not timed: {', '.join(result['untimed'])}")
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=1)
+    print(f"Results are written to {output}")
+
+
+def compare_results(old: str, new: str, threshold: float) -> bool:
+    """Prints mean durations of two suite results side by side and returns whether none got slower by threshold"""
+    with open(old, encoding='utf-8') as file:
+        before = json.load(file)
+    with open(new, encoding='utf-8') as file:
+        after = json.load(file)
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']}")
+    regressions = 0
+    for size, result in after['sizes'].items():
+        if size not in before['sizes']:
+            continue
+        for group in ('methods', 'menu'):
+            for name, stats in result[group].items():
+                previous = before['sizes'][size][group].get(name)
+                if previous is None or not previous['mean']:
+                    continue
+                ratio = stats['mean'] / previous['mean']
+                mark = ""
+                if ratio > 1 + threshold:
+                    mark = "  REGRESSION"
+                    regressions += 1
+                print(f"{size:>8} {name:<32} {previous['mean'] * 1000:>10.3f} ms {stats['mean'] * 1000:>10.3f} ms "
+                      f"{ratio:>6.2f}x{mark}")
+    print(f"{regressions} regressions above {threshold:.0%}")
+    return not regressions
+
+
+def bench_delete(size: int, deletes: int) -> None:
+    """Compares deleting courses in one set-based batch with deleting them one by one"""
+    print(f"{'mode':>10} {'courses':>8} {'seconds':>8} {'courses/s':>10}")
+    for mode in ("batch", "one by one"):
+        with tempfile.TemporaryDirectory() as directory:
+            academy = Academy(make_db(directory))
+            Generator(max(1, size // 5), size).fill(academy)
+            ids = random.Random(0).sample(range(1, size + 1), deletes)
+            start = time.perf_counter()
+            if mode == "batch":
+                academy.delete_courses(ids)
+            else:
+                for id_course in ids:
+                    academy.delete_course(id_course)
+            elapsed = time.perf_counter() - start
+            academy.close()
+        print(f"{mode:>10} {deletes:>8} {elapsed:>8.3f} {deletes / elapsed:>10.0f}")
+
+
+def bench_stats(size: int, reads: int) -> None:
+    """Compares statistics read from the summary tables with aggregation over the catalogue tables"""
+    aggregates = [
+        "SELECT 'local' AS kind, COUNT(*) AS courses FROM LocalCourses "
+        "UNION ALL SELECT 'offsite', COUNT(*) FROM OffsiteCourses",
+        "SELECT Teachers.*, COUNT(*) AS courses FROM CoursesTeachers JOIN Teachers USING(id_teacher) "
+        "GROUP BY id_teacher ORDER BY courses DESC LIMIT 10",
+        "SELECT id_topic, COUNT(*) AS courses FROM Program GROUP BY id_topic ORDER BY courses DESC LIMIT 10",
+        "SELECT Rooms.room, COUNT(LocalCourses.id_course) AS courses FROM Rooms "
+        "LEFT JOIN LocalCourses USING(room) GROUP BY Rooms.room ORDER BY Rooms.room",
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        academy = Academy(make_db(directory))
+        start = time.perf_counter()
+        Generator(max(1, size // 5), size).fill(academy)
+        print(f"filled {size} courses in {time.perf_counter() - start:.3f} s")
+        start = time.perf_counter()
+        for _ in range(reads):
+            academy.stats()
+        summary = (time.perf_counter() - start) / reads
+        start = time.perf_counter()
+        for _ in range(reads):
+            for query in aggregates:
+                academy.fetchall(query)
+        aggregation = (time.perf_counter() - start) / reads
+        start = time.perf_counter()
+        differences = academy.check_stats()
+        check = time.perf_counter() - start
+        academy.close()
+    print(f"summary tables {summary * 1000:.3f} ms, aggregation {aggregation * 1000:.3f} ms per read, "
+          f"consistency check {check:.3f} s ({len(differences)} tables differ)")
+
+
+def bench_changes(size: int, updates: int) -> None:
+    """Compares incremental sync through the change log with a full re-read after a batch of updates"""
+    with tempfile.TemporaryDirectory() as directory:
+        academy = Academy(make_db(directory))
+        generator = Generator(max(1, size // 5), size)
+        start = time.perf_counter()
+        generator.fill(academy)
+        print(f"filled {size} courses in {time.perf_counter() - start:.3f} s, {academy.change_cursor()} changes logged")
+        cursor = academy.change_cursor()
+        rnd = random.Random(0)
+        academy.update_courses({id_course: CourseFactory.create_local(f"Updated {id_course}", 1, "loops")
+                                for id_course in rnd.sample(range(1, size + 1), updates)})
+        start = time.perf_counter()
+        changes = sum(1 for _ in academy.changes_since(cursor))
+        incremental = time.perf_counter() - start
+        start = time.perf_counter()
+        academy.get_all_courses()
+        academy.get_all_teachers()
+        academy.fetchall('all_courses_teachers')
+        academy.fetchall('all_program')
+        full = time.perf_counter() - start
+        academy.close()
+    print(f"{updates} updated courses: {changes} changes read in {incremental:.3f} s, full re-read {full:.3f} s")
+
+
+def batch_commands(commands: int, courses: int, write_share: float, seed_value: int = 0) -> tuple[str, str]:
+    """Returns the same workload as JSON lines for main.py --batch and as input of the menu of main.py
+
+    Workload inserts local courses with write_share probability and looks up courses otherwise"""
+    rnd = random.Random(seed_value)
+    lines, script = [], ""
+    for number in range(commands):
+        if rnd.random() < write_share:
+            lines.append(json.dumps({'id': number, 'command': 'insert_course', 'args': [
+                {'type': 'local', 'name': f"Python {number}", 'room': 1, 'program': ["loops", "classes"],
+                 'teachers': [{'surname': "Ivanenko", 'name': "Olena", 'patronymic': "Petrivna",
+                               'birth_date': "1980-01-21"}]}]}))
+            script += MENU_ACTIONS['1. insert local course'].format(room=number)
+        else:
+            id_course = rnd.randint(1, courses)
+            lines.append(json.dumps({'id': number, 'command': 'get_course_str', 'args': [id_course]}))
+            script += MENU_ACTIONS['6. find course by ID'].format(course=id_course)
+    return '\n'.join(lines) + '\n', script
+
+
+def bench_batch(size: int, commands: int, write_share: float, group_sizes: list, menu_limit: int) -> None:
+    """Compares commands per second of main.py --batch at group sizes with the menu driven by the same input"""
+    lines, script = batch_commands(commands, size, write_share)
+    print(f"{'mode':>16} {'commands':>9} {'seconds':>8} {'commands/s':>11} {'errors':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory, "template.db")
+        academy = Academy(location)
+        Generator(max(1, size // 5), size, rooms=50).fill(academy)
+        academy.close()
+        for group_size in group_sizes:
+            copy = shutil.copy(location, os.path.join(directory, f"batch{group_size}.db"))
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, MAIN, copy, "--batch", "-", "--output", os.devnull,
+                                     "--group-size", str(group_size)], input=lines, text=True, check=True,
+                                    capture_output=True)
+            elapsed = time.perf_counter() - start
+            summary = json.loads(result.stderr.splitlines()[-1])
+            print(f"{f'batch of {group_size}':>16} {summary['commands']:>9} {elapsed:>8.3f} "
+                  f"{summary['commands'] / elapsed:>11.0f} {summary['errors']:>7}")
+        if commands <= menu_limit:
+            copy = shutil.copy(location, os.path.join(directory, "menu.db"))
+            elapsed = run_menu(copy, script)
+            print(f"{'menu':>16} {commands:>9} {elapsed:>8.3f} {commands / elapsed:>11.0f} {'-':>7}")
+
+
+def ids_worker(location: str, inserts: int, id_block: int) -> None:
+    """Inserts local courses one by one and prints the IDs they got, errors and duration as JSON"""
+    academy = Academy(location, id_block=id_block)
+    ids, errors = [], {}
+    start = time.perf_counter()
+    for number in range(inserts):
+        try:
+            academy.insert_local(CourseFactory.create_local(f"Course {os.getpid()} {number}", 1, "loops"))
+            ids.append(academy.id_course)
+        except Exception as err:
+            errors[type(err).__name__] = errors.get(type(err).__name__, 0) + 1
+    print(json.dumps({'ids': ids, 'errors': errors, 'seconds': time.perf_counter() - start}))
+    academy.close()
+
+
+def bench_ids(processes: int, inserts: int, id_blocks: list) -> None:
+    """Inserts courses from several processes into one database and checks that no ID was handed out twice"""
+    print(f"{'ID block':>9} {'processes':>9} {'inserted':>9} {'duplicates':>10} {'errors':>7} {'seconds':>8} "
+          f"{'inserts/s':>10}")
+    for id_block in id_blocks:
+        with tempfile.TemporaryDirectory() as directory:
+            location = make_db(directory)
+            academy = Academy(location, profile='durable')  # WAL lets readers of the workers go on during commits
+            academy.add_room(1)
+            academy.close()
+            start = time.perf_counter()
+            workers = [subprocess.Popen([sys.executable, __file__, "ids-worker", location, str(inserts), str(id_block)],
+                                        stdout=subprocess.PIPE, text=True) for _ in range(processes)]
+            results = [json.loads(worker.communicate()[0]) for worker in workers]
+            elapsed = time.perf_counter() - start
+            ids = [id_course for result in results for id_course in result['ids']]
+            errors = sum(sum(result['errors'].values()) for result in results)
+            academy = Academy(location)
+            rows = academy.fetchone("SELECT COUNT(*) AS count FROM LocalCourses")['count']
+            academy.close()
+            if rows != len(ids):
+                print(f"{rows} courses in the database, {len(ids)} reported by the workers")
+        print(f"{id_block:>9} {processes:>9} {len(ids):>9} {len(ids) - len(set(ids)):>10} {errors:>7} {elapsed:>8.3f} "
+              f"{len(ids) / elapsed:>10.0f}")
+
+
+def build_objects(kind: str, count: int) -> list:
+    """Returns count teachers or local courses with 3 topics built by the validating factories or from rows"""
+    teachers = [{'surname': f"Ivanenko{letters(i)}".capitalize(), 'name': "Olena", 'patronymic': "Petrivna",
+                 'birth_date': f"1980-01-{i % 9 + 1:02}"} for i in range(1000)]  # rows are shared by the objects
+    courses = [{'name': f"Course {i}", 'room': i % 50 + 1} for i in range(1000)]
+    program = ("loops", "classes", "json")
+    if kind == "teachers":
+        return [TeacherFactory.create_teacher(row['surname'], row['name'], row['patronymic'], row['birth_date'])
+                for row in islice(cycle(teachers), count)]
+    if kind == "teachers from rows":
+        return [Teacher.from_row(row) for row in islice(cycle(teachers), count)]
+    if kind == "courses":
+        return [CourseFactory.create_local(row['name'], row['room'], *program) for row in islice(cycle(courses), count)]
+    return [LocalCourse.from_row(row, program) for row in islice(cycle(courses), count)]
+
+
+def bench_model(count: int) -> None:
+    """Measures construction rate and memory of teachers and courses built with validation and from rows"""
+    print(f"{'objects':>20} {'count':>9} {'seconds':>8} {'objects/s':>10} {'bytes/object':>13}")
+    for kind in ("teachers", "teachers from rows", "courses", "courses from rows"):
+        start = time.perf_counter()
+        objects = build_objects(kind, count)
+        elapsed = time.perf_counter() - start
+        del objects
+        tracemalloc.start()  # memory is measured on a second build: tracing slows construction down
+        objects = build_objects(kind, count)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del objects
+        print(f"{kind:>20} {count:>9} {elapsed:>8.3f} {count / elapsed:>10.0f} {size / count:>13.0f}")
+
+
+def bench_validate(rows: int, invalid_share: float) -> None:
+    """Compares creating teachers and local courses one by one catching errors with create_many on columns"""
+    rnd = random.Random(0)
+    teachers = [[f"Ivanenko{letters(i)}".capitalize(), "Olena", "Petrivna", f"1980-01-{i % 9 + 1:02}"]
+                for i in range(rows)]
+    courses = [[f"Course {i}", i % 50 + 1, ["loops", "classes", "json"]] for i in range(rows)]
+    for i in rnd.sample(range(rows), int(rows * invalid_share)):
+        teachers[i][rnd.randrange(4)] = "invalid value"
+        courses[i][1] = 0
+    print(f"{'records':>9} {'mode':>12} {'rows':>8} {'errors':>7} {'seconds':>8} {'rows/s':>10}")
+    gc.disable()  # the objects hold no reference cycles, collections would only walk the growing heap in both modes
+    for records, one, many in (
+            ("teachers", lambda row: TeacherFactory.create_teacher(*row),
+             lambda columns: TeacherFactory.create_many(*columns)),
+            ("courses", lambda row: CourseFactory.create_local(row[0], row[1], *row[2]),
+             lambda columns: CourseFactory.create_many_local(*columns))):
+        table = teachers if records == "teachers" else courses
+        start = time.perf_counter()
+        errors = 0
+        created = []  # objects are kept as create_many keeps them
+        for row in table:
+            try:
+                created.append(one(row))
+            except (TypeError, ValueError):
+                created.append(None)
+                errors += 1
+        elapsed = time.perf_counter() - start
+        print(f"{records:>9} {'one by one':>12} {rows:>8} {errors:>7} {elapsed:>8.3f} {rows / elapsed:>10.0f}")
+        columns = [list(column) for column in zip(*table)]
+        start = time.perf_counter()
+        _, report = many(columns)
+        elapsed = time.perf_counter() - start
+        print(f"{records:>9} {'create_many':>12} {rows:>8} {len(report):>7} {elapsed:>8.3f} {rows / elapsed:>10.0f}")
+    gc.enable()
+
+
+def bench_timetable(size: int, sessions: int, rooms: int, lookups: int) -> None:
+    """Schedules sessions of random courses over a year and compares conflict and free slot lookups
+    through the timetable indexes with a scan of all sessions"""
+    rnd = random.Random(0)
+    year = datetime(2026, 9, 1)
+    duration = timedelta(minutes=90)
+    with tempfile.TemporaryDirectory() as directory:
+        academy = Academy(make_db(directory))
+        Generator(max(1, size // 5), size, rooms=rooms, local_share=0.8).fill(academy)
+        requested = [(rnd.randint(1, size), start, start + duration) for start in
+                     (year + timedelta(minutes=15 * rnd.randrange(35_040)) for _ in range(sessions))]
+        start = time.perf_counter()
+        scheduled = 0
+        for batch in range(0, sessions, 1000):
+            scheduled += sum(id_session is not None for id_session in
+                             academy.schedule_sessions(requested[batch:batch + 1000], skip_conflicts=True))
+        elapsed = time.perf_counter() - start
+        print(f"scheduled {scheduled} of {sessions} sessions in {elapsed:.3f} s ({sessions / elapsed:.0f} sessions/s), "
+              f"{sessions - scheduled} refused as conflicts")
+        probes = [(rnd.randint(1, size), start, start + duration) for start in
+                  (year + timedelta(minutes=15 * rnd.randrange(35_040)) for _ in range(lookups))]
+
+        def scan_conflicts(id_course: int, start, end) -> list:
+            start, end = Academy.session_time(start), Academy.session_time(end)
+            return academy.fetchall(
+                "SELECT * FROM Sessions NOT INDEXED WHERE room IN "
+                "(SELECT room FROM LocalCourses WHERE id_course == ?1) "
+                "AND start_time < ?3 AND end_time > ?2 UNION SELECT Sessions.* FROM SessionTeachers NOT INDEXED "
+                "JOIN Sessions USING(id_session) WHERE id_teacher IN (SELECT id_teacher FROM CoursesTeachers "
+                "WHERE id_course == ?1) AND SessionTeachers.start_time < ?3 AND SessionTeachers.end_time > ?2 "
+                "ORDER BY start_time",
+                (id_course, start, end))
+
+        def scan_free_slot(id_course: int, after, length: timedelta):
+            busy = scan_conflicts(id_course, after, datetime(9999, 1, 1))
+            slot = after
+            for session in busy:  # sessions overlapping the slot push it to their end
+                if datetime.fromisoformat(session['start_time']) < slot + length:
+                    slot = max(slot, datetime.fromisoformat(session['end_time']))
+            return Academy.session_time(slot)
+
+        for name, indexed, scan in (
+                ("find_conflicts", lambda probe: academy.find_conflicts(*probe), lambda probe: scan_conflicts(*probe)),
+                ("find_free_slot", lambda probe: academy.find_free_slot(probe[0], probe[1], duration),
+                 lambda probe: scan_free_slot(probe[0], probe[1], duration))):
+            results = []
+            for label, call in (("indexes", indexed), ("scan", scan)):
+                start = time.perf_counter()
+                results.append([call(probe) for probe in probes])
+                elapsed = time.perf_counter() - start
+                print(f"{name:>15} {label:>8} {elapsed / lookups * 1e6:>10.1f} us per lookup")
+            if name == "find_conflicts":  # rows of the scan lack the course name, sessions starting together may swap
+                results = [[sorted(session['id_session'] for session in found) for found in result]
+                           for result in results]
+            print(f"{name:>15} results {'match' if results[0] == results[1] else 'DIFFER'}")
+        academy.close()
+
+
+def bench_shards(size: int, shards: int, reads: int) -> None:
+    """Compares import and fan-out reads of ShardedAcademy with worker processes and in this process
+    against a single Academy on the same generated data"""
+    generator = Generator(max(1, size // 5), size)
+    reads_by_name = {
+        "get_all_local_str": lambda academy, rnd: academy.get_all_local_str(),
+        "search_str": lambda academy, rnd: academy.search_str(rnd.choice(("python", "data*", "loops", "web"))),
+        "stats": lambda academy, rnd: academy.stats(),
+        "get_local_page by name": lambda academy, rnd: academy.get_local_page(20, None, 'name'),
+        "get_teacher_courses": lambda academy, rnd: academy.get_teacher_courses(rnd.randint(1, size // 5 or 1)),
+        "get_course_str": lambda academy, rnd: academy.get_course_str(rnd.choice(ids)),
+    }
+    print(f"{'academy':>24} {'import s':>9} {'courses/s':>10}  " + "  ".join(f"{name:>22}" for name in reads_by_name))
+    with tempfile.TemporaryDirectory() as directory:
+        for label, create in (("single", lambda: Academy(make_db(directory, "single.db"))),
+                              (f"{shards} shards, in process",
+                               lambda: ShardedAcademy(os.path.join(directory, "local"), shards, 0)),
+                              (f"{shards} shards, {shards} workers",
+                               lambda: ShardedAcademy(os.path.join(directory, "pool"), shards))):
+            academy = create()
+            for room in generator.rooms():
+                academy.add_room(room)
+            for teacher in generator.teachers():
+                academy.add_teacher(teacher)
+            start = time.perf_counter()
+            academy.import_courses(generator.courses())
+            elapsed = time.perf_counter() - start
+            ids = [row['id_course'] for row in academy.get_courses_page(size)]
+            rnd = random.Random(0)
+            latencies = []
+            for read in reads_by_name.values():
+                read(academy, rnd)  # workers open their connections on the first call
+                start = time.perf_counter()
+                for _ in range(reads):
+                    read(academy, rnd)
+                latencies.append((time.perf_counter() - start) / reads)
+            academy.close()
+            print(f"{label:>24} {elapsed:>9.3f} {size / elapsed:>10.0f}  "
+                  + "  ".join(f"{latency * 1000:>19.3f} ms" for latency in latencies))
+    print(f"{os.cpu_count()} CPUs: worker processes import and read shards in parallel only on several CPUs")
+
+
+def stream_worker(location: str, mode: str) -> None:
+    """Lists all courses as one string, as a stream or exports them next to the database
+
+    Prints time to first record, total time and peak RSS"""
+    academy = Academy(location)
+    start = time.perf_counter()
+    first = None
+    if mode in ("jsonl", "columnar"):
+        path = f"{location}.{mode}"
+        if mode == "jsonl":
+            export_jsonl(academy, path)
+        else:
+            export_columnar(academy, path)
+        length = os.path.getsize(path)
+    elif mode == "string":
+        length = len(academy.get_all_courses_str())
+        first = time.perf_counter() - start
+    else:
+        length = 0
+        for record in academy.iter_courses_str():
+            if first is None:
+                first = time.perf_counter() - start
+            length += len(record)
+    total = time.perf_counter() - start
+    academy.close()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024  # kilobytes on Linux
+    print(json.dumps({'mode': mode, 'first': first, 'total': total, 'peak_mb': peak, 'length': length}))
+
+
+def bench_stream(size: int) -> None:
+    """Compares peak RSS and time to first record of the course listing as one string and as a stream"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        academy.open()  # apply migrations before measuring
+        academy.close()
+        print(f"{'mode':>8} {'first record s':>15} {'total s':>8} {'peak RSS MB':>12}")
+        for mode in ("string", "stream"):
+            output = subprocess.run([sys.executable, __file__, "stream-worker", location, mode],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output)
+            print(f"{mode:>8} {result['first']:>15.3f} {result['total']:>8.3f} {result['peak_mb']:>12}")
+
+
+def bench_export(size: int, steps: list, sleep: float) -> None:
+    """Measures online backup with different step sizes next to a writer, and JSONL and columnar export"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        academy.open()  # apply migrations before measuring
+        academy.close()
+        print(f"{'pages/step':>10} {'backup s':>9} {'steps':>6} {'pages':>7} {'inserts':>8} {'max insert ms':>14}")
+        for pages_per_step in steps:
+            academy = Academy(location, pool_size=2)
+            academy.insert_local(CourseFactory.create_local("Warm-up", 1, "topic0"))  # find the next free course ID
+            latencies = []
+            done = threading.Event()
+
+            def writer() -> None:
+                for course in generate_courses(size, seed_value=pages_per_step):
+                    if done.is_set():
+                        return
+                    start = time.perf_counter()
+                    if hasattr(course, 'room'):
+                        academy.insert_local(course)
+                    else:
+                        academy.insert_offsite(course)
+                    latencies.append(time.perf_counter() - start)
+                    time.sleep(0.001)
+
+            thread = threading.Thread(target=writer)
+            progress = []
+            thread.start()
+            start = time.perf_counter()
+            pages = academy.backup(os.path.join(directory, f"backup{pages_per_step}.db"), pages_per_step,
+                                   lambda status, remaining, total: progress.append(remaining), sleep)
+            elapsed = time.perf_counter() - start
+            done.set()
+            thread.join()
+            academy.close()
+            print(f"{pages_per_step:>10} {elapsed:>9.3f} {len(progress):>6} {pages:>7} {len(latencies):>8} "
+                  f"{max(latencies, default=0) * 1000:>14.3f}")
+        print(f"{'export':>8} {'total s':>8} {'size MB':>8} {'peak RSS MB':>12}")
+        for mode in ("jsonl", "columnar"):
+            output = subprocess.run([sys.executable, __file__, "stream-worker", location, mode],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output)
+            print(f"{mode:>8} {result['total']:>8.3f} {result['length'] / 2 ** 20:>8.1f} {result['peak_mb']:>12}")
+
+
+def import_times(module: str) -> dict:
+    """Returns cumulative import time in seconds of the module and of every module it imports by name
+
+    Times are read from -X importtime of a fresh interpreter that imports the module, modules imported
+    by the interpreter itself before site are left out"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True,
+                            text=True, check=True, cwd=os.path.dirname(MAIN)).stderr
+    times = {}
+    for line in output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():  # the header line holds column names
+                times[name.strip()] = int(cumulative) / 1e6
+            if name.strip() == "site":  # everything so far was imported at the start of the interpreter
+                times = {}
+    return times
+
+
+def bench_startup(size: int, runs: int, top: int) -> None:
+    """Measures cold start: import time of academy and main, wall clock to the first query of a fresh process
+    and start and exit of the menu, and reopening of the database in the same process"""
+    with tempfile.TemporaryDirectory() as directory:
+        location = make_db(directory)
+        seed(location, size)
+        academy = Academy(location)
+        academy.open()  # apply migrations before measuring
+        academy.close()
+        for module in ("academy", "main"):
+            times = min((import_times(module) for _ in range(runs)), key=lambda result: result[module])
+            heaviest = sorted((name for name in times if name != module), key=times.get, reverse=True)[:top]
+            print(f"import {module}: {times[module] * 1000:.1f} ms, heaviest: "
+                  + ", ".join(f"{name} {times[name] * 1000:.1f}" for name in heaviest))
+        steps = {'interpreter': [], 'import': [], 'construct': [], 'first_query': [], 'process to first query': [],
+                 'menu start and exit': []}
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+            steps['interpreter'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, location], capture_output=True, text=True,
+                                    check=True, cwd=os.path.dirname(MAIN)).stdout
+            steps['process to first query'].append(time.perf_counter() - start)
+            for step, seconds in json.loads(output).items():
+                steps[step].append(seconds)
+            steps['menu start and exit'].append(run_menu(location, ""))
+        print(f"{'step':>24} {'min ms':>8} {'median ms':>10}")
+        for step, durations in steps.items():
+            print(f"{step:>24} {min(durations) * 1000:>8.2f} {statistics.median(durations) * 1000:>10.2f}")
+        durations = []
+        for _ in range(runs):  # modules are imported, so only opening and the first query are left
+            start = time.perf_counter()
+            academy = Academy(location)
+            academy.get_course(1)
+            durations.append(time.perf_counter() - start)
+            academy.close()
+        print(f"{'reopen to first query':>24} {min(durations) * 1000:>8.2f} "
+              f"{statistics.median(durations) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks of the Software Academy")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="course listing: report engine against query per course")
+    report_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    report_parser.add_argument("--legacy-limit", type=int, default=10_000,
+                               help="largest size to run the query per course listing at")
+    lookups_parser = commands.add_parser("lookups", help="repeated lookups of menu options 6-11")
+    lookups_parser.add_argument("--size", type=int, default=10_000)
+    lookups_parser.add_argument("--lookups", type=int, default=1_000)
+    import_parser = commands.add_parser("import", help="bulk import against insert per course")
+    import_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    import_parser.add_argument("--batch-size", type=int, default=1_000)
+    import_parser.add_argument("--legacy-limit", type=int, default=1_000,
+                               help="largest size to run insert per course at")
+    concurrency_parser = commands.add_parser("concurrency", help="threads reading through the connection pool")
+    concurrency_parser.add_argument("--size", type=int, default=10_000)
+    concurrency_parser.add_argument("--threads", type=int, default=8)
+    concurrency_parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    concurrency_parser.add_argument("--requests", type=int, default=20_000)
+    async_parser = commands.add_parser("async", help="latency of concurrent coroutines through AsyncAcademy")
+    async_parser.add_argument("--size", type=int, default=10_000)
+    async_parser.add_argument("--coroutines", type=int, default=5_000)
+    async_parser.add_argument("--distinct", type=int, default=500, help="number of distinct courses requested")
+    async_parser.add_argument("--pool-size", type=int, default=4)
+    cache_parser = commands.add_parser("cache", help="lookups through caches of different sizes")
+    cache_parser.add_argument("--size", type=int, default=10_000)
+    cache_parser.add_argument("--lookups", type=int, default=20_000)
+    cache_parser.add_argument("--cache-sizes", type=int, nargs="+", default=[0, 100, 1_000, 10_000])
+    cache_parser.add_argument("--ttl", type=float, default=None)
+    pages_parser = commands.add_parser("pages", help="keyset pages against OFFSET pages")
+    pages_parser.add_argument("--size", type=int, default=1_000_000)
+    pages_parser.add_argument("--limit", type=int, default=20)
+    pages_parser.add_argument("--repeats", type=int, default=20)
+    search_parser = commands.add_parser("search", help="full-text search against LIKE scan")
+    search_parser.add_argument("--size", type=int, default=100_000)
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--repeats", type=int, default=10)
+    snapshot_parser = commands.add_parser("snapshot", help="reads from the in-memory snapshot against SQL")
+    snapshot_parser.add_argument("--size", type=int, default=100_000)
+    snapshot_parser.add_argument("--lookups", type=int, default=10_000)
+    tracing_parser = commands.add_parser("tracing", help="overhead of query hooks")
+    tracing_parser.add_argument("--size", type=int, default=10_000)
+    tracing_parser.add_argument("--lookups", type=int, default=20_000)
+    profiles_parser = commands.add_parser("profiles", help="PRAGMA profiles on a database file and in memory")
+    profiles_parser.add_argument("--size", type=int, default=50_000)
+    profiles_parser.add_argument("--inserts", type=int, default=500)
+    profiles_parser.add_argument("--lookups", type=int, default=5_000)
+    suite_parser = commands.add_parser("suite", help="every public method and menu action on generated data, JSON")
+    suite_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    suite_parser.add_argument("--repeats", type=int, default=50, help="calls of a method at most")
+    suite_parser.add_argument("--budget", type=float, default=1.0, help="seconds spent on a method at most")
+    suite_parser.add_argument("--menu-repeats", type=int, default=5, help="uses of a menu option in one run")
+    suite_parser.add_argument("--seed", type=int, default=0)
+    suite_parser.add_argument("--output", default="benchmark_results.json")
+    compare_parser = commands.add_parser("compare", help="compare two suite results, fails on regressions")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="slowdown counted as a regression")
+    stream_parser = commands.add_parser("stream", help="course listing as one string against a stream")
+    stream_parser.add_argument("--size", type=int, default=1_000_000)
+    export_parser = commands.add_parser("export", help="online backup next to a writer and bulk export")
+    export_parser.add_argument("--size", type=int, default=100_000)
+    export_parser.add_argument("--steps", type=int, nargs="+", default=[16, 256, 4096])
+    export_parser.add_argument("--sleep", type=float, default=0.001,
+                               help="seconds a backup step waits for a locked database")
+    delete_parser = commands.add_parser("delete", help="set-based batch delete against delete per course")
+    delete_parser.add_argument("--size", type=int, default=100_000)
+    delete_parser.add_argument("--deletes", type=int, default=10_000)
+    stats_parser = commands.add_parser("stats", help="summary tables against aggregation on every read")
+    stats_parser.add_argument("--size", type=int, default=100_000)
+    stats_parser.add_argument("--reads", type=int, default=20)
+    changes_parser = commands.add_parser("changes", help="incremental sync through the change log against re-read")
+    changes_parser.add_argument("--size", type=int, default=100_000)
+    changes_parser.add_argument("--updates", type=int, default=1_000)
+    batch_parser = commands.add_parser("batch", help="main.py --batch at group sizes against the scripted menu")
+    batch_parser.add_argument("--size", type=int, default=10_000)
+    batch_parser.add_argument("--commands", type=int, default=10_000)
+    batch_parser.add_argument("--write-share", type=float, default=0.5, help="share of inserts among the commands")
+    batch_parser.add_argument("--group-sizes", type=int, nargs="+", default=[1, 10, 100, 1_000])
+    batch_parser.add_argument("--menu-limit", type=int, default=10_000,
+                              help="largest number of commands to run through the menu")
+    ids_parser = commands.add_parser("ids", help="course IDs reserved by blocks from concurrent processes")
+    ids_parser.add_argument("--processes", type=int, default=4)
+    ids_parser.add_argument("--inserts", type=int, default=2_000, help="courses inserted by every process")
+    ids_parser.add_argument("--id-blocks", type=int, nargs="+", default=[1, 10, 100, 1_000])
+    ids_worker_parser = commands.add_parser("ids-worker")
+    ids_worker_parser.add_argument("location")
+    ids_worker_parser.add_argument("inserts", type=int)
+    ids_worker_parser.add_argument("id_block", type=int)
+    model_parser = commands.add_parser("model", help="construction rate and memory of the domain objects")
+    model_parser.add_argument("--count", type=int, default=1_000_000)
+    validate_parser = commands.add_parser("validate", help="create_many on columns against objects one by one")
+    validate_parser.add_argument("--rows", type=int, default=100_000)
+    validate_parser.add_argument("--invalid-share", type=float, default=0.01)
+    timetable_parser = commands.add_parser("timetable", help="scheduling sessions and conflict lookups by index")
+    timetable_parser.add_argument("--size", type=int, default=10_000, help="number of courses")
+    timetable_parser.add_argument("--sessions", type=int, default=100_000)
+    timetable_parser.add_argument("--rooms", type=int, default=50)
+    timetable_parser.add_argument("--lookups", type=int, default=1_000)
+    shards_parser = commands.add_parser("shards", help="sharded academy against a single database")
+    shards_parser.add_argument("--size", type=int, default=100_000)
+    shards_parser.add_argument("--shards", type=int, default=4)
+    shards_parser.add_argument("--reads", type=int, default=20)
+    startup_parser = commands.add_parser("startup", help="import time and wall clock to the first query of a process")
+    startup_parser.add_argument("--size", type=int, default=10_000)
+    startup_parser.add_argument("--runs", type=int, default=10)
+    startup_parser.add_argument("--top", type=int, default=8, help="number of the heaviest imports to show")
+    menu_worker_parser = commands.add_parser("menu-worker")
+    menu_worker_parser.add_argument("location")
+    stream_worker_parser = commands.add_parser("stream-worker")
+    stream_worker_parser.add_argument("location")
+    stream_worker_parser.add_argument("mode", choices=["string", "stream", "jsonl", "columnar"])
+    args = parser.parse_args()
+    if args.command == "report":
+        bench_report(args.sizes, args.legacy_limit)
+    elif args.command == "lookups":
+        bench_lookups(args.size, args.lookups)
+    elif args.command == "import":
+        bench_import(args.sizes, args.batch_size, args.legacy_limit)
+    elif args.command == "concurrency":
+        bench_concurrency(args.size, args.threads, args.pool_sizes, args.requests)
+    elif args.command == "async":
+        bench_async(args.size, args.coroutines, args.distinct, args.pool_size)
+    elif args.command == "cache":
+        bench_cache(args.size, args.lookups, args.cache_sizes, args.ttl)
+    elif args.command == "pages":
+        bench_pages(args.size, args.limit, args.repeats)
+    elif args.command == "search":
+        bench_search(args.size, args.limit, args.repeats)
+    elif args.command == "snapshot":
+        bench_snapshot(args.size, args.lookups)
+    elif args.command == "tracing":
+        bench_tracing(args.size, args.lookups)
+    elif args.command == "profiles":
+        bench_profiles(args.size, args.inserts, args.lookups)
+    elif args.command == "suite":
+        bench_suite(args.sizes, args.repeats, args.budget, args.menu_repeats, args.seed, args.output)
+    elif args.command == "compare":
+        sys.exit(0 if compare_results(args.old, args.new, args.threshold) else 1)
+    elif args.command == "export":
+        bench_export(args.size, args.steps, args.sleep)
+    elif args.command == "delete":
+        bench_delete(args.size, args.deletes)
+    elif args.command == "stats":
+        bench_stats(args.size, args.reads)
+    elif args.command == "changes":
+        bench_changes(args.size, args.updates)
+    elif args.command == "batch":
+        bench_batch(args.size, args.commands, args.write_share, args.group_sizes, args.menu_limit)
+    elif args.command == "stream":
+        bench_stream(args.size)
+    elif args.command == "ids":
+        bench_ids(args.processes, args.inserts, args.id_blocks)
+    elif args.command == "ids-worker":
+        ids_worker(args.location, args.inserts, args.id_block)
+    elif args.command == "model":
+        bench_model(args.count)
+    elif args.command == "validate":
+        bench_validate(args.rows, args.invalid_share)
+    elif args.command == "timetable":
+        bench_timetable(args.size, args.sessions, args.rooms, args.lookups)
+    elif args.command == "shards":
+        bench_shards(args.size, args.shards, args.reads)
+    elif args.command == "startup":
+        bench_startup(args.size, args.runs, args.top)
+    elif args.command == "menu-worker":
+        menu_worker(args.location)
+    elif args.command == "stream-worker":
+        stream_worker(args.location, args.mode)
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()  # marks a key that is not in the cache
+
+
+class LRUCache:
+    """Class that implements bounded cache with least recently used eviction and time to live of entries"""
+
+    def __init__(self, max_size: int, ttl: float = None, clock=time.monotonic):
+        """Constructs LRUCache
+
+        Initializes LRUCache with maximum number of entries, number of seconds entries live
+        (forever if ttl is None) and function returning current time in seconds"""
+        if not isinstance(max_size, int):
+            raise TypeError
+        if max_size <= 0:
+            raise ValueError("Size of the cache must be integer and above 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Time to live must be above 0")
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries = OrderedDict()  # key -> (value, expiration time)
+        self.__lock = threading.Lock()
+        self.__hits = self.__misses = self.__evictions = self.__expirations = self.__invalidations = 0
+
+    def get(self, key, default=MISSING):
+        """Returns value cached under the key or default if it is not cached or has expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return default
+            if entry[1] is not None and entry[1] <= self.__clock():
+                del self.__entries[key]
+                self.__expirations += 1
+                self.__misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> None:
+        """Caches the value under the key evicting the least recently used entry if the cache is full"""
+        with self.__lock:
+            expires = None if self.__ttl is None else self.__clock() + self.__ttl
+            self.__entries[key] = (value, expires)
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, *keys) -> None:
+        """Removes the keys from the cache"""
+        with self.__lock:
+            for key in keys:
+                if self.__entries.pop(key, None) is not None:
+                    self.__invalidations += 1
+
+    def clear(self) -> None:
+        """Removes all entries from the cache"""
+        with self.__lock:
+            self.__invalidations += len(self.__entries)
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        """Returns number of cached entries"""
+        return len(self.__entries)
+
+    @property
+    def stats(self) -> dict:
+        """Returns number of hits, misses, evictions, expirations and invalidations and size of the cache"""
+        with self.__lock:
+            return {'hits': self.__hits, 'misses': self.__misses, 'evictions': self.__evictions,
+                    'expirations': self.__expirations, 'invalidations': self.__invalidations,
+                    'size': len(self.__entries), 'max_size': self.__max_size}
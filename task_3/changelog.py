@@ -0,0 +1,17 @@
+import json
+from collections import namedtuple
+
+
+class Change(namedtuple('Change', ('cursor', 'table', 'operation', 'row', 'old'), defaults=(None,))):
+    """Change of one row of the catalogue read from the change log
+
+    cursor is the position of the change in the log, operation is insert, update or delete, row is the inserted
+    or updated row or the deleted one, old is the row before an update.
+    Built on collections.namedtuple rather than typing.NamedTuple to keep typing out of the start of Academy"""
+    __slots__ = ()
+
+    @staticmethod
+    def from_log(entry: dict):
+        """Returns Change created from the row of ChangeLog table"""
+        return Change(entry['id'], entry['table_name'], entry['operation'], json.loads(entry['row']),
+                      json.loads(entry['old']) if entry['old'] is not None else None)
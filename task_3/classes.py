@@ -1,11 +1,14 @@
 import re
 from interfaces import ICourse, ILocalCourse, IOffsiteCourse, ITeacher
 
+FULL_NAME = re.compile('[A-Z][a-z]*(-[A-Z]?[a-z]+)?')  # surname, name or patronymic
+BIRTH_DATE = re.compile('(19|20)[0-9]{2}-(([1-9]|1[0-2])|0[1-9])-(([1-9]|2[0-9])|3[0-1]|0[1-9])')
+
 
 def full_name_dec(func):
     """Decorator to check whether input of surname, name and patronymic is valid"""
     def wrapper(self, full_name):
-        if not (isinstance(full_name, str) and re.fullmatch('[A-Z][a-z]*(-[A-Z]?[a-z]+)?', full_name)):
+        if not (isinstance(full_name, str) and FULL_NAME.fullmatch(full_name)):
             raise TypeError
         if not full_name:
             raise ValueError("No data")
@@ -14,7 +17,11 @@ def full_name_dec(func):
 
 
 class Teacher(ITeacher):
-    """Class that implements teacher's profile"""
+    """Class that implements teacher's profile
+
+    Courses of the teacher are kept in the order they were added, a course is found or removed in O(1)"""
+
+    __slots__ = ('__surname', '__name', '__patronymic', '__birth_date', '__courses')
 
     def __init__(self, surname: str, name: str, patronymic: str, birth_date: str):
         """Constructs Teacher
@@ -24,7 +31,18 @@ class Teacher(ITeacher):
         self.name = name
         self.patronymic = patronymic
         self.birth_date = birth_date
-        self.__courses = []
+        self.__courses = {}  # course -> None, dictionary keeps the order of the courses
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """Returns Teacher created from the row of Teachers table without validation: the database has checked it"""
+        teacher = cls.__new__(cls)
+        teacher.__surname = row['surname']
+        teacher.__name = row['name']
+        teacher.__patronymic = row['patronymic']
+        teacher.__birth_date = row['birth_date']
+        teacher.__courses = {}
+        return teacher
 
     @property
     def surname(self) -> str:
@@ -67,23 +85,29 @@ class Teacher(ITeacher):
     @birth_date.setter
     def birth_date(self, birth_date: str) -> None:
         """Sets the teacher's birth date"""
-        if not (isinstance(birth_date, str) and
-                re.fullmatch('(19|20)[0-9]{2}-(([1-9]|1[0-2])|0[1-9])-(([1-9]|2[0-9])|3[0-1]|0[1-9])', birth_date)):
+        if not (isinstance(birth_date, str) and BIRTH_DATE.fullmatch(birth_date)):
             raise TypeError
         if not birth_date:
             raise ValueError("No data")
         self.__birth_date = birth_date
 
+    @property
+    def key(self) -> tuple:
+        """Returns surname, name, patronymic and birth date that identify the teacher as Teachers table does"""
+        return self.__surname, self.__name, self.__patronymic, self.__birth_date
+
     @property
     def courses(self) -> list:
-        """Returns the list of the teacher's courses"""
-        return self.__courses
+        """Returns the list of the teacher's courses in the order they were added"""
+        return list(self.__courses)
 
     def add_course(self, course) -> None:
         """Adds the course to the list of the teacher's courses"""
         if not isinstance(course, (LocalCourse, OffsiteCourse)):
             raise TypeError
-        self.__courses.append(course)
+        if course in self.__courses:
+            raise ValueError("The teacher already teaches the course")
+        self.__courses[course] = None
 
     def remove_course(self, course) -> None:
         """Removes the course from the list of the teacher's courses"""
@@ -91,14 +115,16 @@ class Teacher(ITeacher):
             raise IndexError("The list of courses is empty")
         if not isinstance(course, (LocalCourse, OffsiteCourse)):
             raise TypeError
-        self.__courses.remove(course)
+        if course not in self.__courses:
+            raise ValueError("The teacher does not teach the course")
+        del self.__courses[course]
 
     def courses_str(self) -> str:
         """Returns the teacher's courses as string"""
         result = self.__str__() + ' teaches '
-        if len(self.courses) == 0:
+        if len(self.__courses) == 0:
             result += 'nothing at the moment'
-        for course in self.courses:
+        for course in self.__courses:
             result += f'{course}, '
         return result
 
@@ -112,17 +138,49 @@ class Teacher(ITeacher):
 
 
 class Course(ICourse):
-    """Class that implements course"""
+    """Class that implements course
+
+    Topics and teachers are kept in the order they were added, a topic or teacher is found or removed in O(1).
+    Teachers are told apart by their key, so an equal Teacher object of the same person is a duplicate"""
+
+    __slots__ = ('__name', '__program', '__teachers')
 
     def __init__(self, name, *program):
         """Constructs Course
 
         Initializes Course with name and tuple of topics studied within it"""
         self.name = name
-        self.__program = []
-        self.__teachers = []
+        self.__program = {}  # topic -> None, dictionary keeps the order of the topics
+        self.__teachers = {}  # teacher key -> teacher
         self.add_topic(*program)
 
+    @classmethod
+    def from_row(cls, row: dict, program=(), teachers=()):
+        """Returns course created from the row of LocalCourses or OffsiteCourses table, its topics and Teacher objects
+        without validation: the database has checked them"""
+        course = cls.__new__(cls)
+        course.__name = row['name']
+        course.__program = dict.fromkeys(program)
+        course.__teachers = {teacher.key: teacher for teacher in teachers}
+        for teacher in course.__teachers.values():
+            teacher.add_course(course)
+        return course
+
+    @classmethod
+    def from_columns(cls, names: list, programs: list) -> list:
+        """Returns courses without teachers created from columns of names and topics without validation
+
+        Courses are built in one loop instead of a from_row call per course"""
+        courses = []
+        new = cls.__new__
+        for name, program in zip(names, programs):
+            course = new(cls)
+            course.__name = name
+            course.__program = dict.fromkeys(program)
+            course.__teachers = {}
+            courses.append(course)
+        return courses
+
     @property
     def name(self) -> str:
         """Returns the course's name"""
@@ -140,12 +198,12 @@ class Course(ICourse):
     @property
     def program(self) -> list[str]:
         """Returns the course's program"""
-        return self.__program
+        return list(self.__program)
 
     @property
     def teachers(self) -> list[Teacher]:
-        """Returns the list of course's teachers"""
-        return self.__teachers
+        """Returns the list of the course's teachers in the order they were added"""
+        return list(self.__teachers.values())
 
     def add_topic(self, *program: list[str]) -> None:
         """Add the topic(s) to the course's program"""
@@ -154,18 +212,22 @@ class Course(ICourse):
                 raise TypeError
             if not topic:
                 raise ValueError("No data")
-            self.__program.append(topic)
+            if topic in self.__program:
+                raise ValueError(f"Topic {topic} is already in the program")
+            self.__program[topic] = None
 
     def remove_topic(self, *program: list[str]) -> None:
         """Remove the topic(s) from the course's program"""
-        if len(self.program) <= 0:
+        if len(self.__program) <= 0:
             raise IndexError("The program is empty")
         for topic in program:
             if not isinstance(topic, str):
                 raise TypeError
             if not topic:
                 raise ValueError("No data")
-            self.__program.remove(topic)
+            if topic not in self.__program:
+                raise ValueError(f"Topic {topic} is not in the program")
+            del self.__program[topic]
 
     def add_teacher(self, *teachers: list[Teacher]) -> None:
         """Adds the teacher(s) to the list of the course's teachers"""
@@ -174,20 +236,23 @@ class Course(ICourse):
                 raise TypeError
             if not teacher:
                 raise ValueError("No data")
-            self.__teachers.append(teacher)
+            if teacher.key in self.__teachers:
+                raise ValueError(f"Teacher {teacher} already teaches the course")
+            self.__teachers[teacher.key] = teacher
             teacher.add_course(self)
 
     def remove_teacher(self, *teachers: list[Teacher]) -> None:
         """Remove the teacher(s) from the list of the course's teachers"""
-        if len(self.teachers) <= 0:
+        if len(self.__teachers) <= 0:
             raise IndexError("The list of teachers is empty")
         for teacher in teachers:
             if not isinstance(teacher, Teacher):
                 raise TypeError
             if not teacher:
                 raise ValueError("No data")
-            self.__teachers.remove(teacher)
-            teacher.remove_course(self)
+            if teacher.key not in self.__teachers:
+                raise ValueError(f"Teacher {teacher} does not teach the course")
+            self.__teachers.pop(teacher.key).remove_course(self)  # the object that was added may be another one
 
     def __str__(self):
         """Returns string of a Course object
@@ -197,14 +262,14 @@ class Course(ICourse):
         Program: ...
         Teachers: ..."""
         result = f'{self.name}\nProgram: '
-        if len(self.program) == 0:
+        if len(self.__program) == 0:
             result += "nothing here yet"
-        for topic in self.program:
+        for topic in self.__program:
             result += f'#{topic} '
         result += "\nTeachers: "
-        if len(self.teachers) == 0:
+        if len(self.__teachers) == 0:
             result += "no one here yet"
-        for teacher in self.teachers:
+        for teacher in self.__teachers.values():
             result += f'{teacher} | '
         return result + '\n'
 
@@ -212,6 +277,8 @@ class Course(ICourse):
 class LocalCourse(Course, ICourse, ILocalCourse):
     """Class that implements local course"""
 
+    __slots__ = ('__room',)
+
     def __init__(self, name: str, room: int, *program: list[str]):
         """Constructs LocalCourse
 
@@ -219,6 +286,23 @@ class LocalCourse(Course, ICourse, ILocalCourse):
         super().__init__(name, *program)
         self.room = room
 
+    @classmethod
+    def from_row(cls, row: dict, program=(), teachers=()):
+        """Returns local course created from the row of LocalCourses table, its topics and Teacher objects
+        without validation, room of the row is None if the room was deleted"""
+        course = super().from_row(row, program, teachers)
+        course.__room = row['room']
+        return course
+
+    @classmethod
+    def from_columns(cls, names: list, rooms: list, programs: list) -> list:
+        """Returns local courses without teachers created from columns of names, rooms and topics
+        without validation"""
+        courses = super().from_columns(names, programs)
+        for course, room in zip(courses, rooms):
+            course.__room = room
+        return courses
+
     @property
     def room(self) -> int:
         """Returns the room number the course is held"""
@@ -246,6 +330,8 @@ class LocalCourse(Course, ICourse, ILocalCourse):
 class OffsiteCourse(Course, ICourse, IOffsiteCourse):
     """Class that implements offsite course"""
 
+    __slots__ = ('__address',)
+
     def __init__(self, name: str, address: str, *program: list[str]):
         """Constructor of OffsiteCourse
 
@@ -253,6 +339,23 @@ class OffsiteCourse(Course, ICourse, IOffsiteCourse):
         super().__init__(name, *program)
         self.address = address
 
+    @classmethod
+    def from_row(cls, row: dict, program=(), teachers=()):
+        """Returns offsite course created from the row of OffsiteCourses table, its topics and Teacher objects
+        without validation"""
+        course = super().from_row(row, program, teachers)
+        course.__address = row['address']
+        return course
+
+    @classmethod
+    def from_columns(cls, names: list, addresses: list, programs: list) -> list:
+        """Returns offsite courses without teachers created from columns of names, addresses and topics
+        without validation"""
+        courses = super().from_columns(names, programs)
+        for course, address in zip(courses, addresses):
+            course.__address = address
+        return courses
+
     @property
     def address(self) -> str:
         """Returns the address where course is held"""
@@ -0,0 +1,45 @@
+import gzip
+import json
+
+COLUMNAR_FORMAT = "academy-columnar/1"  # first line of a columnar file
+
+
+def export_jsonl(academy, path: str, page_size: int = 500) -> int:
+    """Writes all courses of Academy to the file with one JSON record per line
+
+    Records have the format of loaders.course_from_record, so the file can be imported with loaders.load_jsonl.
+    Courses are read by pages of page_size, memory does not grow with the database. Returns number of courses"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        for record in academy.iter_course_records(page_size):
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def export_columnar(academy, path: str, row_group: int = 10000) -> dict:
+    """Writes all tables of Academy to the gzip file as row groups of up to row_group rows stored by columns
+
+    First line of the file is the format, every next line is a JSON row group as
+    {"table": ..., "rows": ..., "columns": {"column": [value, ...], ...}}.
+    Only one row group is held in memory at a time. Returns number of rows written per table"""
+    counts = {}
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        file.write(json.dumps({'format': COLUMNAR_FORMAT}) + '\n')
+        for table, page in academy.iter_tables(row_group):
+            columns = {column: [row[column] for row in page] for column in page[0]}
+            file.write(json.dumps({'table': table, 'rows': len(page), 'columns': columns},
+                                  ensure_ascii=False, separators=(',', ':')) + '\n')
+            counts[table] = counts.get(table, 0) + len(page)
+    return counts
+
+
+def read_columnar(path: str):
+    """Yields name of the table and its row group as dictionary of columns from the file of export_columnar"""
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        header = json.loads(file.readline() or '{}')
+        if header.get('format') != COLUMNAR_FORMAT:
+            raise ValueError(f"File is not in {COLUMNAR_FORMAT} format")
+        for line in file:
+            group = json.loads(line)
+            yield group['table'], group['columns']
@@ -1,5 +1,18 @@
+from itertools import compress
 from classes import LocalCourse, OffsiteCourse, Teacher
 from interfaces import ICourseFactory, ITeacherFactory
+from validation import validate_courses, validate_teachers
+
+
+def build_valid(build, errors: dict, *columns: list) -> list:
+    """Returns objects built by build from the columns with None in place of every row of errors
+
+    Only the valid rows are passed to build, so it never sees values of a wrong type"""
+    if not errors:
+        return build(*columns)
+    valid = [i not in errors for i in range(len(columns[0]))]
+    built = iter(build(*(list(compress(column, valid)) for column in columns)))
+    return [next(built) if ok else None for ok in valid]
 
 
 class CourseFactory(ICourseFactory):
@@ -15,6 +28,24 @@ class CourseFactory(ICourseFactory):
         """Returns created offsite course"""
         return OffsiteCourse(name, address, *program)
 
+    @staticmethod
+    def create_many_local(names: list, rooms: list, programs: list) -> tuple[list, dict]:
+        """Returns local courses created from columns of names, rooms and programs checked all at once
+
+        Courses have no teachers, they are added with add_teacher. List of courses has None in place of every
+        invalid row, errors of the rows are reported as by validation.validate_courses"""
+        errors = validate_courses(names, rooms, programs)
+        return build_valid(LocalCourse.from_columns, errors, names, rooms, programs), errors
+
+    @staticmethod
+    def create_many_offsite(names: list, addresses: list, programs: list) -> tuple[list, dict]:
+        """Returns offsite courses created from columns of names, addresses and programs checked all at once
+
+        Courses have no teachers, they are added with add_teacher. List of courses has None in place of every
+        invalid row, errors of the rows are reported as by validation.validate_courses"""
+        errors = validate_courses(names, addresses, programs, local=False)
+        return build_valid(OffsiteCourse.from_columns, errors, names, addresses, programs), errors
+
 
 class TeacherFactory(ITeacherFactory):
     """Factory to create teacher profile"""
@@ -23,3 +54,16 @@ class TeacherFactory(ITeacherFactory):
     def create_teacher(surname: str, name: str, patronymic: str, birth_date: str) -> Teacher:
         """Returns created Teacher profile"""
         return Teacher(surname, name, patronymic, birth_date)
+
+    @staticmethod
+    def create_many(surnames: list, names: list, patronymics: list, birth_dates: list) -> tuple[list, dict]:
+        """Returns Teacher profiles created from columns of surnames, names, patronymics and birth dates
+        checked all at once
+
+        List of teachers has None in place of every invalid row, errors of the rows are reported
+        as by validation.validate_teachers"""
+        errors = validate_teachers(surnames, names, patronymics, birth_dates)
+        return [None if i in errors else Teacher.from_row({'surname': surname, 'name': name, 'patronymic': patronymic,
+                                                           'birth_date': birth_date})
+                for i, (surname, name, patronymic, birth_date) in
+                enumerate(zip(surnames, names, patronymics, birth_dates))], errors
@@ -0,0 +1,97 @@
+import random
+from classes import Teacher
+from factories import CourseFactory, TeacherFactory
+
+SURNAMES = ("Ivanenko", "Petrenko", "Shevchenko", "Bondarenko", "Kovalenko", "Tkachenko", "Kravchenko", "Oliinyk",
+            "Shevchuk", "Polishchuk", "Melnyk", "Boiko", "Moroz", "Lysenko", "Marchenko", "Rudenko")
+NAMES = ("Andrii", "Olena", "Dmytro", "Iryna", "Mykola", "Oksana", "Serhii", "Nataliia", "Taras", "Yuliia")
+PATRONYMICS = ("Andriiovych", "Petrivna", "Mykolaiovych", "Ivanivna", "Serhiiovych", "Tarasivna")
+STREETS = ("Khreshchatyk", "Peremohy", "Shevchenka", "Franka", "Lesi Ukrainky", "Sahaidachnoho")
+COURSE_WORDS = ("Python", "Algorithms", "Databases", "Web", "Testing", "Networks", "Security", "Data", "Cloud",
+                "Design", "Patterns", "Basics", "Advanced", "Practice", "Systems", "Analysis")
+TOPIC_WORDS = ("variables", "loops", "functions", "classes", "decorators", "generators", "iterators", "closures",
+               "exceptions", "modules", "typing", "asyncio", "threads", "sockets", "sql", "indexes", "joins",
+               "regex", "json", "testing", "profiling", "packaging", "logging", "sorting")
+DAYS = tuple(range(1, 10)) + tuple(range(20, 29))  # days of birth Teacher accepts in every month
+
+
+def letters(number: int) -> str:
+    """Returns the number written with lowercase letters a-z as digits"""
+    result = chr(97 + number % 26)
+    while number >= 26:
+        number = number // 26 - 1
+        result = chr(97 + number % 26) + result
+    return result
+
+
+class Generator:
+    """Class that generates reproducible academy data: teachers, rooms, topics and local and offsite courses
+
+    The same seed and sizes give the same data, objects are created through TeacherFactory and CourseFactory"""
+
+    def __init__(self, teachers: int, courses: int, rooms: int = 20, topics: int = 50, seed: int = 0,
+                 local_share: float = 0.5, teachers_per_course: tuple = (1, 3), topics_per_course: tuple = (2, 6)):
+        """Constructs Generator
+
+        Initializes Generator with number of teachers, courses, rooms and topics, seed of the random data,
+        share of local courses and ranges of number of teachers and topics of a course"""
+        for count in (teachers, courses, rooms, topics):
+            if not isinstance(count, int):
+                raise TypeError
+        if teachers <= 0 or courses < 0 or rooms <= 0 or topics <= 0:
+            raise ValueError("Number of teachers, rooms and topics must be above 0, number of courses not below 0")
+        if not 0 <= local_share <= 1:
+            raise ValueError("Share of local courses must be between 0 and 1")
+        self.__teachers = teachers
+        self.__courses = courses
+        self.__rooms = rooms
+        self.__topics = topics
+        self.__seed = seed
+        self.__local_share = local_share
+        self.__teachers_per_course = (min(teachers_per_course[0], teachers), min(teachers_per_course[1], teachers))
+        self.__topics_per_course = (min(topics_per_course[0], topics), min(topics_per_course[1], topics))
+        rnd = random.Random(seed)
+        # teachers are kept as their identities: Teacher objects remember their courses and would keep them alive
+        self.__identities = [(f"{SURNAMES[i % len(SURNAMES)]}{letters(i // len(SURNAMES))}", rnd.choice(NAMES),
+                              rnd.choice(PATRONYMICS), f"{rnd.randint(1950, 2000)}-{rnd.randint(1, 12):02}-"
+                                                       f"{rnd.choice(DAYS):02}")
+                             for i in range(teachers)]
+
+    def teachers(self) -> list[Teacher]:
+        """Returns new Teacher objects of all teachers"""
+        return [TeacherFactory.create_teacher(*identity) for identity in self.__identities]
+
+    def rooms(self) -> list[int]:
+        """Returns numbers of the rooms"""
+        return list(range(1, self.__rooms + 1))
+
+    def topics(self) -> list[str]:
+        """Returns topic vocabulary"""
+        return [f"{TOPIC_WORDS[i % len(TOPIC_WORDS)]}{'' if i < len(TOPIC_WORDS) else i // len(TOPIC_WORDS)}"
+                for i in range(self.__topics)]
+
+    def courses(self):
+        """Yields courses one by one, every course has new Teacher objects of its teachers"""
+        rnd = random.Random(self.__seed + 1)
+        topics = self.topics()
+        for i in range(1, self.__courses + 1):
+            name = f"{rnd.choice(COURSE_WORDS)} {rnd.choice(COURSE_WORDS)} {i}"
+            program = rnd.sample(topics, rnd.randint(*self.__topics_per_course))
+            if rnd.random() < self.__local_share:
+                course = CourseFactory.create_local(name, rnd.randint(1, self.__rooms), *program)
+            else:
+                course = CourseFactory.create_offsite(name, f"{rnd.randint(1, 200)} {rnd.choice(STREETS)} street",
+                                                      *program)
+            course.add_teacher(*(TeacherFactory.create_teacher(*identity) for identity in
+                                 rnd.sample(self.__identities, rnd.randint(*self.__teachers_per_course))))
+            yield course
+
+    def fill(self, academy, batch_size: int = 1000) -> list:
+        """Adds the rooms, teachers and courses to Academy
+
+        Returns statistics of the batches of Academy.import_courses"""
+        with academy.write_lock:  # rooms and teachers are committed together before the courses
+            academy.executemany('insert_room', [(room,) for room in self.rooms()])
+            academy.executemany('insert_teacher', [academy.teacher_params(teacher) for teacher in self.teachers()])
+            academy.commit()
+            return academy.import_courses(self.courses(), batch_size)
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 class ITeacher(ABC):
     """Interface implementing the teacher"""
 
+    __slots__ = ()  # implementations keep their attributes in slots
+
     @property
     @abstractmethod
     def surname(self) -> str:
@@ -52,6 +54,12 @@ class ITeacher(ABC):
         """Sets the teacher's birth date"""
         pass
 
+    @property
+    @abstractmethod
+    def key(self) -> tuple:
+        """Returns the fields that identify the teacher"""
+        pass
+
     @property
     @abstractmethod
     def courses(self) -> list:
@@ -72,6 +80,8 @@ class ITeacher(ABC):
 class ICourse(ABC):
     """Interface implementing the course"""
 
+    __slots__ = ()  # implementations keep their attributes in slots
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -86,14 +96,14 @@ class ICourse(ABC):
 
     @property
     @abstractmethod
-    def teachers(self) -> str:
+    def teachers(self) -> list:
         """Returns the list of course's teachers"""
         pass
 
     @property
     @abstractmethod
-    def program(self) -> str:
-        """Returns the course's program"""
+    def program(self) -> list:
+        """Returns the list of topics of the course's program"""
         pass
 
     @abstractmethod
@@ -120,6 +130,8 @@ class ICourse(ABC):
 class ILocalCourse(ABC):
     """Interface implementing the local course"""
 
+    __slots__ = ()  # implementations keep their attributes in slots
+
     @property
     @abstractmethod
     def room(self) -> int:
@@ -136,6 +148,8 @@ class ILocalCourse(ABC):
 class IOffsiteCourse(ABC):
     """Interface implementing the offsite course"""
 
+    __slots__ = ()  # implementations keep their attributes in slots
+
     @property
     @abstractmethod
     def address(self) -> str:
@@ -164,6 +178,18 @@ class ICourseFactory(ABC):
         """Creates offsite course"""
         pass
 
+    @staticmethod
+    @abstractmethod
+    def create_many_local(names: list, rooms: list, programs: list):
+        """Creates local courses without teachers from columns of their fields"""
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def create_many_offsite(names: list, addresses: list, programs: list):
+        """Creates offsite courses without teachers from columns of their fields"""
+        pass
+
 
 class ITeacherFactory(ABC):
     """Interface implementing the teacher factory"""
@@ -173,3 +199,9 @@ class ITeacherFactory(ABC):
     def create_teacher(surname: str, name: str, patronymic: str, birth_date: str):
         """Creates teacher profile"""
         pass
+
+    @staticmethod
+    @abstractmethod
+    def create_many(surnames: list, names: list, patronymics: list, birth_dates: list):
+        """Creates teacher profiles from columns of their fields"""
+        pass
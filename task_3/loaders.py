@@ -0,0 +1,54 @@
+import csv
+import json
+from classes import Course
+from factories import CourseFactory, TeacherFactory
+
+CSV_FIELDS = ['type', 'name', 'room', 'address', 'program', 'teachers']
+
+
+def course_from_record(record: dict) -> Course:
+    """Returns local or offsite course created from the record
+
+    Record is a dictionary as
+    {"type": "local"/"offsite", "name": ..., "room": ... / "address": ...,
+     "program": [topic, ...], "teachers": [{"surname": ..., "name": ..., "patronymic": ..., "birth_date": ...}, ...]}"""
+    if record['type'] == 'local':
+        course = CourseFactory.create_local(record['name'], int(record['room']), *record.get('program', []))
+    elif record['type'] == 'offsite':
+        course = CourseFactory.create_offsite(record['name'], record['address'], *record.get('program', []))
+    else:
+        raise ValueError(f"Unknown course type {record['type']}")
+    for teacher in record.get('teachers', []):
+        course.add_teacher(TeacherFactory.create_teacher(teacher['surname'], teacher['name'],
+                                                         teacher['patronymic'], teacher['birth_date']))
+    return course
+
+
+def load_jsonl(path: str):
+    """Yields courses from the file with one JSON record per line"""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield course_from_record(json.loads(line))
+
+
+def load_csv(path: str):
+    """Yields courses from the CSV file
+
+    File has header type,name,room,address,program,teachers where topics of program are separated by |
+    and teachers are separated by | as Surname Name Patronymic birth_date"""
+    with open(path, encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            row['program'] = [topic for topic in row['program'].split('|') if topic]
+            row['teachers'] = [dict(zip(('surname', 'name', 'patronymic', 'birth_date'), teacher.split()))
+                               for teacher in row['teachers'].split('|') if teacher]
+            yield course_from_record(row)
+
+
+def load_courses(path: str):
+    """Yields courses from .csv or .jsonl file"""
+    if path.endswith('.csv'):
+        return load_csv(path)
+    if path.endswith('.jsonl'):
+        return load_jsonl(path)
+    raise ValueError("Only .csv and .jsonl files can be loaded")
@@ -1,106 +1,195 @@
-import sys
-from academy import Academy
-from factories import CourseFactory, TeacherFactory
-
-if __name__ == '__main__':
-    academy = Academy()
-    while True:
-        print("\t\t___Software Academy___"
-              "\n\t\t\tMenu"
-              "\n\t1. Insert new local course"
-              "\n\t2. Insert new offsite course"
-              "\n\t3. Display all courses"
-              "\n\t4. Display all local courses"
-              "\n\t5. Display all offsite courses"
-              "\n\t6. Find course by ID"
-              "\n\t7. Display all teachers"
-              "\n\t8. Find teacher by ID"
-              "\n\t9. Display courses taught by the teacher"
-              "\n\t10. Display teachers of the course"
-              "\n\t11. Display program of the course"
-              "\n\t12. Display topics studied at the Software Academy"
-              "\n\t13. Display academy rooms"
-              "\n\t14. Add room (only for administrator)"
-              "\n\t15. Add teacher (only for administrator)"
-              "\n\t16. Clear Academy database (only for administrator)"
-              "\n\n\tEnter 0 to exit\n")
-        try:
-            choice = int(input("Enter number of the option: "))
-            if not choice:
-                print("Thank you! See you later")
-                academy.close()
-                sys.exit()
-            elif choice == 1 or choice == 2:
-                course_name = input("Enter name of the course: ")
-                course_program = ' '.join(input("Enter topics studied within the course through , : ").split())
-                course_program = course_program.split(',')
-                teachers_num = int(input("Enter number of teachers to teach it: "))
-                if teachers_num < 0:
-                    raise ValueError("Number of teachers cannot be less than 0")
-                if choice == 1:
-                    room = int(input("Enter number of the room where the course is taught: "))
-                    course = CourseFactory.create_local(course_name, room, *course_program)
-                    for i in range(0, teachers_num):
-                        surname = input("Enter teacher's surname: ")
-                        name = input("\tname: ")
-                        patronymic = input("\tpatronymic: ")
-                        birth_date = input("\tbirth date: ")
-                        course.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
-                    academy.insert_local(course)
-                else:
-                    address = input("Please enter the address where the course is taught")
-                    course = CourseFactory.create_offsite(course_name, address, *course_program)
-                    for i in range(0, teachers_num):
-                        surname = input("Enter teacher's surname: ")
-                        name = input("\tname: ")
-                        patronymic = input("\tpatronymic: ")
-                        birth_date = input("\tbirth date: ")
-                        course.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
-                    academy.insert_local(course)
-            elif choice == 3:
-                print(academy.get_all_courses_str())
-            elif choice == 4:
-                print(academy.get_all_local_str())
-            elif choice == 5:
-                print(academy.get_all_offsite_str())
-            elif choice == 6 or choice == 10 or choice == 11:
-                id_course = int(input("Enter ID of the course: "))
-                if choice == 6:
-                    print(academy.get_course_str(id_course))
-                elif choice == 10:
-                    print(academy.get_course_teachers_str(id_course))
-                else:
-                    print(academy.get_program_str(id_course))
-            elif choice == 7:
-                print(academy.get_all_teachers_str())
-            elif choice == 8 or choice == 9:
-                id_teacher = int(input("Enter ID of the teacher: "))
-                if choice == 8:
-                    print(academy.get_teacher_str(id_teacher))
-                else:
-                    print(academy.get_teacher_courses_str(id_teacher))
-            elif choice == 12:
-                print(academy.get_topics_str())
-            elif choice == 13:
-                print(academy.get_rooms_str())
-            elif choice == 14 or choice == 15 or choice == 16:
-                password = input("Enter password to do it: ")
-                if not Academy.password_match(password):
-                    print("Wrong password. Access blocked\n")
-                else:
-                    if choice == 14:
-                        room = int(input("Enter number of the room: "))
-                        academy.add_room(room)
-                    if choice == 15:
-                        surname = input("Enter teacher's surname: ")
-                        name = input("\tname: ")
-                        patronymic = input("\tpatronymic: ")
-                        birth_date = input("\tbirth date")
-                        academy.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
-                    if choice == 16:
-                        academy.clear_all()
-            else:
-                print("Unexpected number. Please enter number from the list")
-            input("Press something to continue...\n")
-        except Exception as err:
-            print(f"Oops, caught an error! {err}\n")
+import argparse
+import json
+import sys
+from contextlib import ExitStack
+from academy import Academy
+from factories import CourseFactory, TeacherFactory
+
+PAGE_SIZE = 20
+
+
+def print_stream(records) -> None:
+    """Prints records as soon as they are produced followed by a new line"""
+    for record in records:
+        print(record, end='')
+    print()
+
+
+def browse(get_page, get_page_str, id_key: str) -> None:
+    """Displays records page by page with navigation to the next and the previous page
+
+    get_page returns rows of the page and get_page_str returns the page as string, both by page size
+    and ID of the record the page follows"""
+    history = [None]  # ID of the record every shown page follows
+    while True:
+        page = get_page(PAGE_SIZE, history[-1])
+        print(get_page_str(PAGE_SIZE, history[-1]))
+        action = input(f"Page {len(history)}. Enter n for the next page, p for the previous one "
+                       f"or anything else to return to the menu: ").strip().lower()
+        if action == 'n':
+            if len(page) < PAGE_SIZE:
+                print("This is the last page\n")
+            else:
+                history.append(page[-1][id_key])
+        elif action == 'p':
+            if len(history) == 1:
+                print("This is the first page\n")
+            else:
+                history.pop()
+        else:
+            return
+
+
+def run_batch_mode(academy: Academy, source: str, target: str, group_size: int) -> None:
+    """Runs JSON-line commands from the file or stdin (-) and writes JSON results to the file or stdout (-)
+
+    Summary with the throughput in commands per second is written to stderr as a JSON line"""
+    from batch import run_batch  # the menu does not need batch commands, so they are not imported at start
+    with ExitStack() as files:  # the source is closed even if the target can not be opened
+        commands = sys.stdin if source == '-' else files.enter_context(open(source, encoding='utf-8'))
+        results = sys.stdout if target == '-' else files.enter_context(open(target, 'w', encoding='utf-8'))
+        summary = run_batch(academy, commands, results, group_size)
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Software Academy")
+    parser.add_argument('db_location', nargs='?', help="path, :memory: or file: URI of the database")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run JSON-line commands from the file (- for stdin) instead of the menu")
+    parser.add_argument('--output', metavar='FILE', default='-', help="file for JSON results of --batch")
+    parser.add_argument('--group-size', type=int, default=100,
+                        help="number of --batch commands committed in one transaction")
+    arguments = parser.parse_args()
+    academy = Academy(arguments.db_location)
+    if arguments.batch:
+        try:
+            run_batch_mode(academy, arguments.batch, arguments.output, arguments.group_size)
+        finally:
+            academy.close()
+        sys.exit()
+    while True:
+        print("\t\t___Software Academy___"
+              "\n\t\t\tMenu"
+              "\n\t1. Insert new local course"
+              "\n\t2. Insert new offsite course"
+              "\n\t3. Display all courses"
+              "\n\t4. Display all local courses"
+              "\n\t5. Display all offsite courses"
+              "\n\t6. Find course by ID"
+              "\n\t7. Display all teachers"
+              "\n\t8. Find teacher by ID"
+              "\n\t9. Display courses taught by the teacher"
+              "\n\t10. Display teachers of the course"
+              "\n\t11. Display program of the course"
+              "\n\t12. Display topics studied at the Software Academy"
+              "\n\t13. Display academy rooms"
+              "\n\t14. Add room (only for administrator)"
+              "\n\t15. Add teacher (only for administrator)"
+              "\n\t16. Clear Academy database (only for administrator)"
+              "\n\t17. Search courses by name, address, teacher or topic"
+              "\n\t18. Display academy statistics"
+              "\n\t19. Check and repair statistics (only for administrator)"
+              "\n\t20. Display timetable of the room"
+              "\n\t21. Schedule session of the course (only for administrator)"
+              "\n\n\tEnter 0 to exit\n")
+        try:
+            choice = int(input("Enter number of the option: "))
+            if not choice:
+                print("Thank you! See you later")
+                academy.close()
+                sys.exit()
+            elif choice == 1 or choice == 2:
+                course_name = input("Enter name of the course: ")
+                course_program = ' '.join(input("Enter topics studied within the course through , : ").split())
+                course_program = course_program.split(',')
+                teachers_num = int(input("Enter number of teachers to teach it: "))
+                if teachers_num < 0:
+                    raise ValueError("Number of teachers cannot be less than 0")
+                if choice == 1:
+                    room = int(input("Enter number of the room where the course is taught: "))
+                    course = CourseFactory.create_local(course_name, room, *course_program)
+                    for i in range(0, teachers_num):
+                        surname = input("Enter teacher's surname: ")
+                        name = input("\tname: ")
+                        patronymic = input("\tpatronymic: ")
+                        birth_date = input("\tbirth date: ")
+                        course.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
+                    academy.insert_local(course)
+                else:
+                    address = input("Please enter the address where the course is taught")
+                    course = CourseFactory.create_offsite(course_name, address, *course_program)
+                    for i in range(0, teachers_num):
+                        surname = input("Enter teacher's surname: ")
+                        name = input("\tname: ")
+                        patronymic = input("\tpatronymic: ")
+                        birth_date = input("\tbirth date: ")
+                        course.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
+                    academy.insert_local(course)
+            elif choice == 3:
+                browse(academy.get_courses_page, academy.get_courses_page_str, 'id_course')
+            elif choice == 4:
+                browse(academy.get_local_page, academy.get_local_page_str, 'id_course')
+            elif choice == 5:
+                browse(academy.get_offsite_page, academy.get_offsite_page_str, 'id_course')
+            elif choice == 6 or choice == 10 or choice == 11:
+                id_course = int(input("Enter ID of the course: "))
+                if choice == 6:
+                    print(academy.get_course_str(id_course))
+                elif choice == 10:
+                    print(academy.get_course_teachers_str(id_course))
+                else:
+                    print(academy.get_program_str(id_course))
+            elif choice == 7:
+                browse(academy.get_teachers_page, academy.get_teachers_page_str, 'id_teacher')
+            elif choice == 8 or choice == 9:
+                id_teacher = int(input("Enter ID of the teacher: "))
+                if choice == 8:
+                    print(academy.get_teacher_str(id_teacher))
+                else:
+                    print(academy.get_teacher_courses_str(id_teacher))
+            elif choice == 12:
+                print_stream(academy.iter_topics_str())
+            elif choice == 13:
+                print(academy.get_rooms_str())
+            elif choice == 17:
+                print(academy.search_str(input("Enter words to search for (word* to match beginning): ")))
+            elif choice == 18:
+                print(academy.stats_str())
+            elif choice == 20:
+                room = int(input("Enter number of the room: "))
+                start = input("Enter start of the period as YYYY-MM-DD HH:MM (empty for all sessions): ")
+                end = input("\tend of the period: ") if start else ""
+                print(academy.get_room_timetable_str(room, start or None, end or None))
+            elif choice == 14 or choice == 15 or choice == 16 or choice == 19 or choice == 21:
+                password = input("Enter password to do it: ")
+                if not Academy.password_match(password):
+                    print("Wrong password. Access blocked\n")
+                else:
+                    if choice == 14:
+                        room = int(input("Enter number of the room: "))
+                        academy.add_room(room)
+                    if choice == 15:
+                        surname = input("Enter teacher's surname: ")
+                        name = input("\tname: ")
+                        patronymic = input("\tpatronymic: ")
+                        birth_date = input("\tbirth date")
+                        academy.add_teacher(TeacherFactory.create_teacher(surname, name, patronymic, birth_date))
+                    if choice == 16:
+                        academy.clear_all()
+                    if choice == 19:
+                        differences = academy.check_stats(repair=True)
+                        for table, rows in differences.items():
+                            print(f"{table}: {len(rows['missing'])} rows missing, "
+                                  f"{len(rows['unexpected'])} rows unexpected")
+                        print("Statistics were repaired" if differences else "Statistics are consistent")
+                    if choice == 21:
+                        id_course = int(input("Enter ID of the course: "))
+                        start = input("Enter start of the session as YYYY-MM-DD HH:MM: ")
+                        end = input("\tend of the session: ")
+                        print(f"Session {academy.schedule_session(id_course, start, end)} is scheduled")
+            else:
+                print("Unexpected number. Please enter number from the list")
+            input("Press something to continue...\n")
+        except Exception as err:
+            print(f"Oops, caught an error! {err}\n")
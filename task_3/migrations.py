@@ -0,0 +1,298 @@
+import sqlite3
+
+
+def fetchall(connection: sqlite3.Connection, query: str) -> list[tuple]:
+    """Fetches all the rows of a executed query result as tuples whatever row factory the connection has"""
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    return cursor.execute(query).fetchall()
+
+
+# tables of the database, created when Academy opens an empty one
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS Rooms (room INTEGER PRIMARY KEY NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS Courses (id_course INTEGER PRIMARY KEY NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS OffsiteCourses (id_course INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL "
+    "REFERENCES Courses (id_course) ON DELETE CASCADE ON UPDATE CASCADE, name VARCHAR NOT NULL, "
+    "address VARCHAR NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS Teachers (id_teacher INTEGER PRIMARY KEY NOT NULL, surname VARCHAR NOT NULL, "
+    "name VARCHAR NOT NULL, patronymic VARCHAR NOT NULL, birth_date DATE NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS CoursesTeachers (id_course INTEGER REFERENCES Courses (id_course) "
+    "ON DELETE CASCADE ON UPDATE CASCADE NOT NULL, id_teacher INTEGER NOT NULL REFERENCES Teachers (id_teacher) "
+    "ON DELETE CASCADE ON UPDATE CASCADE)",
+    "CREATE TABLE IF NOT EXISTS LocalCourses (id_course INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL "
+    "REFERENCES Courses (id_course) ON DELETE CASCADE ON UPDATE CASCADE, name VARCHAR NOT NULL, "
+    "room INTEGER REFERENCES Rooms (room) ON DELETE SET NULL ON UPDATE SET NULL)",
+    "CREATE TABLE IF NOT EXISTS Topics (id_topic VARCHAR PRIMARY KEY NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS Program (id_course INTEGER NOT NULL REFERENCES Courses (id_course) "
+    "ON DELETE CASCADE ON UPDATE CASCADE, id_topic INTEGER NOT NULL REFERENCES Topics (id_topic) "
+    "ON DELETE CASCADE ON UPDATE CASCADE)",
+]
+
+
+def create_schema(connection: sqlite3.Connection) -> None:
+    """Creates the tables that do not exist yet"""
+    for query in SCHEMA:
+        connection.execute(query)
+
+
+def add_indexes(connection: sqlite3.Connection) -> None:
+    """Adds indexes for course and teacher lookups and unique teacher identity, drops temporary tables"""
+    for row in fetchall(connection, "SELECT name FROM sqlite_master WHERE type == 'table' AND "
+                                    "name LIKE 'sqlitestudio_temp_table%'"):
+        connection.execute(f'DROP TABLE "{row[0]}"')
+    # teachers with the same identity are merged into the one with the least ID
+    connection.execute("CREATE TEMP TABLE TeachersMerge (duplicate INTEGER PRIMARY KEY, original INTEGER NOT NULL)")
+    connection.execute("INSERT INTO TeachersMerge SELECT duplicate, original FROM "
+                       "(SELECT id_teacher AS duplicate, MIN(id_teacher) OVER "
+                       "(PARTITION BY surname, name, patronymic, birth_date) AS original FROM Teachers) "
+                       "WHERE duplicate != original")
+    connection.execute("UPDATE CoursesTeachers SET id_teacher = "
+                       "(SELECT original FROM TeachersMerge WHERE duplicate == id_teacher) "
+                       "WHERE id_teacher IN (SELECT duplicate FROM TeachersMerge)")
+    connection.execute("DELETE FROM Teachers WHERE id_teacher IN (SELECT duplicate FROM TeachersMerge)")
+    connection.execute("DROP TABLE TeachersMerge")
+    connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS TeachersIdentity "
+                       "ON Teachers(surname, name, patronymic, birth_date)")
+    connection.execute("CREATE INDEX IF NOT EXISTS CoursesTeachersCourse ON CoursesTeachers(id_course)")
+    connection.execute("CREATE INDEX IF NOT EXISTS CoursesTeachersTeacher ON CoursesTeachers(id_teacher)")
+    connection.execute("CREATE INDEX IF NOT EXISTS ProgramCourse ON Program(id_course)")
+
+
+def add_sort_indexes(connection: sqlite3.Connection) -> None:
+    """Adds indexes for keyset pages of courses sorted by name and teachers sorted by surname"""
+    connection.execute("CREATE INDEX IF NOT EXISTS LocalCoursesName ON LocalCourses(name)")
+    connection.execute("CREATE INDEX IF NOT EXISTS OffsiteCoursesName ON OffsiteCourses(name)")
+    connection.execute("CREATE INDEX IF NOT EXISTS TeachersSurname ON Teachers(surname)")
+
+
+def fts5_available(connection: sqlite3.Connection) -> bool:
+    """Returns whether SQLite library is built with FTS5 full-text search"""
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.Fts5Probe USING fts5(probe)")
+    except sqlite3.OperationalError:
+        return False
+    connection.execute("DROP TABLE temp.Fts5Probe")
+    return True
+
+
+def add_course_search(connection: sqlite3.Connection) -> None:
+    """Adds full-text index of course names, addresses, teachers and topics kept in sync by triggers
+
+    Does nothing if SQLite library has no FTS5, Academy.search is not available then"""
+    if not fts5_available(connection):
+        return
+    teachers = ("(SELECT group_concat(Teachers.surname || ' ' || Teachers.name || ' ' || Teachers.patronymic, ' ') "
+                "FROM CoursesTeachers JOIN Teachers USING(id_teacher) WHERE CoursesTeachers.id_course == {id})")
+    topics = "(SELECT group_concat(id_topic, ' ') FROM Program WHERE Program.id_course == {id})"
+    connection.execute("CREATE VIRTUAL TABLE CourseSearch USING fts5(name, address, teachers, topics, "
+                       "prefix='2 3')")  # rowid of the row is ID of the course
+    for table, address in (('LocalCourses', "''"), ('OffsiteCourses', 'address')):
+        connection.execute(f"INSERT INTO CourseSearch(rowid, name, address, teachers, topics) "
+                           f"SELECT id_course, name, {address}, "
+                           f"coalesce({teachers.format(id=f'{table}.id_course')}, ''), "
+                           f"coalesce({topics.format(id=f'{table}.id_course')}, '') FROM {table}")
+        connection.execute(f"CREATE TRIGGER {table}SearchInsert AFTER INSERT ON {table} BEGIN "
+                           f"INSERT INTO CourseSearch(rowid, name, address, teachers, topics) "
+                           f"VALUES(NEW.id_course, NEW.name, {'NEW.address' if address == 'address' else address}, "
+                           f"coalesce({teachers.format(id='NEW.id_course')}, ''), "
+                           f"coalesce({topics.format(id='NEW.id_course')}, '')); END")
+        connection.execute(f"CREATE TRIGGER {table}SearchDelete AFTER DELETE ON {table} BEGIN "
+                           f"DELETE FROM CourseSearch WHERE rowid == OLD.id_course; END")
+        connection.execute(f"CREATE TRIGGER {table}SearchUpdate AFTER UPDATE ON {table} BEGIN "
+                           f"UPDATE CourseSearch SET name = NEW.name"
+                           f"{', address = NEW.address' if address == 'address' else ''} "
+                           f"WHERE rowid == OLD.id_course; END")
+    for event, row in (('INSERT', 'NEW'), ('DELETE', 'OLD')):
+        connection.execute(f"CREATE TRIGGER CoursesTeachersSearch{event.title()} AFTER {event} ON CoursesTeachers "
+                           f"BEGIN UPDATE CourseSearch SET teachers = "
+                           f"coalesce({teachers.format(id=f'{row}.id_course')}, '') "
+                           f"WHERE rowid == {row}.id_course; END")
+        connection.execute(f"CREATE TRIGGER ProgramSearch{event.title()} AFTER {event} ON Program BEGIN "
+                           f"UPDATE CourseSearch SET topics = coalesce({topics.format(id=f'{row}.id_course')}, '') "
+                           f"WHERE rowid == {row}.id_course; END")
+    connection.execute(f"CREATE TRIGGER TeachersSearchUpdate AFTER UPDATE ON Teachers BEGIN "
+                       f"UPDATE CourseSearch SET teachers = coalesce({teachers.format(id='CourseSearch.rowid')}, '') "
+                       f"WHERE rowid IN (SELECT id_course FROM CoursesTeachers "
+                       f"WHERE id_teacher == NEW.id_teacher); END")
+
+
+def add_cascade_support(connection: sqlite3.Connection) -> None:
+    """Adds index for cascades and checks of topics referenced by programs and keeps search index in sync
+    when topics of programs are renamed"""
+    connection.execute("CREATE INDEX IF NOT EXISTS ProgramTopic ON Program(id_topic)")
+    if fetchall(connection, "SELECT name FROM sqlite_master WHERE name == 'CourseSearch'"):
+        connection.execute("CREATE TRIGGER ProgramSearchUpdate AFTER UPDATE ON Program BEGIN "
+                           "UPDATE CourseSearch SET topics = coalesce((SELECT group_concat(id_topic, ' ') FROM Program "
+                           "WHERE Program.id_course == NEW.id_course), '') WHERE rowid == NEW.id_course; END")
+
+
+# summary table -> (columns, query that computes its rows from scratch)
+STATISTICS = {
+    'CourseStats': ("kind TEXT PRIMARY KEY, courses INTEGER NOT NULL",
+                    "SELECT 'local' AS kind, COUNT(*) AS courses FROM LocalCourses "
+                    "UNION ALL SELECT 'offsite', COUNT(*) FROM OffsiteCourses"),
+    'TeacherStats': ("id_teacher INTEGER PRIMARY KEY, courses INTEGER NOT NULL",
+                     "SELECT id_teacher, COUNT(*) AS courses FROM CoursesTeachers WHERE id_teacher IS NOT NULL "
+                     "GROUP BY id_teacher"),
+    'TopicStats': ("id_topic TEXT PRIMARY KEY, courses INTEGER NOT NULL",
+                   "SELECT CAST(id_topic AS TEXT) AS id_topic, COUNT(*) AS courses FROM Program "
+                   "GROUP BY CAST(id_topic AS TEXT)"),
+    'RoomStats': ("room INTEGER PRIMARY KEY, courses INTEGER NOT NULL",
+                  "SELECT room, COUNT(*) AS courses FROM LocalCourses WHERE room IS NOT NULL GROUP BY room"),
+}
+
+
+def count_triggers(table: str, column: str, source: str, key: str, condition: str = 'IS NOT NULL') -> list[str]:
+    """Returns triggers that keep number of rows of the source table per key in the summary table
+
+    Rows of the summary table are removed when their number drops to 0"""
+    increment = (f"INSERT INTO {table} VALUES(NEW.{key}, 1) "
+                 f"ON CONFLICT({column}) DO UPDATE SET courses = courses + 1;")
+    decrement = (f"UPDATE {table} SET courses = courses - 1 WHERE {column} == OLD.{key}; "
+                 f"DELETE FROM {table} WHERE {column} == OLD.{key} AND courses <= 0;")
+    return [f"CREATE TRIGGER {table}{source}Insert AFTER INSERT ON {source} WHEN NEW.{key} {condition} "
+            f"BEGIN {increment} END",
+            f"CREATE TRIGGER {table}{source}Delete AFTER DELETE ON {source} WHEN OLD.{key} {condition} "
+            f"BEGIN {decrement} END",
+            f"CREATE TRIGGER {table}{source}UpdateOld AFTER UPDATE OF {key} ON {source} "
+            f"WHEN OLD.{key} {condition} AND OLD.{key} IS NOT NEW.{key} BEGIN {decrement} END",
+            f"CREATE TRIGGER {table}{source}UpdateNew AFTER UPDATE OF {key} ON {source} "
+            f"WHEN NEW.{key} {condition} AND OLD.{key} IS NOT NEW.{key} BEGIN {increment} END"]
+
+
+def add_statistics(connection: sqlite3.Connection) -> None:
+    """Adds summary tables of courses per kind, teacher, topic and room kept up to date by triggers"""
+    for table, (columns, query) in STATISTICS.items():
+        connection.execute(f"CREATE TABLE {table} ({columns})")
+        connection.execute(f"INSERT INTO {table} {query}")
+    connection.execute("CREATE INDEX TeacherStatsCourses ON TeacherStats(courses)")
+    connection.execute("CREATE INDEX TopicStatsCourses ON TopicStats(courses)")
+    for kind, source in (('local', 'LocalCourses'), ('offsite', 'OffsiteCourses')):
+        connection.execute(f"CREATE TRIGGER CourseStats{source}Insert AFTER INSERT ON {source} "
+                           f"BEGIN UPDATE CourseStats SET courses = courses + 1 WHERE kind == '{kind}'; END")
+        connection.execute(f"CREATE TRIGGER CourseStats{source}Delete AFTER DELETE ON {source} "
+                           f"BEGIN UPDATE CourseStats SET courses = courses - 1 WHERE kind == '{kind}'; END")
+    triggers = (count_triggers('TeacherStats', 'id_teacher', 'CoursesTeachers', 'id_teacher')
+                + count_triggers('TopicStats', 'id_topic', 'Program', 'id_topic')
+                + count_triggers('RoomStats', 'room', 'LocalCourses', 'room'))
+    for trigger in triggers:
+        connection.execute(trigger)
+
+
+# table whose changes are logged -> its columns
+LOGGED_TABLES = {
+    'Courses': ('id_course',),
+    'LocalCourses': ('id_course', 'name', 'room'),
+    'OffsiteCourses': ('id_course', 'name', 'address'),
+    'CoursesTeachers': ('id_course', 'id_teacher'),
+    'Program': ('id_course', 'id_topic'),
+    'Teachers': ('id_teacher', 'surname', 'name', 'patronymic', 'birth_date'),
+}
+
+
+def json_row(alias: str, columns: tuple) -> str:
+    """Returns SQL expression of the row NEW or OLD of a trigger as JSON object of the columns"""
+    return "json_object(" + ", ".join(f"'{column}', {alias}.{column}" for column in columns) + ")"
+
+
+def add_changelog(connection: sqlite3.Connection) -> None:
+    """Adds append-only log of inserted, updated and deleted rows written by triggers
+
+    ID of a log entry only grows, so a reader continues after the last entry it has seen"""
+    connection.execute("CREATE TABLE ChangeLog (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                       "table_name TEXT NOT NULL, operation TEXT NOT NULL, row TEXT NOT NULL, old TEXT)")
+    for table, columns in LOGGED_TABLES.items():
+        new, old = json_row('NEW', columns), json_row('OLD', columns)
+        for event, operation, values in (('INSERT', 'insert', f"{new}, NULL"), ('UPDATE', 'update', f"{new}, {old}"),
+                                         ('DELETE', 'delete', f"{old}, NULL")):
+            connection.execute(f"CREATE TRIGGER {table}Log{event.title()} AFTER {event} ON {table} BEGIN "
+                               f"INSERT INTO ChangeLog(table_name, operation, row, old) "
+                               f"VALUES('{table}', '{operation}', {values}); END")
+
+
+def add_course_sequence(connection: sqlite3.Connection) -> None:
+    """Adds sequence of course IDs that writers reserve blocks of IDs from
+
+    Sequence stays above the greatest course ID also when a course is inserted with an ID not taken from it"""
+    connection.execute("CREATE TABLE Sequences (name TEXT PRIMARY KEY NOT NULL, next_id INTEGER NOT NULL)")
+    connection.execute("INSERT INTO Sequences SELECT 'Courses', COALESCE(MAX(id_course), 0) + 1 FROM Courses")
+    connection.execute("CREATE TRIGGER CoursesSequence AFTER INSERT ON Courses "
+                       "WHEN NEW.id_course >= (SELECT next_id FROM Sequences WHERE name == 'Courses') "
+                       "BEGIN UPDATE Sequences SET next_id = NEW.id_course + 1 WHERE name == 'Courses'; END")
+
+
+def conflict_trigger(table: str, column: str, message: str) -> str:
+    """Returns trigger that aborts insert of a session of the table overlapping another one of the same
+    room or teacher in column
+
+    Sessions of a room or teacher never overlap, so only the latest one starting before the new one ends
+    can overlap it: the check is one probe of the index by column and start time"""
+    return (f"CREATE TRIGGER {table}Conflict BEFORE INSERT ON {table} WHEN NEW.{column} IS NOT NULL AND "
+            f"(SELECT end_time FROM {table} WHERE {column} == NEW.{column} AND start_time < NEW.end_time "
+            f"ORDER BY start_time DESC LIMIT 1) > NEW.start_time BEGIN SELECT RAISE(ABORT, '{message}'); END")
+
+
+def add_timetable(connection: sqlite3.Connection) -> None:
+    """Adds sessions of courses with their time, room and teachers
+
+    Session keeps the room and teachers the course had when it was scheduled. Sessions of a room or teacher
+    must not overlap, the triggers reject an overlapping one whichever connection inserts it"""
+    connection.execute("CREATE TABLE Sessions (id_session INTEGER PRIMARY KEY NOT NULL, "
+                       "id_course INTEGER NOT NULL REFERENCES Courses (id_course) ON DELETE CASCADE "
+                       "ON UPDATE CASCADE, room INTEGER REFERENCES Rooms (room) ON DELETE SET NULL, "
+                       "start_time TEXT NOT NULL, end_time TEXT NOT NULL, CHECK (start_time < end_time))")
+    connection.execute("CREATE TABLE SessionTeachers (id_session INTEGER NOT NULL REFERENCES Sessions (id_session) "
+                       "ON DELETE CASCADE, id_teacher INTEGER NOT NULL REFERENCES Teachers (id_teacher) "
+                       "ON DELETE CASCADE, start_time TEXT NOT NULL, end_time TEXT NOT NULL, "
+                       "PRIMARY KEY (id_session, id_teacher))")
+    # the indexes cover the end time, so the conflict checks do not read the tables
+    connection.execute("CREATE INDEX SessionsRoom ON Sessions(room, start_time, end_time)")
+    connection.execute("CREATE INDEX SessionsCourse ON Sessions(id_course)")
+    connection.execute("CREATE INDEX SessionTeachersTeacher ON SessionTeachers(id_teacher, start_time, end_time)")
+    connection.execute(conflict_trigger('Sessions', 'room', 'Room is booked at the time of the session'))
+    connection.execute(conflict_trigger('SessionTeachers', 'id_teacher', 'Teacher is busy at the time of the session'))
+
+
+# migration to the version N is MIGRATIONS[N - 1]
+MIGRATIONS = [add_indexes, add_sort_indexes, add_course_search, add_cascade_support, add_statistics, add_changelog,
+              add_course_sequence, add_timetable]
+
+# statements that must be served by an index and the index expected in their query plan
+INDEXED_STATEMENTS = {
+    'teacher_courses': 'CoursesTeachersTeacher',
+    'course_teachers': 'CoursesTeachersCourse',
+    'program': 'ProgramCourse',
+    'insert_course_teacher': 'TeachersIdentity',
+    'room_previous_session': 'SessionsRoom',
+    'teacher_previous_session': 'SessionTeachersTeacher',
+}
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    """Returns version of the database schema"""
+    return fetchall(connection, "PRAGMA user_version")[0][0]
+
+
+def migrate(connection: sqlite3.Connection) -> int:
+    """Applies migrations newer than the database schema version, each in its own transaction
+
+    The version is read again under the write lock of every transaction, so processes opening a new database
+    together apply every migration once. Returns version of the database schema after migration"""
+    version = schema_version(connection)
+    while version < len(MIGRATIONS):
+        connection.commit()  # migration runs in a transaction of its own
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(connection)  # another process may have migrated while the lock was awaited
+            if version == 0:  # a new database in memory or file has no tables
+                create_schema(connection)
+            if version < len(MIGRATIONS):
+                MIGRATIONS[version](connection)
+                version += 1
+                connection.execute(f"PRAGMA user_version = {version}")
+        except Exception:
+            connection.rollback()
+            raise
+        connection.commit()
+    return version
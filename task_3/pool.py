@@ -0,0 +1,83 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from profiles import connect
+
+
+class ConnectionPool:
+    """Class that keeps a bounded set of read connections and a single write connection to the database"""
+
+    def __init__(self, db_location: str, size: int, row_factory=None, cached_statements: int = 128,
+                 write_lock: threading.RLock = None):
+        """Constructs ConnectionPool
+
+        Opens the write connection, switches the database to WAL mode so that readers do not wait for the writer
+        and opens size read connections. Location is a path or file: URI, a database in memory must be shared
+        between connections with cache=shared. Write lock of the pool is created unless the owner passes its own"""
+        if not isinstance(size, int):
+            raise TypeError
+        if size <= 0:
+            raise ValueError("Size of the pool must be integer and above 0")
+        self.__db_location = db_location
+        self.__row_factory = row_factory
+        self.__cached_statements = cached_statements
+        self.__writer = self.__connect()
+        self.__writer.execute("PRAGMA journal_mode=WAL")
+        self.__lock = write_lock if write_lock is not None else threading.RLock()
+        self.__readers = queue.LifoQueue(size)  # the most recently used connection has the warmest cache
+        for _ in range(size):
+            self.__readers.put(self.__connect())
+        self.__size = size
+
+    def __connect(self) -> sqlite3.Connection:
+        """Returns new connection to the database that can be passed between threads"""
+        connection = connect(self.__db_location, check_same_thread=False, cached_statements=self.__cached_statements)
+        connection.row_factory = self.__row_factory
+        return connection
+
+    @property
+    def size(self) -> int:
+        """Returns number of read connections"""
+        return self.__size
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """Returns the write connection"""
+        return self.__writer
+
+    @property
+    def write_lock(self) -> threading.RLock:
+        """Returns lock that must be held while using the write connection"""
+        return self.__lock
+
+    @contextmanager
+    def reader(self, timeout: float = None):
+        """Checks out a read connection for the duration of the with block
+
+        Waits for a free connection at most timeout seconds or forever if timeout is None"""
+        connection = self.__readers.get(timeout=timeout)
+        try:
+            yield connection
+        finally:
+            self.__readers.put(connection)
+
+    def configure(self, setup) -> None:
+        """Calls setup with every connection of the pool
+
+        Waits until all read connections are returned to the pool and the write connection is free"""
+        with self.__lock:
+            readers = [self.__readers.get() for _ in range(self.__size)]
+            try:
+                setup(self.__writer)
+                for connection in readers:
+                    setup(connection)
+            finally:
+                for connection in readers:
+                    self.__readers.put(connection)
+
+    def close(self) -> None:
+        """Closes all connections of the pool"""
+        for _ in range(self.__size):
+            self.__readers.get().close()
+        self.__writer.close()
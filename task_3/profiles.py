@@ -0,0 +1,53 @@
+import sqlite3
+
+# profile name -> PRAGMA settings, negative cache_size is in KiB
+PROFILES = {
+    'durable': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'cache_size': -2000, 'mmap_size': 0,
+                'temp_store': 'DEFAULT'},
+    'fast-bulk-load': {'journal_mode': 'MEMORY', 'synchronous': 'OFF', 'cache_size': -262144, 'mmap_size': 0,
+                       'temp_store': 'MEMORY'},
+    'read-mostly': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -65536, 'mmap_size': 268435456,
+                    'temp_store': 'MEMORY'},
+}
+PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store')
+
+
+def is_uri(db_location: str) -> bool:
+    """Returns whether the location of the database is an URI such as file:academy?mode=memory&cache=shared"""
+    return db_location.startswith('file:')
+
+
+def is_private_memory(db_location: str) -> bool:
+    """Returns whether every connection to the location opens a database of its own in memory"""
+    return db_location == ':memory:' or (is_uri(db_location) and 'mode=memory' in db_location
+                                         and 'cache=shared' not in db_location)
+
+
+def connect(db_location: str, **kwargs) -> sqlite3.Connection:
+    """Returns new connection to the database at the path, :memory: or file: URI"""
+    return sqlite3.connect(db_location, uri=is_uri(db_location), **kwargs)
+
+
+def apply_pragmas(connection: sqlite3.Connection, settings: dict, journal_mode: bool = True) -> dict:
+    """Sets PRAGMA settings of a profile or such as returned by pragmas on the connection
+
+    Journal mode is left as it is if journal_mode is False. Returns the settings the connection has after that,
+    databases in memory keep journal mode memory whatever the settings ask for"""
+    for pragma, value in settings.items():
+        if pragma not in PRAGMAS:
+            raise ValueError(f"Setting must be one of: {', '.join(PRAGMAS)}")
+        if pragma != 'journal_mode' or journal_mode:
+            connection.execute(f"PRAGMA {pragma} = {value}").fetchall()  # journal_mode returns the mode it set
+    return pragmas(connection)
+
+
+def pragmas(connection: sqlite3.Connection) -> dict:
+    """Returns current PRAGMA settings of the connection that profiles change"""
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    settings = {}
+    for pragma in PRAGMAS:
+        row = cursor.execute(f"PRAGMA {pragma}").fetchone()
+        if row is not None:  # databases in memory have no mmap_size
+            settings[pragma] = row[0]
+    return settings
@@ -0,0 +1,519 @@
+import json
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from itertools import chain, islice
+from operator import itemgetter
+from academy import Academy, check_dec
+from classes import Course, LocalCourse, OffsiteCourse, Teacher
+
+SHARD_IDS = 10 ** 12  # shard i holds courses with IDs from i * SHARD_IDS + 1 to (i + 1) * SHARD_IDS
+
+_academies = {}  # shard location -> Academy opened by a worker process
+
+
+def worker_academy(location: str) -> Academy:
+    """Returns Academy of the shard opened once per worker process"""
+    academy = _academies.get(location)
+    if academy is None:
+        academy = _academies[location] = Academy(location)
+    return academy
+
+
+def run_on_shard(location: str, function, args: tuple):
+    """Returns result of function called with Academy of the shard and args in a worker process"""
+    return function(worker_academy(location), *args)
+
+
+def call_method(academy: Academy, name: str, *args):
+    """Returns result of the named method of Academy called with args"""
+    return getattr(academy, name)(*args)
+
+
+def courses_report(academy: Academy, ids: list) -> list[str]:
+    """Returns the courses by IDs as strings of get_course_str followed by a new line in order of the IDs"""
+    return list(academy.iter_courses_report('listed_ids', (json.dumps(ids),)))
+
+
+def shard_stats(academy: Academy) -> dict:
+    """Returns all rows of the summary tables as {'courses': {kind: courses}, 'teachers': {id_teacher: courses},
+    'topics': {id_topic: courses}, 'rooms': {room: courses}}"""
+    return {'courses': {row['kind']: row['courses'] for row in academy.fetchall('stats_courses')},
+            'teachers': {row['id_teacher']: row['courses'] for row in academy.fetchall('all_teacher_stats')},
+            'topics': {row['id_topic']: row['courses'] for row in academy.fetchall('all_topic_stats')},
+            'rooms': {row['room']: row['courses'] for row in academy.fetchall('all_room_stats')}}
+
+
+def column(academy: Academy, statement: str, values) -> set:
+    """Returns the single column of the named statement over the values given to it as JSON array"""
+    return {value for row in academy.fetchall(statement, (json.dumps(list(values)),)) for value in row.values()}
+
+
+class ShardedAcademy:
+    """Class that implements Software Academy functionality over courses partitioned between several databases
+
+    Courses are split by ID ranges between shard databases, teachers, topics and rooms are kept in the reference
+    database and replicated to every shard, so a shard answers questions about its courses alone. Listings,
+    search and statistics are gathered from all shards and merged, lookups by course ID go to one shard.
+    Session timetables are not sharded: rooms and teachers are shared between shards"""
+
+    def __init__(self, directory: str, shards: int = 4, workers: int = None):
+        """Constructor of ShardedAcademy that starts work with the databases in the directory
+
+        Directory holds reference.db and shard0.db, shard1.db, ..., it is created if it does not exist and must
+        always be opened with the same number of shards. Every shard takes IDs of new courses from its own
+        sequence in its range, so shards never coordinate inserts and ID of a course tells its shard.
+        Fan-out calls run in parallel in workers processes (one per shard if workers is None)
+        or in this process one shard after another if workers is 0"""
+        if not (isinstance(shards, int) and (workers is None or isinstance(workers, int))):
+            raise TypeError
+        if shards <= 0 or (workers is not None and workers < 0):
+            raise ValueError("Number of shards must be above 0 and number of workers not below 0")
+        os.makedirs(directory, exist_ok=True)
+        self.__reference = Academy(os.path.join(directory, "reference.db"))
+        # Sequences also keep the number of shards and the last change of the reference a shard has applied
+        self.__reference.commit('init_sequence', ('Shards', shards))
+        stored = self.__reference.fetchone('sequence', ('Shards',))['next_id']
+        if stored != shards:
+            self.__reference.close()
+            raise ValueError(f"Directory holds academy of {stored} shards")
+        self.__locations = [os.path.join(directory, f"shard{i}.db") for i in range(shards)]
+        self.__shards = [Academy(location) for location in self.__locations]
+        for i, shard in enumerate(self.__shards):
+            shard.execute('start_course_ids', (i * SHARD_IDS + 1,))
+            shard.commit('init_sequence', ('ReferenceLog', 0))
+        self.__workers = shards if workers is None else workers
+        self.__executor = None  # started on the first fan-out call
+        self.__id_course = None
+        sizes = [sum(row['courses'] for row in shard.fetchall('stats_courses')) for shard in self.__shards]
+        self.__next_shard = sizes.index(min(sizes))  # shard of the next inserted course, they take turns
+        self.__replicate()
+
+    def close(self) -> None:
+        """Stops the worker processes and closes connections with the databases"""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+        for academy in (self.__reference, *self.__shards):
+            academy.close()
+
+    @property
+    def shards(self) -> int:
+        """Returns number of shards"""
+        return len(self.__shards)
+
+    @property
+    def id_course(self) -> int:
+        """Returns ID of the course inserted last one by one"""
+        return self.__id_course
+
+    def __shard_index(self, id_course: int) -> int:
+        """Returns index of the shard that holds the course by ID"""
+        return (id_course - 1) // SHARD_IDS
+
+    def __shard(self, id_course: int) -> Academy:
+        """Returns Academy of the shard that holds the course by ID
+
+        IDs beyond the shards are looked up in the reference database that holds no courses"""
+        index = self.__shard_index(id_course)
+        return self.__shards[index] if 0 <= index < len(self.__shards) else self.__reference
+
+    def __scatter(self, function, calls: dict) -> dict:
+        """Returns results of function called with Academy of every shard by index and the arguments of the shard
+
+        Calls are given as {shard index: arguments}. The shards are queried in parallel by the worker processes,
+        results come as {shard index: result}"""
+        if not self.__workers:
+            return {index: function(self.__shards[index], *args) for index, args in calls.items()}
+        if self.__executor is None:  # spawned workers do not inherit connections of this process
+            self.__executor = ProcessPoolExecutor(self.__workers, mp_context=multiprocessing.get_context('spawn'))
+        futures = {index: self.__executor.submit(run_on_shard, self.__locations[index], function, args)
+                   for index, args in calls.items()}
+        return {index: future.result() for index, future in futures.items()}
+
+    def __gather(self, name: str, *args) -> list:
+        """Returns results of the named method of Academy called with args on every shard in order of the shards"""
+        return list(self.__scatter(call_method, {index: (name, *args)
+                                                 for index in range(len(self.__shards))}).values())
+
+    def __report(self, ids: list) -> str:
+        """Returns the courses by IDs as string of get_courses_report in order of the IDs
+
+        Every shard formats its courses with set-based queries, the strings are put back in order of the IDs"""
+        by_shard = {}
+        for id_course in ids:
+            by_shard.setdefault(self.__shard_index(id_course), []).append(id_course)
+        reports = self.__scatter(courses_report, {index: (shard_ids,) for index, shard_ids in by_shard.items()})
+        strings = dict(chain.from_iterable(zip(shard_ids, reports[index]) for index, shard_ids in by_shard.items()))
+        return ''.join(strings[id_course] for id_course in ids)
+
+    def __replicate(self) -> None:
+        """Applies changes of teachers in the reference database to every shard
+
+        Shard moves its cursor of the reference change log in the same transaction as it applies the changes,
+        so a change is applied exactly once even if the process stops in between. Changes applied by all shards
+        are pruned from the log"""
+        cursors = [shard.fetchone('sequence', ('ReferenceLog',))['next_id'] for shard in self.__shards]
+        changes = list(self.__reference.changes_since(min(cursors), ['Teachers']))
+        if not changes:
+            return
+        for shard, cursor in zip(self.__shards, cursors):
+            pending = [change for change in changes if change.cursor > cursor]
+            if not pending:
+                continue
+            with shard.transaction():
+                for change in pending:
+                    if change.operation == 'update':
+                        shard.execute('replica_update_teacher', {**change.row, 'old_id': change.old['id_teacher']})
+                    else:
+                        shard.execute(f'replica_{change.operation}_teacher', change.row)
+                shard.execute('set_sequence', ('ReferenceLog', pending[-1].cursor))
+        self.__reference.prune_changes(changes[-1].cursor)
+
+    def __add_references(self, courses) -> None:
+        """Adds teachers and topics of the courses to the reference database and replicates new teachers
+
+        Shards find the replicated teachers by identity when they insert the courses, so every teacher
+        has the same ID in all databases"""
+        courses = list(courses)
+        self.__reference.executemany('insert_teacher', {Academy.teacher_params(teacher): None for course in courses
+                                                        for teacher in course.teachers})
+        self.__reference.executemany('insert_topic', {(topic,): None for course in courses
+                                                      for topic in course.program})
+        self.__reference.commit()
+        self.__replicate()
+
+    def __insert(self, course: Course, method: str) -> None:
+        """Inserts course with the named insert method of Academy into the shard whose turn it is"""
+        self.__add_references([course])
+        shard = self.__shards[self.__next_shard]
+        getattr(shard, method)(course)
+        self.__next_shard = (self.__next_shard + 1) % len(self.__shards)
+        self.__id_course = shard.id_course
+
+    def insert_local(self, course: LocalCourse) -> None:
+        """Insert course into database as local"""
+        if not isinstance(course, LocalCourse):
+            raise TypeError
+        self.__insert(course, 'insert_local')
+
+    def insert_offsite(self, course: OffsiteCourse) -> None:
+        """Insert course into database as offsite"""
+        if not isinstance(course, OffsiteCourse):
+            raise TypeError
+        self.__insert(course, 'insert_offsite')
+
+    def import_courses(self, courses, batch_size: int = 1000) -> list:
+        """Insert local and offsite courses from the iterable by batches of batch_size
+
+        Every shard in turn gets a batch, the shards import their batches in parallel in the worker processes.
+        A shard commits its batch on its own: an error leaves the batches already imported by other shards.
+        Returns list of dictionaries with number, shard, size and duration of every batch"""
+        if not isinstance(batch_size, int):
+            raise TypeError
+        if batch_size <= 0:
+            raise ValueError("Batch size must be integer and above 0")
+        courses = iter(courses)
+        count = len(self.__shards)
+        stats = []
+        while batches := [batch for batch in (list(islice(courses, batch_size)) for _ in range(count)) if batch]:
+            for course in chain.from_iterable(batches):
+                if not isinstance(course, (LocalCourse, OffsiteCourse)):
+                    raise TypeError
+            self.__add_references(chain.from_iterable(batches))
+            calls = {(self.__next_shard + i) % count: ('import_courses', batch, batch_size)
+                     for i, batch in enumerate(batches)}
+            for index, batch_stats in self.__scatter(call_method, calls).items():
+                stats.extend({**batch, 'batch': len(stats) + 1, 'shard': index} for batch in batch_stats)
+            self.__next_shard = (self.__next_shard + len(batches)) % count
+        return stats
+
+    def delete_courses(self, ids, collect_garbage: bool = True) -> int:
+        """Deletes the courses by IDs together with their programs and teachers lists
+
+        Every shard deletes its courses in one transaction. If collect_garbage is True teachers and topics
+        of the courses that are left without courses in all shards are deleted too.
+        Returns number of deleted courses"""
+        ids = list(ids)
+        for value in ids:
+            if not isinstance(value, int):
+                raise TypeError
+            if value <= 0:
+                raise ValueError("Course ID must be integer and above 0")
+        by_shard = {}
+        for id_course in ids:
+            if self.__shard_index(id_course) < len(self.__shards):
+                by_shard.setdefault(self.__shard_index(id_course), []).append(id_course)
+        teachers, topics = set(), set()
+        if collect_garbage:  # a teacher or topic left without courses in one shard may still have them in another
+            for index, shard_ids in by_shard.items():
+                teachers |= column(self.__shards[index], 'listed_teachers', shard_ids)
+                topics |= column(self.__shards[index], 'listed_topics', shard_ids)
+        deleted = sum(self.__shards[index].delete_courses(shard_ids, collect_garbage=False)
+                      for index, shard_ids in by_shard.items())
+        for shard in self.__shards:
+            teachers -= column(shard, 'teachers_in_use', teachers) if teachers else set()
+            topics -= column(shard, 'topics_in_use', topics) if topics else set()
+        if teachers:
+            self.__reference.remove_teachers(teachers)
+            self.__replicate()
+        if topics:
+            for academy in (self.__reference, *self.__shards):
+                academy.commit('delete_listed_topics', (json.dumps(list(topics)),))
+        return deleted
+
+    def delete_course(self, id_course: int, collect_garbage: bool = True) -> bool:
+        """Deletes the course by ID, returns whether it existed"""
+        return self.delete_courses([id_course], collect_garbage) == 1
+
+    def add_room(self, id_room: int) -> None:
+        """Adds room to the list of rooms in Academy that are available for local courses"""
+        self.__reference.add_room(id_room)
+        for shard in self.__shards:
+            shard.add_room(id_room)
+
+    def add_teacher(self, teacher: Teacher) -> None:
+        """Adds teacher to the list of teachers that teach at Academy"""
+        self.__reference.add_teacher(teacher)
+        self.__replicate()
+
+    def remove_teachers(self, ids) -> int:
+        """Removes the teachers by IDs from Academy and from the courses they teach
+
+        Returns number of removed teachers"""
+        removed = self.__reference.remove_teachers(ids)
+        self.__replicate()  # teachers lists of the shards are cleaned up by ON DELETE CASCADE
+        return removed
+
+    def remove_teacher(self, id_teacher: int) -> bool:
+        """Removes the teacher by ID, returns whether the teacher existed"""
+        return self.remove_teachers([id_teacher]) == 1
+
+    def clear_all(self) -> None:
+        """Clears all tables of all databases"""
+        for shard in self.__shards:
+            shard.clear_all()
+        self.__reference.clear_all()
+        self.__replicate()
+
+    def get_all_courses(self) -> dict:
+        """Returns all courses held in Academy"""
+        return {'Local': self.get_all_local(), 'Offsite': self.get_all_offsite()}
+
+    def get_all_courses_str(self) -> str:
+        """Returns all courses held in Academy as string
+
+        Returns string as
+        {local courses}
+        {offsite courses}"""
+        result = self.get_all_local_str()
+        result += self.get_all_offsite_str()
+        return result
+
+    def get_all_local(self) -> list:
+        """Returns all local courses held in Academy"""
+        return list(chain.from_iterable(self.__gather('get_all_local')))
+
+    def get_all_local_str(self) -> str:
+        """Returns all local courses held in Academy as string"""
+        return ''.join(self.__gather('get_all_local_str'))
+
+    def get_all_offsite(self) -> list:
+        """Returns all offsite courses held in Academy"""
+        return list(chain.from_iterable(self.__gather('get_all_offsite')))
+
+    def get_all_offsite_str(self) -> str:
+        """Returns all offsite courses held in Academy as string"""
+        return ''.join(self.__gather('get_all_offsite_str'))
+
+    @check_dec
+    def get_course(self, id_course: int) -> Course:
+        """Returns course information found by course ID"""
+        return self.__shard(id_course).get_course(id_course)
+
+    @check_dec
+    def get_course_str(self, id_course: int) -> str:
+        """Returns course information found by course ID as string"""
+        return self.__shard(id_course).get_course_str(id_course)
+
+    @check_dec
+    def get_course_teachers(self, id_course: int) -> list:
+        """Returns all teachers of the course by course ID"""
+        return self.__shard(id_course).get_course_teachers(id_course)
+
+    @check_dec
+    def get_course_teachers_str(self, id_course: int) -> str:
+        """Returns all teachers of the course by course ID as string"""
+        return self.__shard(id_course).get_course_teachers_str(id_course)
+
+    @check_dec
+    def get_program(self, id_course: int) -> list[str]:
+        """Returns course program by course ID"""
+        return self.__shard(id_course).get_program(id_course)
+
+    @check_dec
+    def get_program_str(self, id_course: int) -> str:
+        """Returns course program by course ID as string"""
+        return self.__shard(id_course).get_program_str(id_course)
+
+    @check_dec
+    def get_teacher_courses(self, id_teacher: int) -> list:
+        """Returns all courses teacher teaches by teacher ID"""
+        return list(chain.from_iterable(self.__gather('get_teacher_courses', id_teacher)))
+
+    @check_dec
+    def get_teacher_courses_str(self, id_teacher: int) -> str:
+        """Returns all courses teacher teaches by teacher ID as string"""
+        return ''.join(self.__gather('get_teacher_courses_str', id_teacher))
+
+    def get_all_teachers(self) -> list:
+        """Returns all teachers that teach at Academy"""
+        return self.__reference.get_all_teachers()
+
+    def get_all_teachers_str(self) -> str:
+        """Returns all teachers that teach at Academy as string"""
+        return self.__reference.get_all_teachers_str()
+
+    def get_teacher(self, id_teacher: int):
+        """Returns teacher profile by ID"""
+        return self.__reference.get_teacher(id_teacher)
+
+    def get_teacher_str(self, id_teacher: int) -> str:
+        """Returns teacher profile by ID as string"""
+        return self.__reference.get_teacher_str(id_teacher)
+
+    def get_topics(self) -> list:
+        """Returns all topics that were studied at Academy"""
+        return self.__reference.get_topics()
+
+    def get_topics_str(self) -> str:
+        """Returns all topics that were studied at Academy as string"""
+        return self.__reference.get_topics_str()
+
+    def get_rooms(self) -> list:
+        """Returns rooms in Academy that are available for local courses"""
+        return self.__reference.get_rooms()
+
+    def get_rooms_str(self) -> str:
+        """Returns rooms in Academy that are available for local courses as string"""
+        return self.__reference.get_rooms_str()
+
+    def get_teachers_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_teacher',
+                          descending: bool = False) -> list:
+        """Returns page of at most limit teachers that follow the teacher with ID after_id in order of sort key"""
+        return self.__reference.get_teachers_page(limit, after_id, sort, descending)
+
+    def get_teachers_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_teacher',
+                              descending: bool = False) -> str:
+        """Returns page of at most limit teachers that follow the teacher with ID after_id as string"""
+        return self.__reference.get_teachers_page_str(limit, after_id, sort, descending)
+
+    def __page(self, table: str, limit: int, after_id: int, sort: str, descending: bool) -> list:
+        """Returns page of at most limit rows of the table of all shards that follow the course with ID after_id
+        in order of sort key and ID
+
+        Shards hold consecutive ID ranges, so a page by ID is read from one shard after another starting
+        from the shard of after_id. A page by name merges a page of every shard after the name of after_id"""
+        if not (isinstance(limit, int) and (after_id is None or isinstance(after_id, int))):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Page size must be integer and above 0")
+        count = len(self.__shards)
+        if sort == 'id_course':
+            first = 0 if after_id is None else min(max(self.__shard_index(after_id), 0), count)
+            if descending:
+                order = range(count - 1 if after_id is None else min(first, count - 1), -1, -1)
+            else:
+                order = range(first, count)
+            method = {'Courses': 'get_courses_page', 'LocalCourses': 'get_local_page',
+                      'OffsiteCourses': 'get_offsite_page'}[table]
+            rows = []
+            for index in order:
+                if len(rows) == limit:
+                    break
+                rows += getattr(self.__shards[index], method)(limit - len(rows), after_id, descending=descending)
+            return rows
+        if table == 'Courses' or sort != 'name':
+            raise ValueError(f"Pages of {table} can be sorted only by id_course"
+                             f"{'' if table == 'Courses' else ', name'}")
+        where, params = "", ()
+        if after_id is not None:
+            cursor = self.__shard(after_id).fetchone('local' if table == 'LocalCourses' else 'offsite', (after_id,))
+            if cursor is None:
+                return []
+            where, params = f"WHERE (name, id_course) {'<' if descending else '>'} (?, ?)", (cursor['name'], after_id)
+        order = 'DESC' if descending else 'ASC'
+        pages = self.__gather('fetchall', f"SELECT * FROM {table} {where} ORDER BY name {order}, id_course {order} "
+                                          f"LIMIT ?", (*params, limit))
+        return list(islice(merge(*pages, key=itemgetter('name', 'id_course'), reverse=descending), limit))
+
+    def get_courses_page(self, limit: int = 20, after_id: int = None, descending: bool = False) -> list:
+        """Returns page of at most limit IDs of courses that follow the course with ID after_id"""
+        return self.__page('Courses', limit, after_id, 'id_course', descending)
+
+    def get_courses_page_str(self, limit: int = 20, after_id: int = None, descending: bool = False) -> str:
+        """Returns page of at most limit courses that follow the course with ID after_id as string"""
+        return self.__report([row['id_course'] for row in self.get_courses_page(limit, after_id, descending)])
+
+    def get_local_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                       descending: bool = False) -> list:
+        """Returns page of at most limit local courses that follow the course with ID after_id in order of sort key"""
+        return self.__page('LocalCourses', limit, after_id, sort, descending)
+
+    def get_local_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                           descending: bool = False) -> str:
+        """Returns page of at most limit local courses that follow the course with ID after_id as string"""
+        return self.__report([row['id_course'] for row in self.get_local_page(limit, after_id, sort, descending)])
+
+    def get_offsite_page(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                         descending: bool = False) -> list:
+        """Returns page of at most limit offsite courses that follow the course with ID after_id in order of sort key"""
+        return self.__page('OffsiteCourses', limit, after_id, sort, descending)
+
+    def get_offsite_page_str(self, limit: int = 20, after_id: int = None, sort: str = 'id_course',
+                             descending: bool = False) -> str:
+        """Returns page of at most limit offsite courses that follow the course with ID after_id as string"""
+        return self.__report([row['id_course'] for row in self.get_offsite_page(limit, after_id, sort, descending)])
+
+    def search(self, text: str, limit: int = 20) -> list:
+        """Returns at most limit courses whose name, address, teachers or topics contain all words of the text
+
+        Every shard ranks its own courses, the best limit courses of every shard are merged by rank.
+        Word frequencies differ between shards, so the order may differ from the one of a single database"""
+        if not isinstance(limit, int):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Limit must be integer and above 0")
+        Academy.search_query(text)  # bad text fails before the shards are asked
+        return list(islice(merge(*self.__gather('search', text, limit), key=itemgetter('rank')), limit))
+
+    def search_str(self, text: str, limit: int = 20) -> str:
+        """Returns at most limit courses found by search as string"""
+        return self.__report([row['id_course'] for row in self.search(text, limit)])
+
+    def stats(self, limit: int = 10) -> dict:
+        """Returns numbers of local and offsite courses, limit teachers with the most courses, limit most taught
+        topics and number of courses held in every room
+
+        Summary tables of the shards are added up, a teacher or topic is counted over all shards"""
+        if not isinstance(limit, int):
+            raise TypeError
+        if limit <= 0:
+            raise ValueError("Limit must be integer and above 0")
+        courses, teachers, topics, rooms = Counter(), Counter(), Counter(), Counter()
+        for shard in self.__scatter(shard_stats, {index: () for index in range(len(self.__shards))}).values():
+            courses.update(shard['courses'])
+            teachers.update(shard['teachers'])
+            topics.update(shard['topics'])
+            rooms.update(shard['rooms'])
+        return {'courses': dict(courses),
+                'teachers': [{**self.__reference.get_teacher(id_teacher), 'courses': number}
+                             for id_teacher, number in teachers.most_common(limit)],
+                'topics': [{'id_topic': id_topic, 'courses': number} for id_topic, number in topics.most_common(limit)],
+                'rooms': [{'room': row['room'], 'courses': rooms[row['room']]}
+                          for row in sorted(self.get_rooms(), key=itemgetter('room'))]}
+
+    def stats_str(self, limit: int = 10) -> str:
+        """Returns statistics of Academy as string"""
+        return Academy.format_stats(self.stats(limit))
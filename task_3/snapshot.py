@@ -0,0 +1,121 @@
+from classes import Course, LocalCourse, OffsiteCourse, Teacher
+
+
+class Snapshot:
+    """Class that holds the whole academy catalogue in memory with lookups by course ID, teacher ID, topic and room
+
+    Lookups return the same rows as the queries of Academy do"""
+
+    def __init__(self, local: list, offsite: list, teachers: list, courses_teachers: list, program: list,
+                 topics: list, rooms: list, data_version: int):
+        """Constructs Snapshot
+
+        Initializes Snapshot with all rows of LocalCourses, OffsiteCourses, Teachers, CoursesTeachers, Program,
+        Topics and Rooms and data version of the database they were read at"""
+        self.data_version = data_version
+        self.stale = False  # set when Academy writes to the database after the snapshot was loaded
+        self.__local = local
+        self.__offsite = offsite
+        self.__teachers_list = teachers
+        self.__topics = topics
+        self.__rooms = rooms
+        self.__courses = {}
+        for course in offsite + local:  # local course wins like in Academy.get_course
+            self.__courses[course['id_course']] = course
+        self.__teachers = {teacher['id_teacher']: teacher for teacher in teachers}
+        self.__course_teachers, self.__teacher_courses = {}, {}
+        for row in courses_teachers:
+            self.__course_teachers.setdefault(row['id_course'], []).append({'id_teacher': row['id_teacher']})
+            self.__teacher_courses.setdefault(row['id_teacher'], []).append({'id_course': row['id_course']})
+        self.__program, self.__topic_courses = {}, {}
+        for row in program:
+            self.__program.setdefault(row['id_course'], []).append({'id_topic': row['id_topic']})
+            self.__topic_courses.setdefault(row['id_topic'], []).append(row['id_course'])
+        self.__room_courses = {}
+        for course in local:
+            self.__room_courses.setdefault(course['room'], []).append(course['id_course'])
+        self.__course_objects, self.__teacher_objects = {}, {}
+
+    def get_all_local(self) -> list:
+        """Returns all local courses"""
+        return self.__local
+
+    def get_all_offsite(self) -> list:
+        """Returns all offsite courses"""
+        return self.__offsite
+
+    def get_course(self, id_course: int):
+        """Returns course found by course ID or None"""
+        return self.__courses.get(id_course)
+
+    def get_all_teachers(self) -> list:
+        """Returns all teachers"""
+        return self.__teachers_list
+
+    def get_teacher(self, id_teacher: int):
+        """Returns teacher profile by ID or None"""
+        return self.__teachers.get(id_teacher)
+
+    def get_teacher_courses(self, id_teacher: int) -> list:
+        """Returns all courses teacher teaches by teacher ID"""
+        return self.__teacher_courses.get(id_teacher, [])
+
+    def get_course_teachers(self, id_course: int) -> list:
+        """Returns all teachers of the course by course ID"""
+        return self.__course_teachers.get(id_course, [])
+
+    def get_topics(self) -> list:
+        """Returns all topics"""
+        return self.__topics
+
+    def get_rooms(self) -> list:
+        """Returns all rooms"""
+        return self.__rooms
+
+    def get_program(self, id_course: int) -> list:
+        """Returns course program by course ID"""
+        return self.__program.get(id_course, [])
+
+    def get_topic_courses(self, topic: str) -> list[int]:
+        """Returns IDs of courses that study the topic"""
+        return self.__topic_courses.get(topic, [])
+
+    def get_room_courses(self, room: int) -> list[int]:
+        """Returns IDs of local courses held in the room"""
+        return self.__room_courses.get(room, [])
+
+    def course_ids(self, courses_statement: str, params=()):
+        """Returns IDs of courses the named statement of Academy selects or None if it is not served from memory"""
+        if courses_statement == 'all_local_ids':
+            return [course['id_course'] for course in self.__local]
+        if courses_statement == 'all_offsite_ids':
+            return [course['id_course'] for course in self.__offsite]
+        if courses_statement == 'teacher_courses':
+            return [course['id_course'] for course in self.get_teacher_courses(*params)]
+        return None
+
+    def get_teacher_object(self, id_teacher: int) -> Teacher:
+        """Returns Teacher object of the teacher by ID or None
+
+        Teacher is created on the first request and linked to the objects of courses created before"""
+        teacher = self.__teacher_objects.get(id_teacher)
+        if teacher is None and id_teacher in self.__teachers:
+            row = self.__teachers[id_teacher]
+            teacher = Teacher.from_row(row)
+            self.__teacher_objects[id_teacher] = teacher
+        return teacher
+
+    def get_course_object(self, id_course: int) -> Course:
+        """Returns LocalCourse or OffsiteCourse object of the course by ID with its program and teachers or None
+
+        Course is created on the first request from the rows of the snapshot without validation: the database
+        has checked them, and legacy rows such as a course whose room was deleted are built as they are"""
+        course = self.__course_objects.get(id_course)
+        if course is None and id_course in self.__courses:
+            row = self.__courses[id_course]
+            program = [topic['id_topic'] for topic in self.get_program(id_course)]
+            teachers = [self.get_teacher_object(teacher['id_teacher'])
+                        for teacher in self.get_course_teachers(id_course)]
+            course = (LocalCourse if 'room' in row else OffsiteCourse).from_row(row, program, teachers)
+            self.__course_objects[id_course] = course
+        return course
@@ -0,0 +1,202 @@
+STATEMENTS = {
+    'reserve_course_ids': "UPDATE Sequences SET next_id = next_id + ? WHERE name == 'Courses' RETURNING next_id",
+    'insert_course': "INSERT INTO Courses VALUES(?)",
+    'insert_local': "INSERT OR IGNORE INTO LocalCourses \
+                    VALUES(?1, ?2, CASE WHEN ?3 IN (SELECT room FROM Rooms) THEN ?3 END)",
+    'insert_offsite': "INSERT OR IGNORE INTO OffsiteCourses VALUES(?, ?, ?)",
+    'insert_program': "INSERT OR IGNORE INTO Program VALUES(?, ?)",
+    'insert_topic': "INSERT OR IGNORE INTO Topics VALUES(?)",
+    'insert_teacher': "INSERT OR IGNORE INTO Teachers(surname, name, patronymic, birth_date) VALUES(?, ?, ?, ?)",
+    'insert_course_teacher': "INSERT OR IGNORE INTO CoursesTeachers VALUES(?, \
+                             (SELECT id_teacher FROM Teachers WHERE surname == ? AND name == ? AND patronymic == ? \
+                             AND birth_date == ?))",
+    'insert_room': "INSERT INTO Rooms VALUES(?)",
+    'create_selected': "CREATE TEMP TABLE IF NOT EXISTS Selected (id INTEGER PRIMARY KEY)",
+    'create_orphan_teachers': "CREATE TEMP TABLE IF NOT EXISTS OrphanTeachers (id_teacher INTEGER PRIMARY KEY)",
+    'create_orphan_topics': "CREATE TEMP TABLE IF NOT EXISTS OrphanTopics (id_topic TEXT PRIMARY KEY)",
+    'clear_selected': "DELETE FROM temp.Selected",
+    'insert_selected': "INSERT OR IGNORE INTO temp.Selected VALUES(?)",
+    'count_selected_courses': "SELECT COUNT(*) AS count FROM Courses WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'selected_teachers_courses': "SELECT DISTINCT id_course FROM CoursesTeachers \
+                                 WHERE id_teacher IN (SELECT id FROM temp.Selected)",
+    'collect_orphan_teachers': "INSERT OR IGNORE INTO temp.OrphanTeachers SELECT id_teacher FROM CoursesTeachers \
+                               WHERE id_course IN (SELECT id FROM temp.Selected) AND id_teacher IS NOT NULL",
+    'collect_orphan_topics': "INSERT OR IGNORE INTO temp.OrphanTopics SELECT id_topic FROM Program \
+                             WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_courses': "DELETE FROM Courses WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_local': "DELETE FROM LocalCourses WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_offsite': "DELETE FROM OffsiteCourses WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_program': "DELETE FROM Program WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_courses_teachers': "DELETE FROM CoursesTeachers WHERE id_course IN (SELECT id FROM temp.Selected)",
+    'delete_selected_teachers': "DELETE FROM Teachers WHERE id_teacher IN (SELECT id FROM temp.Selected)",
+    'delete_orphan_teachers': "DELETE FROM Teachers WHERE id_teacher IN (SELECT id_teacher FROM temp.OrphanTeachers) \
+                              AND NOT EXISTS (SELECT 1 FROM CoursesTeachers \
+                              WHERE CoursesTeachers.id_teacher == Teachers.id_teacher) \
+                              RETURNING id_teacher",
+    'delete_orphan_topics': "DELETE FROM Topics WHERE id_topic IN (SELECT id_topic FROM temp.OrphanTopics) \
+                            AND NOT EXISTS (SELECT 1 FROM Program WHERE Program.id_topic == Topics.id_topic)",
+    'clear_orphan_teachers': "DELETE FROM temp.OrphanTeachers",
+    'clear_orphan_topics': "DELETE FROM temp.OrphanTopics",
+    'rename_topic': "UPDATE OR IGNORE Topics SET id_topic = ?2 WHERE id_topic == ?1",
+    'move_program_topic': "UPDATE Program SET id_topic = ?2 WHERE id_topic == ?1",
+    'delete_duplicate_program': "DELETE FROM Program WHERE id_topic == ?1 AND rowid NOT IN \
+                                (SELECT MIN(rowid) FROM Program WHERE id_topic == ?1 GROUP BY id_course)",
+    'delete_topic': "DELETE FROM Topics WHERE id_topic == ?",
+    'changes_since': "SELECT * FROM ChangeLog WHERE id > ? ORDER BY id",
+    'changes_since_tables': "SELECT * FROM ChangeLog WHERE id > ? AND table_name IN (SELECT value FROM json_each(?)) \
+                            ORDER BY id",
+    'change_cursor': "SELECT coalesce(MAX(id), 0) AS cursor FROM ChangeLog",
+    'prune_changes': "DELETE FROM ChangeLog WHERE id <= ?",
+    'stats_courses': "SELECT kind, courses FROM CourseStats",
+    'stats_teachers': "SELECT Teachers.*, TeacherStats.courses FROM TeacherStats JOIN Teachers USING(id_teacher) \
+                      ORDER BY TeacherStats.courses DESC LIMIT ?",
+    'stats_topics': "SELECT id_topic, courses FROM TopicStats ORDER BY courses DESC LIMIT ?",
+    'stats_rooms': "SELECT Rooms.room, coalesce(RoomStats.courses, 0) AS courses FROM Rooms \
+                   LEFT JOIN RoomStats USING(room) ORDER BY Rooms.room",
+    'insert_session': "INSERT INTO Sessions(id_course, room, start_time, end_time) \
+                      SELECT id_course, room, ?2, ?3 FROM Courses LEFT JOIN LocalCourses USING(id_course) \
+                      WHERE id_course == ?1 RETURNING id_session",
+    'insert_session_teachers': "INSERT INTO SessionTeachers \
+                               SELECT DISTINCT id_session, id_teacher, start_time, end_time FROM Sessions \
+                               JOIN CoursesTeachers USING(id_course) WHERE id_session == ?",
+    'delete_session': "DELETE FROM Sessions WHERE id_session == ?",
+    'room_previous_session': "SELECT id_session, start_time, end_time FROM Sessions \
+                             WHERE room == ? AND start_time < ? ORDER BY start_time DESC LIMIT 1",
+    'teacher_previous_session': "SELECT id_session, start_time, end_time FROM SessionTeachers \
+                                WHERE id_teacher == ? AND start_time < ? ORDER BY start_time DESC LIMIT 1",
+    'room_sessions': "SELECT Sessions.*, coalesce(LocalCourses.name, OffsiteCourses.name) AS name FROM Sessions \
+                     LEFT JOIN LocalCourses USING(id_course) LEFT JOIN OffsiteCourses USING(id_course) \
+                     WHERE Sessions.room == ?1 AND Sessions.start_time < ?3 AND Sessions.end_time > ?2 \
+                     AND Sessions.start_time >= coalesce((SELECT start_time FROM Sessions \
+                     WHERE room == ?1 AND start_time <= ?2 ORDER BY start_time DESC LIMIT 1), '') \
+                     ORDER BY Sessions.start_time",
+    'teacher_sessions': "SELECT Sessions.*, coalesce(LocalCourses.name, OffsiteCourses.name) AS name \
+                        FROM SessionTeachers JOIN Sessions USING(id_session) \
+                        LEFT JOIN LocalCourses USING(id_course) LEFT JOIN OffsiteCourses USING(id_course) \
+                        WHERE SessionTeachers.id_teacher == ?1 AND SessionTeachers.start_time < ?3 \
+                        AND SessionTeachers.end_time > ?2 AND SessionTeachers.start_time >= \
+                        coalesce((SELECT start_time FROM SessionTeachers WHERE id_teacher == ?1 \
+                        AND start_time <= ?2 ORDER BY start_time DESC LIMIT 1), '') \
+                        ORDER BY SessionTeachers.start_time",
+    'course_sessions': "SELECT * FROM Sessions WHERE id_course == ? ORDER BY start_time",
+    'all_local': "SELECT * FROM LocalCourses ORDER BY id_course",
+    'all_offsite': "SELECT * FROM OffsiteCourses ORDER BY id_course",
+    'all_teachers': "SELECT * FROM Teachers ORDER BY id_teacher",
+    'all_topics': "SELECT * FROM Topics",
+    'all_rooms': "SELECT * FROM Rooms",
+    'all_courses_teachers': "SELECT id_course, id_teacher FROM CoursesTeachers ORDER BY id_course, rowid",
+    'all_program': "SELECT id_course, id_topic FROM Program ORDER BY id_course, rowid",
+    'local': "SELECT * FROM LocalCourses WHERE id_course == ?",
+    'offsite': "SELECT * FROM OffsiteCourses WHERE id_course == ?",
+    'teacher': "SELECT * FROM Teachers WHERE id_teacher == ?",
+    'teacher_courses': "SELECT id_course FROM CoursesTeachers WHERE id_teacher == ?",
+    'course_teachers': "SELECT id_teacher FROM CoursesTeachers WHERE id_course == ?",
+    'program': "SELECT id_topic FROM Program WHERE id_course == ?",
+    'all_local_ids': "SELECT id_course FROM LocalCourses ORDER BY id_course",
+    'all_offsite_ids': "SELECT id_course FROM OffsiteCourses ORDER BY id_course",
+    'range_teachers': "SELECT CoursesTeachers.id_course, Teachers.surname || ' ' || Teachers.name || ' ' || \
+                      Teachers.patronymic || ' (' || Teachers.birth_date || ')' AS teacher \
+                      FROM CoursesTeachers JOIN Teachers USING(id_teacher) \
+                      WHERE CoursesTeachers.id_course BETWEEN ? AND ? \
+                      ORDER BY CoursesTeachers.id_course, CoursesTeachers.rowid",
+    'range_program': "SELECT id_course, id_topic FROM Program WHERE id_course BETWEEN ? AND ? \
+                     ORDER BY id_course, rowid",
+    'range_course_teachers': "SELECT CoursesTeachers.id_course, Teachers.* \
+                             FROM CoursesTeachers JOIN Teachers USING(id_teacher) \
+                             WHERE CoursesTeachers.id_course BETWEEN ? AND ? ORDER BY CoursesTeachers.id_course, \
+                             CoursesTeachers.rowid",
+    'search': "SELECT rowid AS id_course, name, address, teachers, topics, \
+              bm25(CourseSearch, 10.0, 1.0, 3.0, 5.0) AS rank \
+              FROM CourseSearch WHERE CourseSearch MATCH ? ORDER BY rank LIMIT ?",
+    'search_ids': "SELECT rowid AS id_course FROM CourseSearch WHERE CourseSearch MATCH ? \
+                  ORDER BY bm25(CourseSearch, 10.0, 1.0, 3.0, 5.0) LIMIT ?",
+    'listed_ids': "SELECT value AS id_course FROM json_each(?) ORDER BY key",
+    'listed_teachers': "SELECT DISTINCT id_teacher FROM CoursesTeachers \
+                       WHERE id_course IN (SELECT value FROM json_each(?))",
+    'listed_topics': "SELECT DISTINCT id_topic FROM Program WHERE id_course IN (SELECT value FROM json_each(?))",
+    'teachers_in_use': "SELECT DISTINCT id_teacher FROM CoursesTeachers \
+                       WHERE id_teacher IN (SELECT value FROM json_each(?))",
+    'topics_in_use': "SELECT DISTINCT id_topic FROM Program WHERE id_topic IN (SELECT value FROM json_each(?))",
+    'delete_listed_topics': "DELETE FROM Topics WHERE id_topic IN (SELECT value FROM json_each(?))",
+    'all_teacher_stats': "SELECT id_teacher, courses FROM TeacherStats",
+    'all_topic_stats': "SELECT id_topic, courses FROM TopicStats",
+    'all_room_stats': "SELECT room, courses FROM RoomStats",
+    'init_sequence': "INSERT OR IGNORE INTO Sequences VALUES(?, ?)",
+    'sequence': "SELECT next_id FROM Sequences WHERE name == ?",
+    'set_sequence': "UPDATE Sequences SET next_id = ?2 WHERE name == ?1",
+    'start_course_ids': "UPDATE Sequences SET next_id = max(next_id, ?) WHERE name == 'Courses'",
+    'replica_insert_teacher': "INSERT OR IGNORE INTO Teachers(id_teacher, surname, name, patronymic, birth_date) \
+                              VALUES(:id_teacher, :surname, :name, :patronymic, :birth_date)",
+    'replica_update_teacher': "UPDATE Teachers SET id_teacher = :id_teacher, surname = :surname, name = :name, \
+                              patronymic = :patronymic, birth_date = :birth_date WHERE id_teacher == :old_id",
+    'replica_delete_teacher': "DELETE FROM Teachers WHERE id_teacher == :id_teacher",
+}
+
+REPORT_STATEMENTS = {
+    'report_local': "SELECT * FROM LocalCourses WHERE id_course IN ({courses})",
+    'report_offsite': "SELECT * FROM OffsiteCourses WHERE id_course IN ({courses})",
+    'report_teachers': "SELECT CoursesTeachers.id_course, Teachers.surname || ' ' || Teachers.name || ' ' || \
+                       Teachers.patronymic || ' (' || Teachers.birth_date || ')' AS teacher \
+                       FROM CoursesTeachers JOIN Teachers USING(id_teacher) \
+                       WHERE CoursesTeachers.id_course IN ({courses}) ORDER BY CoursesTeachers.rowid",
+    'report_program': "SELECT id_course, id_topic FROM Program WHERE id_course IN ({courses}) ORDER BY rowid",
+}
+
+
+class StatementRegistry:
+    """Class that holds named parameterized queries and counts their executions"""
+
+    def __init__(self, statements: dict = None):
+        """Constructs StatementRegistry
+
+        Initializes StatementRegistry with dictionary of statement names and queries"""
+        self.__statements = {}
+        self.__counters = {}
+        for name, query in (statements or {}).items():
+            self.register(name, query)
+
+    def __contains__(self, name) -> bool:
+        """Returns whether statement with the name is registered"""
+        return name in self.__statements
+
+    def register(self, name: str, query: str) -> None:
+        """Registers the query under the name"""
+        if not (isinstance(name, str) and isinstance(query, str)):
+            raise TypeError
+        if not (name and query):
+            raise ValueError("No data")
+        self.__statements[name] = ' '.join(query.split())  # one spelling per statement for the statement cache
+        self.__counters.setdefault(name, 0)
+
+    def derive(self, template: str, name: str) -> str:
+        """Returns name of the statement built from the report template over the query of the named statement
+
+        Registers the statement on first use"""
+        derived = f"{template}:{name}"
+        if derived not in self.__statements:
+            self.register(derived, REPORT_STATEMENTS[template].format(courses=self.__statements[name]))
+        return derived
+
+    def __getitem__(self, name: str) -> str:
+        """Returns the query registered under the name without counting its execution"""
+        return self.__statements[name]
+
+    def query(self, name: str) -> str:
+        """Returns the query registered under the name and counts its execution"""
+        query = self.__statements[name]
+        self.__counters[name] += 1
+        return query
+
+    @property
+    def counters(self) -> dict:
+        """Returns number of executions of every registered statement"""
+        return dict(self.__counters)
+
+    def reset_counters(self) -> None:
+        """Sets number of executions of every registered statement to zero"""
+        for name in self.__counters:
+            self.__counters[name] = 0
+
+    def __len__(self) -> int:
+        """Returns number of registered statements"""
+        return len(self.__statements)
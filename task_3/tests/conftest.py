@@ -0,0 +1,48 @@
+import pytest
+from academy import Academy
+from factories import CourseFactory, TeacherFactory
+from generator import Generator
+
+
+@pytest.fixture
+def academy():
+    """Yields Academy on a database in memory with room 1, two teachers and a local course taught by both"""
+    academy = Academy(':memory:')
+    academy.add_room(1)
+    for surname in ("Ivanenko", "Petrenko"):
+        academy.add_teacher(TeacherFactory.create_teacher(surname, "Olena", "Petrivna", "1980-01-21"))
+    course = CourseFactory.create_local("Python", 1, "loops", "classes")
+    for teacher in academy.get_all_teachers():
+        course.add_teacher(TeacherFactory.create_teacher(teacher['surname'], teacher['name'], teacher['patronymic'],
+                                                         teacher['birth_date']))
+    academy.insert_local(course)
+    yield academy
+    academy.close()
+
+
+@pytest.fixture
+def filled():
+    """Yields Academy on a database in memory filled with generated teachers, rooms and courses"""
+    academy = Academy(':memory:')
+    Generator(20, 60, rooms=5, topics=15, seed=1).fill(academy)
+    yield academy
+    academy.close()
+
+
+@pytest.fixture
+def change_catalogue():
+    """Returns function that inserts, updates, renames, removes and deletes rows of every table kept by triggers"""
+    def change(academy):
+        local = [row['id_course'] for row in academy.get_all_local()]
+        offsite = [row['id_course'] for row in academy.get_all_offsite()]
+        teacher = TeacherFactory.create_teacher("Newteacher", "Olena", "Petrivna", "1980-01-21")
+        academy.add_teacher(teacher)
+        course = CourseFactory.create_local("Python basics", 2, "loops", "new topic")
+        course.add_teacher(teacher)
+        academy.insert_local(course)
+        academy.update_course(local[0], CourseFactory.create_offsite("Moved", "Franka street", "loops"))
+        academy.update_course(offsite[0], CourseFactory.create_local("Moved back", 3, "json", "classes"))
+        academy.rename_topic(academy.get_topics()[0]['id_topic'], "renamed topic")
+        academy.remove_teacher(academy.get_all_teachers()[1]['id_teacher'])
+        academy.delete_courses(local[1:5] + offsite[1:3])
+    return change
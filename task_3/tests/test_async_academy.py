@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import pytest
+from async_academy import AsyncAcademy
+
+
+@pytest.fixture
+def location(tmp_path):
+    return str(tmp_path / "academy.db")
+
+
+def test_keyword_arguments(location):
+    async def run():
+        academy = AsyncAcademy(location, pool_size=2)
+        await academy.add_room(1)
+        ids = await academy.schedule_sessions([], skip_conflicts=True)
+        timetable = await academy.get_room_timetable(1, start="2030-01-01 10:00", end=None)
+        await academy.close()
+        return ids, timetable
+
+    assert asyncio.run(run()) == ([], [])
+
+
+def test_concurrent_reads_share_the_result(location):
+    async def run():
+        academy = AsyncAcademy(location, pool_size=2)
+        await academy.add_room(1)
+        first, second = await asyncio.gather(academy.get_rooms(), academy.get_rooms())
+        await academy.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == [{'room': 1}] and first is second
+
+
+def test_read_after_write_is_not_joined(location):
+    async def run():
+        academy = AsyncAcademy(location, pool_size=2)
+        get_rooms, started, release, calls = academy.academy.get_rooms, threading.Event(), threading.Event(), []
+
+        def slow_get_rooms():
+            calls.append(None)
+            started.set()
+            release.wait()
+            return get_rooms()
+
+        academy.academy.get_rooms = slow_get_rooms
+        before = asyncio.ensure_future(academy.get_rooms())
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        await academy.add_room(1)
+        after = asyncio.ensure_future(academy.get_rooms())
+        await asyncio.sleep(0)
+        release.set()
+        await before
+        rooms = await after
+        await academy.close()
+        return rooms, len(calls)
+
+    assert asyncio.run(run()) == ([{'room': 1}], 2)
@@ -0,0 +1,42 @@
+import io
+import json
+from batch import run_batch
+
+TEACHER = {'surname': "Sydorenko", 'name': "Olena", 'patronymic': "Petrivna", 'birth_date': "1980-01-21"}
+
+
+def run(academy, commands: list, group_size: int = 100):
+    output = io.StringIO()
+    summary = run_batch(academy, [json.dumps(command) for command in commands], output, group_size)
+    return summary, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def local(name: str) -> dict:
+    return {'command': 'insert_course', 'args': [{'type': 'local', 'name': name, 'room': 1, 'program': ["loops"],
+                                                  'teachers': [TEACHER]}]}
+
+
+def test_failing_command_is_rolled_back_alone(academy):
+    sessions = [[1, "2024-09-02 10:00", "2024-09-02 12:00"], [1, "2024-09-02 11:00", "2024-09-02 13:00"]]
+    schedule = {'command': 'schedule_sessions', 'args': [sessions], 'password': "admin", 'id': 7}
+    summary, results = run(academy, [local("Data"), schedule, local("Web")])
+    assert [result['ok'] for result in results] == [True, False, True]
+    assert results[1]['id'] == 7 and results[1]['error'].startswith("ValueError")
+    assert academy.get_course_sessions(1) == []  # the session scheduled before the conflict is undone too
+    assert [course['name'] for course in academy.get_all_local()] == ["Python", "Data", "Web"]
+    assert summary['commands'] == 3 and summary['errors'] == 1 and summary['groups'] == 1
+
+
+def test_commands_are_grouped(academy):
+    commands = [local(f"Course {number}") for number in range(5)]
+    summary, results = run(academy, commands + ["not a command", {'command': 'drop_table'}], group_size=3)
+    assert summary['groups'] == 3 and summary['errors'] == 2
+    assert [result['line'] for result in results] == list(range(1, 8))
+    assert [result['ok'] for result in results] == [True] * 5 + [False, False]
+    assert len(academy.get_all_local()) == 1 + 5
+
+
+def test_admin_command_needs_password(academy):
+    _, results = run(academy, [{'command': 'add_room', 'args': [2], 'password': "wrong"}])
+    assert not results[0]['ok'] and results[0]['error'].startswith("PermissionError")
+    assert academy.get_rooms() == [{'room': 1}]
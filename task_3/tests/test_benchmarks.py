@@ -0,0 +1,27 @@
+import sqlite3
+import pytest
+from benchmarks import batch_commands, build_objects, generate_courses, make_db, seed
+
+
+@pytest.mark.parametrize('count', [1, 200, 2000, 30000])
+def test_generate_courses(count):
+    courses = list(generate_courses(count))
+    assert len(courses) == count and all(len(course.teachers) == 2 for course in courses)
+
+
+def test_seed(tmp_path):
+    location = make_db(str(tmp_path))
+    seed(location, 200)
+    connection = sqlite3.connect(location)
+    assert connection.execute("SELECT COUNT(*) FROM Courses").fetchone() == (200,)
+    connection.close()
+
+
+def test_batch_commands():
+    lines, script = batch_commands(50, 10, 0.5)
+    assert len(lines.splitlines()) == 50 and script
+
+
+@pytest.mark.parametrize('kind', ["teachers", "teachers from rows", "courses", "courses from rows"])
+def test_build_objects(kind):
+    assert len(build_objects(kind, 2000)) == 2000
@@ -0,0 +1,40 @@
+from academy import Academy
+from cache import MISSING, LRUCache
+from factories import CourseFactory
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' becomes the least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is MISSING and cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats['evictions'] == 1 and len(cache) == 2
+
+
+def test_entries_expire():
+    now = [0.0]
+    cache = LRUCache(10, ttl=5, clock=lambda: now[0])
+    cache.put('a', 1)
+    now[0] = 4.9
+    assert cache.get('a') == 1
+    now[0] = 5.0
+    assert cache.get('a', None) is None
+    assert cache.stats['expirations'] == 1 and len(cache) == 0
+
+
+def test_writes_invalidate_cached_lookups():
+    academy = Academy(':memory:', cache_size=100)
+    academy.add_room(1)
+    academy.insert_local(CourseFactory.create_local("Python", 1, "loops"))
+    id_course = academy.id_course
+    assert academy.get_course(id_course)['name'] == "Python"
+    assert academy.get_course(id_course)['name'] == "Python"
+    assert academy.cache.stats['hits'] >= 1
+    academy.update_course(id_course, CourseFactory.create_local("Data", 1, "pandas"))
+    assert academy.get_course(id_course)['name'] == "Data"
+    assert [row['id_topic'] for row in academy.get_program(id_course)] == ["pandas"]
+    academy.delete_course(id_course)
+    assert academy.get_course(id_course) is None
+    academy.close()
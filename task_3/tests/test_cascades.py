@@ -0,0 +1,27 @@
+import pytest
+
+
+def topics(academy) -> list:
+    return sorted(row['id_topic'] for row in academy.get_topics())
+
+
+def program(academy) -> list:
+    return sorted(row['id_topic'] for row in academy.fetchall("SELECT id_topic FROM Program"))
+
+
+def test_rename_to_existing_topic_merges(academy):
+    academy.rename_topics({'loops': 'classes'})
+    assert topics(academy) == ['classes'] and program(academy) == ['classes']
+
+
+@pytest.mark.parametrize('names', [{'loops': 'classes', 'classes': 'json'}, {'loops': 'classes', 'classes': 'loops'}])
+def test_chained_and_swapped_renames_are_rejected(academy, names):
+    with pytest.raises(ValueError):
+        academy.rename_topics(names)
+    assert topics(academy) == ['classes', 'loops'] and program(academy) == ['classes', 'loops']
+
+
+def test_swap_through_unused_name(academy):
+    for names in ({'loops': 'swap'}, {'classes': 'loops'}, {'swap': 'classes'}):
+        academy.rename_topics(names)
+    assert topics(academy) == ['classes', 'loops'] and program(academy) == ['classes', 'loops']
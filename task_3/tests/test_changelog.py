@@ -0,0 +1,37 @@
+from collections import Counter
+from factories import TeacherFactory
+from migrations import LOGGED_TABLES
+
+
+def table_rows(academy, table: str) -> Counter:
+    """Returns rows of the table as tuples of the logged columns"""
+    columns = LOGGED_TABLES[table]
+    return Counter(tuple(row[column] for column in columns)
+                   for row in academy.fetchall(f"SELECT {', '.join(columns)} FROM {table}"))
+
+
+def test_change_log_replay(filled, change_catalogue):
+    cursor = filled.change_cursor()
+    replica = {table: table_rows(filled, table) for table in LOGGED_TABLES}
+    change_catalogue(filled)
+    for change in filled.changes_since(cursor, page_size=7):
+        columns = LOGGED_TABLES[change.table]
+        if change.operation in ('update', 'delete'):
+            replica[change.table][tuple((change.old or change.row)[column] for column in columns)] -= 1
+        if change.operation in ('insert', 'update'):
+            replica[change.table][tuple(change.row[column] for column in columns)] += 1
+        cursor = change.cursor
+    assert cursor == filled.change_cursor()
+    for table in LOGGED_TABLES:
+        assert +replica[table] == table_rows(filled, table), table
+
+
+def test_change_log_filter_and_prune(filled):
+    cursor = filled.change_cursor()
+    filled.add_teacher(TeacherFactory.create_teacher("Newteacher", "Olena", "Petrivna", "1980-01-21"))
+    filled.add_room(100)
+    changes = list(filled.changes_since(cursor, tables=['Teachers']))
+    assert [(change.table, change.operation, change.row['surname']) for change in changes] == [
+        ('Teachers', 'insert', "Newteacher")]
+    filled.prune_changes(filled.change_cursor())
+    assert list(filled.changes_since(0)) == []
@@ -0,0 +1,33 @@
+import pytest
+from factories import CourseFactory, TeacherFactory
+
+
+def make_teacher():
+    return TeacherFactory.create_teacher("Ivanenko", "Olena", "Petrivna", "1980-01-21")
+
+
+def test_collections_are_lists():
+    course = CourseFactory.create_local("Python", 1, "loops", "classes")
+    teacher = make_teacher()
+    course.add_teacher(teacher)
+    assert course.program[0] == "loops" and course.program[-1:] == ["classes"]
+    assert course.teachers[0] is teacher
+    assert teacher.courses[0] is course
+    course.teachers.clear()  # a copy: the course keeps its teachers
+    assert len(course.teachers) == 1
+
+
+def test_equal_teacher_is_a_duplicate():
+    course = CourseFactory.create_offsite("Python", "Franka street", "loops")
+    course.add_teacher(make_teacher())
+    with pytest.raises(ValueError):
+        course.add_teacher(make_teacher())
+    assert len(course.teachers) == 1
+
+
+def test_remove_teacher_by_equal_object():
+    course = CourseFactory.create_local("Python", 1, "loops")
+    teacher = make_teacher()
+    course.add_teacher(teacher)
+    course.remove_teacher(make_teacher())
+    assert course.teachers == [] and teacher.courses == []
@@ -0,0 +1,63 @@
+import gzip
+import pytest
+from academy import Academy
+from export import export_columnar, export_jsonl, read_columnar
+from loaders import course_from_record, load_jsonl
+
+TABLES = ('Teachers', 'LocalCourses', 'OffsiteCourses', 'CoursesTeachers', 'Program', 'Topics', 'Rooms')
+
+
+def test_backup_copies_the_database(filled, tmp_path):
+    steps = []
+    pages = filled.backup(str(tmp_path / "backup.db"), pages_per_step=2,
+                          progress=lambda status, remaining, total: steps.append(remaining))
+    copy = Academy(str(tmp_path / "backup.db"))
+    assert pages > 0 and len(steps) > 1 and steps[-1] == 0
+    assert copy.get_all_courses_str() == filled.get_all_courses_str()
+    copy.close()
+
+
+def test_course_records_rebuild_courses(filled):
+    records = list(filled.iter_course_records(page_size=7))
+    assert [record['id_course'] for record in records] == [
+        row['id_course'] for row in filled.get_all_local() + filled.get_all_offsite()]
+    for record in records:
+        course = course_from_record(record)
+        assert course.program == [row['id_topic'] for row in filled.get_program(record['id_course'])]
+        assert len(course.teachers) == len(filled.get_course_teachers(record['id_course']))
+
+
+def without_ids(academy) -> list:
+    return [{key: value for key, value in record.items() if key != 'id_course'}
+            for record in academy.iter_course_records()]
+
+
+def test_jsonl_export_imports_back(filled, tmp_path):
+    path = str(tmp_path / "courses.jsonl")
+    assert export_jsonl(filled, path, page_size=7) == len(filled.get_all_local()) + len(filled.get_all_offsite())
+    copy = Academy(':memory:')
+    for row in filled.get_rooms():
+        copy.add_room(row['room'])
+    copy.import_courses(load_jsonl(path))
+    assert without_ids(copy) == without_ids(filled)  # imported courses get new IDs
+    copy.close()
+
+
+def test_columnar_export_holds_every_row(filled, tmp_path):
+    path = str(tmp_path / "academy.gz")
+    counts = export_columnar(filled, path, row_group=16)
+    tables = {}
+    for table, columns in read_columnar(path):
+        names = list(columns)
+        tables.setdefault(table, []).extend(dict(zip(names, row)) for row in zip(*columns.values()))
+    for table in TABLES:
+        rows = filled.fetchall(f"SELECT * FROM {table}")
+        assert counts.get(table, 0) == len(rows) and tables.get(table, []) == rows, table
+
+
+def test_columnar_format_is_checked(tmp_path):
+    path = str(tmp_path / "other.gz")
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        file.write('{"format": "other"}\n')
+    with pytest.raises(ValueError):
+        list(read_columnar(path))
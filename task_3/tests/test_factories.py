@@ -0,0 +1,22 @@
+from factories import CourseFactory
+
+
+def test_create_many_local_skips_invalid_rows():
+    names = ["Python", "", "Data", "Web"]
+    rooms = [1, 2, 0, 4]
+    programs = [["loops"], ["json"], ["pandas"], "not a list"]
+    courses, errors = CourseFactory.create_many_local(names, rooms, programs)
+    assert list(errors) == [1, 2, 3]
+    assert errors[2] == {'room': "must be integer and above 0"}
+    assert courses[1:] == [None, None, None]
+    expected = CourseFactory.create_local("Python", 1, "loops")
+    assert (courses[0].name, courses[0].room, list(courses[0].program)) == (expected.name, 1, ["loops"])
+    assert not courses[0].teachers
+
+
+def test_create_many_offsite_matches_one_by_one():
+    courses, errors = CourseFactory.create_many_offsite(["Python", "Data"], ["Franka street", "Shevchenka street"],
+                                                        [["loops", "classes"], ["pandas"]])
+    assert errors == {}
+    assert [(course.name, course.address, list(course.program)) for course in courses] == [
+        ("Python", "Franka street", ["loops", "classes"]), ("Data", "Shevchenka street", ["pandas"])]
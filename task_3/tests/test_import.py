@@ -0,0 +1,44 @@
+import json
+import pytest
+from factories import CourseFactory, TeacherFactory
+from loaders import load_jsonl
+
+
+def make_courses(count: int) -> list:
+    teacher = TeacherFactory.create_teacher("Sydorenko", "Olena", "Petrivna", "1980-01-21")
+    courses = []
+    for number in range(count):
+        if number % 2:
+            course = CourseFactory.create_offsite(f"Course {number}", "Franka street", "json")
+        else:
+            course = CourseFactory.create_local(f"Course {number}", 1, "loops", "pandas")
+        course.add_teacher(teacher)
+        courses.append(course)
+    return courses
+
+
+def test_import_in_batches(academy):
+    stats = academy.import_courses(make_courses(25), batch_size=10)
+    assert [batch['courses'] for batch in stats] == [10, 10, 5]
+    assert len(academy.get_all_local()) == 1 + 13 and len(academy.get_all_offsite()) == 12
+    assert [teacher['surname'] for teacher in academy.get_all_teachers()] == ["Ivanenko", "Petrenko", "Sydorenko"]
+    assert sorted(topic['id_topic'] for topic in academy.get_topics()) == ["classes", "json", "loops", "pandas"]
+
+
+def test_failed_import_is_rolled_back(academy):
+    before = academy.get_all_courses_str()
+    with pytest.raises(TypeError):
+        academy.import_courses(make_courses(15) + ["not a course"], batch_size=10)
+    assert academy.get_all_courses_str() == before
+    assert len(academy.get_all_teachers()) == 2
+
+
+def test_load_jsonl(academy, tmp_path):
+    path = tmp_path / "courses.jsonl"
+    path.write_text(json.dumps({'type': 'local', 'name': "Data", 'room': 1, 'program': ["pandas"],
+                                'teachers': [{'surname': "Ivanenko", 'name': "Olena", 'patronymic': "Petrivna",
+                                              'birth_date': "1980-01-21"}]}) + '\n\n', encoding='utf-8')
+    academy.import_courses(load_jsonl(str(path)))
+    course = [row for row in academy.get_all_local() if row['name'] == "Data"][0]
+    assert [row['id_topic'] for row in academy.get_program(course['id_course'])] == ["pandas"]
+    assert len(academy.get_all_teachers()) == 2  # the teacher is matched to the existing one
@@ -0,0 +1,17 @@
+import pytest
+import main
+
+
+def test_batch_mode_closes_source_when_target_fails(academy, tmp_path, monkeypatch):
+    source = tmp_path / "commands.jsonl"
+    source.write_text('{"id": 1, "command": "get_rooms", "args": []}\n', encoding='utf-8')
+    opened = []
+
+    def recording_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(main, 'open', recording_open, raising=False)
+    with pytest.raises(FileNotFoundError):
+        main.run_batch_mode(academy, str(source), str(tmp_path / "missing" / "results.jsonl"), 10)
+    assert len(opened) == 1 and opened[0].closed
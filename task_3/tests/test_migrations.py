@@ -0,0 +1,51 @@
+import sqlite3
+import threading
+import migrations
+from academy import Academy
+from migrations import INDEXED_STATEMENTS, MIGRATIONS, migrate, schema_version
+
+
+def test_statements_use_indexes(academy):
+    for name, index in INDEXED_STATEMENTS.items():
+        query = academy.statements[name]
+        plan = academy.explain(query, (1,) * query.count('?'))
+        assert any(index in step for step in plan), (name, plan)
+
+
+def test_up_to_date_database_is_not_migrated(tmp_path, monkeypatch):
+    location = str(tmp_path / "academy.db")
+    academy = Academy(location)
+    academy.open()
+    academy.close()
+    applied = []
+    monkeypatch.setattr(migrations, 'create_schema', applied.append)
+    monkeypatch.setattr(migrations, 'MIGRATIONS', [applied.append] * len(MIGRATIONS))
+    academy = Academy(location)
+    assert academy.get_rooms() == []
+    academy.close()
+    assert applied == []
+
+
+def test_concurrent_openers_migrate_once(tmp_path):
+    location = str(tmp_path / "academy.db")
+    openers = 4
+    barrier, errors, versions = threading.Barrier(openers), [], []
+
+    def open_database() -> None:
+        connection = sqlite3.connect(location, timeout=30, check_same_thread=False)
+        barrier.wait()  # all of them find a new database
+        try:
+            versions.append(migrate(connection))
+        except sqlite3.Error as error:
+            errors.append(error)
+        connection.close()
+
+    threads = [threading.Thread(target=open_database) for _ in range(openers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and versions == [len(MIGRATIONS)] * openers
+    connection = sqlite3.connect(location)
+    assert schema_version(connection) == len(MIGRATIONS)
+    connection.close()
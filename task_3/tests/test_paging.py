@@ -0,0 +1,34 @@
+import pytest
+from factories import TeacherFactory
+
+PAGES = [('get_local_page', 'LocalCourses', 'id_course', 'name'),
+         ('get_offsite_page', 'OffsiteCourses', 'id_course', 'name'),
+         ('get_teachers_page', 'Teachers', 'id_teacher', 'surname')]
+
+
+@pytest.mark.parametrize('method, table, id_column, sort_key', PAGES)
+@pytest.mark.parametrize('descending', [False, True])
+def test_keyset_pages_match_offset_pages(filled, method, table, id_column, sort_key, descending):
+    for name in ("Olena", "Petro", "Taras"):  # equal sort keys are ordered by ID
+        filled.add_teacher(TeacherFactory.create_teacher("Kovalenko", name, "Petrivna", "1980-01-21"))
+    order = 'DESC' if descending else 'ASC'
+    for sort in (id_column, sort_key):
+        pages, after_id = [], None
+        while page := getattr(filled, method)(7, after_id, sort, descending):
+            pages.append(page)
+            after_id = page[-1][id_column]
+        order_by = f"{sort} {order}, {id_column} {order}" if sort != id_column else f"{id_column} {order}"
+        expected = [filled.fetchall(f"SELECT * FROM {table} ORDER BY {order_by} LIMIT 7 OFFSET ?", (offset,))
+                    for offset in range(0, 7 * len(pages), 7)]
+        assert pages == expected and sum(len(page) for page in pages) == len(filled.fetchall(f"SELECT * FROM {table}"))
+
+
+def test_page_str_matches_rows(filled):
+    page = filled.get_local_page(5, filled.get_local_page(5)[-1]['id_course'])
+    assert filled.get_local_page_str(5, filled.get_local_page(5)[-1]['id_course']) == ''.join(
+        filled.get_course_str(row['id_course']) + '\n' for row in page)
+
+
+def test_unknown_sort_key_is_rejected(filled):
+    with pytest.raises(ValueError):
+        filled.get_local_page(5, None, 'room')
@@ -0,0 +1,60 @@
+import queue
+import sqlite3
+import threading
+import pytest
+from academy import Academy
+from pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "academy.db"), 2)
+    pool.writer.execute("CREATE TABLE Rooms (room INTEGER PRIMARY KEY)")
+    pool.writer.commit()
+    yield pool
+    pool.close()
+
+
+def test_readers_do_not_wait_for_the_writer(pool):
+    with pool.write_lock:
+        pool.writer.execute("INSERT INTO Rooms VALUES(1)")  # the transaction stays open
+        with pool.reader() as connection:
+            assert connection.execute("SELECT COUNT(*) FROM Rooms").fetchone() == (0,)
+        pool.writer.commit()
+    with pool.reader() as connection:
+        assert connection.execute("SELECT COUNT(*) FROM Rooms").fetchone() == (1,)
+
+
+def test_readers_are_bounded(pool):
+    with pool.reader(), pool.reader():
+        with pytest.raises(queue.Empty):
+            with pool.reader(timeout=0.01):
+                pass
+    with pool.reader(timeout=0.01) as connection:  # returned connections are reused
+        assert isinstance(connection, sqlite3.Connection)
+
+
+def test_pooled_academy_is_shared_between_threads(tmp_path):
+    academy = Academy(str(tmp_path / "academy.db"), pool_size=3)
+    errors = []
+
+    def work(first: int) -> None:
+        try:
+            for room in range(first, first + 20):
+                academy.add_room(room)
+                assert {'room': room} in academy.get_rooms()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(first,)) for first in range(1, 101, 20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and len(academy.get_rooms()) == 100
+    academy.close()
+
+
+def test_private_memory_database_is_not_pooled():
+    with pytest.raises(ValueError):
+        Academy(':memory:', pool_size=2)
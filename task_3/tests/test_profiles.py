@@ -0,0 +1,52 @@
+import pytest
+from academy import Academy
+
+
+def pragma(academy, name: str):
+    return list(academy.fetchone(f"PRAGMA {name}").values())[0]
+
+
+@pytest.fixture
+def location(tmp_path):
+    return str(tmp_path / "academy.db")
+
+
+def test_profile_is_applied_on_open(location):
+    academy = Academy(location, profile='read-mostly')
+    assert academy.profile == 'read-mostly'
+    assert (pragma(academy, 'journal_mode'), pragma(academy, 'synchronous'), pragma(academy, 'cache_size')) == (
+        'wal', 1, -65536)
+    academy.close()
+
+
+def test_use_profile_restores_settings(location):
+    academy = Academy(location)
+    before = pragma(academy, 'synchronous'), pragma(academy, 'cache_size')
+    with academy.use_profile('fast-bulk-load') as settings:
+        assert settings['synchronous'] == 0 and academy.profile == 'fast-bulk-load'
+    assert (pragma(academy, 'synchronous'), pragma(academy, 'cache_size')) == before and academy.profile is None
+    academy.close()
+
+
+def test_pooled_academy_stays_in_wal_mode(location):
+    academy = Academy(location, pool_size=2)
+    assert academy.set_profile('fast-bulk-load')['journal_mode'] == 'wal'
+    academy.close()
+
+
+def test_unknown_profile_is_rejected(location):
+    with pytest.raises(ValueError):
+        Academy(location, profile='fastest')
+    academy = Academy(location)
+    with pytest.raises(ValueError):
+        academy.set_profile('fastest')
+    academy.close()
+
+
+def test_shared_memory_uri():
+    location = "file:profiles_test?mode=memory&cache=shared"
+    first, second = Academy(location, pool_size=2), Academy(location)
+    first.add_room(1)
+    assert second.get_rooms() == [{'room': 1}]
+    second.close()
+    first.close()
@@ -0,0 +1,20 @@
+def per_course(academy, courses: list) -> str:
+    """Returns the courses as string built with get_course_str, a query per course, teacher and program"""
+    return ''.join(academy.get_course_str(course['id_course']) + '\n' for course in courses)
+
+
+def test_report_matches_per_course_output(filled):
+    assert filled.get_all_local_str() == per_course(filled, filled.get_all_local())
+    assert filled.get_all_offsite_str() == per_course(filled, filled.get_all_offsite())
+    assert filled.get_all_courses_str() == per_course(filled, filled.get_all_local() + filled.get_all_offsite())
+    assert filled.get_courses_report('all_local_ids') == per_course(filled, filled.get_all_local())
+    for id_teacher in (1, 7, 20):
+        assert filled.get_teacher_courses_str(id_teacher) == per_course(filled, filled.get_teacher_courses(id_teacher))
+
+
+def test_report_of_courses_without_teachers_and_rooms(filled):
+    room = filled.get_all_local()[0]['room']
+    filled.execute("DELETE FROM CoursesTeachers")
+    filled.execute("DELETE FROM Rooms WHERE room == ?", (room,))  # courses in the room keep no room
+    filled.commit()
+    assert filled.get_all_courses_str() == per_course(filled, filled.get_all_local() + filled.get_all_offsite())
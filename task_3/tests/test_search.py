@@ -0,0 +1,31 @@
+from factories import CourseFactory
+
+
+def found(academy, text: str) -> list:
+    return sorted(row['id_course'] for row in academy.search(text))
+
+
+def test_search_follows_inserts_and_updates(academy):
+    id_course = academy.id_course
+    assert found(academy, "python") == found(academy, "Pyth*") == found(academy, "petrenko loops") == [id_course]
+    academy.update_course(id_course, CourseFactory.create_offsite("Data", "Franka street", "pandas"))
+    assert found(academy, "python") == found(academy, "loops") == found(academy, "petrenko") == []
+    assert found(academy, "data") == found(academy, "franka") == found(academy, "pandas") == [id_course]
+
+
+def test_search_follows_renames_and_removals(academy):
+    id_course = academy.id_course
+    academy.rename_topic("loops", "iterators")
+    assert found(academy, "loops") == [] and found(academy, "iterators") == [id_course]
+    academy.remove_teacher(academy.get_all_teachers()[0]['id_teacher'])
+    assert found(academy, "ivanenko") == [] and found(academy, "petrenko") == [id_course]
+    academy.execute("UPDATE Teachers SET surname = 'Sydorenko' WHERE surname == 'Petrenko'")
+    academy.commit()
+    assert found(academy, "petrenko") == [] and found(academy, "sydorenko") == [id_course]
+    academy.delete_course(id_course)
+    assert found(academy, "python") == [] and academy.search_str("python") == ""
+
+
+def test_punctuation_has_no_special_meaning(academy):
+    assert found(academy, '"python') == found(academy, "python*") == [academy.id_course]
+    assert found(academy, "python AND") == found(academy, "python NOT") == []  # words, not operators
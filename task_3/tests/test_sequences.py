@@ -0,0 +1,19 @@
+from academy import Academy
+from factories import CourseFactory
+
+
+def test_reserved_ids_do_not_repeat(tmp_path):
+    location = str(tmp_path / "academy.db")
+    writers = [Academy(location, id_block=3), Academy(location, id_block=3)]
+    writers[0].add_room(1)
+    ids = []
+    for number in range(10):
+        writer = writers[number % 2]
+        writer.insert_local(CourseFactory.create_local(f"Course {number}", 1, "loops"))
+        ids.append(writer.id_course)
+    for writer in writers:
+        writer.close()
+    reader = Academy(location)
+    assert len(set(ids)) == 10
+    assert sorted(ids) == sorted(row['id_course'] for row in reader.get_all_local())
+    reader.close()
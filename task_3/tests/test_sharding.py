@@ -0,0 +1,76 @@
+import pytest
+from academy import Academy
+from generator import Generator
+from sharding import ShardedAcademy
+
+
+@pytest.fixture
+def academies(tmp_path):
+    """Yields ShardedAcademy of 3 shards run in this process and single Academy with the same generated data"""
+    generator = Generator(15, 40, rooms=4, topics=12, seed=2)
+    sharded, single = ShardedAcademy(str(tmp_path / "shards"), 3, 0), Academy(':memory:')
+    for academy in (sharded, single):
+        for room in generator.rooms():
+            academy.add_room(room)
+        for teacher in generator.teachers():
+            academy.add_teacher(teacher)
+        academy.import_courses(generator.courses())
+    yield sharded, single
+    sharded.close()
+    single.close()
+
+
+def names(courses: list) -> list:
+    return sorted(course['name'] for course in courses)
+
+
+def ids(courses: list) -> list:
+    return sorted(course['id_course'] for course in courses)
+
+
+def stats(academy) -> dict:
+    """Returns all statistics of the academy with rows of equal counts in the same order"""
+    result = academy.stats(100)
+    result['teachers'].sort(key=lambda row: (-row['courses'], row['id_teacher']))
+    result['topics'].sort(key=lambda row: (-row['courses'], row['id_topic']))
+    return result
+
+
+def test_fan_out_reads_match_single_database(academies):
+    sharded, single = academies
+    assert names(sharded.get_all_local()) == names(single.get_all_local())
+    assert names(sharded.get_all_offsite()) == names(single.get_all_offsite())
+    assert stats(sharded) == stats(single)
+    for id_teacher in (1, 5, 15):
+        assert ids(sharded.get_teacher_courses(id_teacher)) == ids(single.get_teacher_courses(id_teacher))
+    assert names(sharded.get_local_page(10, None, 'name')) == names(single.get_local_page(10, None, 'name'))
+
+
+def test_removed_teacher_is_replicated_to_shards(academies):
+    sharded, single = academies
+    for academy in (sharded, single):
+        assert academy.remove_teacher(3) is True
+        assert academy.get_teacher(3) is None
+    assert sharded.get_teacher_courses(3) == []
+    assert stats(sharded) == stats(single)
+
+
+def test_deletes_collect_garbage_across_shards(academies):
+    sharded, single = academies
+    deleted = ids(single.get_all_local())[:5]
+    assert sharded.delete_courses(deleted) == single.delete_courses(deleted) == 5
+    assert ids(sharded.get_all_local()) == ids(single.get_all_local())
+    assert [teacher['id_teacher'] for teacher in sharded.get_all_teachers()] == [
+        teacher['id_teacher'] for teacher in single.get_all_teachers()]
+    assert sorted(topic['id_topic'] for topic in sharded.get_topics()) == sorted(
+        topic['id_topic'] for topic in single.get_topics())
+    assert stats(sharded) == stats(single)
+
+
+def test_stats_str_matches_single_database(academies):
+    sharded, single = academies
+    sharded_lines, single_lines = sharded.stats_str(100).splitlines(), single.stats_str(100).splitlines()
+    # teachers and topics of equal counts may come in another order
+    assert sorted(sharded_lines[:-2]) == sorted(single_lines[:-2]) and sharded_lines[0] == single_lines[0]
+    assert sorted(sharded_lines[-2].split(" #")) == sorted(single_lines[-2].split(" #"))
+    assert sharded_lines[-1] == single_lines[-1]
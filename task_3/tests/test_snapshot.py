@@ -0,0 +1,27 @@
+import os
+import shutil
+from academy import Academy
+from classes import LocalCourse
+
+DB_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python_courses.db")
+
+
+def test_course_object_matches_rows(academy):
+    snapshot = academy.load_snapshot()
+    id_course = academy.get_all_local()[0]['id_course']
+    course = snapshot.get_course_object(id_course)
+    assert isinstance(course, LocalCourse)
+    assert (course.name, course.room, list(course.program)) == ("Python", 1, ["loops", "classes"])
+    assert sorted(teacher.surname for teacher in course.teachers) == ["Ivanenko", "Petrenko"]
+    teacher = snapshot.get_teacher_object(academy.get_course_teachers(id_course)[0]['id_teacher'])
+    assert course in teacher.courses
+
+
+def test_course_object_of_legacy_row(tmp_path):
+    location = str(tmp_path / "python_courses.db")
+    shutil.copy(DB_TEMPLATE, location)
+    academy = Academy(location)
+    row = academy.get_course(1)
+    course = academy.load_snapshot().get_course_object(1)  # the room of the course was deleted
+    assert (course.name, course.room) == (row['name'], row['room']) and course.room is None
+    academy.close()
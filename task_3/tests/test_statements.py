@@ -0,0 +1,29 @@
+import pytest
+from factories import CourseFactory
+from statements import StatementRegistry
+
+
+def test_quotes_are_stored_as_given(academy):
+    name, topic = 'O\'Brien "Python"', "x'); DROP TABLE Rooms; --"
+    academy.insert_local(CourseFactory.create_local(name, 1, topic))
+    assert academy.get_course(academy.id_course)['name'] == name
+    assert [row['id_topic'] for row in academy.get_program(academy.id_course)] == [topic]
+    assert academy.get_rooms() == [{'room': 1}]
+
+
+def test_statement_counters(academy):
+    before = academy.statement_counters['local']
+    academy.fetchone('local', (1,))
+    academy.fetchone('local', (2,))
+    assert academy.statement_counters['local'] == before + 2
+    assert academy.statements['local'] == ' '.join(academy.statements['local'].split())  # read without counting
+    assert academy.statement_counters['local'] == before + 2
+
+
+def test_registry_rejects_bad_statements():
+    registry = StatementRegistry({'one': "SELECT   1"})
+    assert registry['one'] == "SELECT 1" and 'two' not in registry
+    with pytest.raises(TypeError):
+        registry.register('two', None)
+    with pytest.raises(ValueError):
+        registry.register('', "SELECT 2")
@@ -0,0 +1,37 @@
+from collections import Counter
+
+
+def expected_stats(academy) -> dict:
+    """Returns statistics aggregated from the catalogue tables as stats does, without limits"""
+    local, offsite = academy.get_all_local(), academy.get_all_offsite()
+    teachers = Counter(row['id_teacher'] for row in academy.fetchall("SELECT id_teacher FROM CoursesTeachers"))
+    topics = Counter(row['id_topic'] for row in academy.fetchall("SELECT id_topic FROM Program"))
+    rooms = Counter(row['room'] for row in local)
+    return {'courses': {'local': len(local), 'offsite': len(offsite)},
+            'teachers': dict(teachers),
+            'topics': dict(topics),
+            'rooms': {row['room']: rooms[row['room']] for row in academy.get_rooms()}}
+
+
+def actual_stats(academy) -> dict:
+    """Returns statistics kept by triggers in the form of expected_stats"""
+    stats = academy.stats(10 ** 6)
+    return {'courses': {kind: count for kind, count in stats['courses'].items() if count},
+            'teachers': {row['id_teacher']: row['courses'] for row in stats['teachers'] if row['courses']},
+            'topics': {row['id_topic']: row['courses'] for row in stats['topics'] if row['courses']},
+            'rooms': {row['room']: row['courses'] for row in stats['rooms']}}
+
+
+def test_stats_match_aggregation(filled, change_catalogue):
+    assert actual_stats(filled) == expected_stats(filled)
+    change_catalogue(filled)
+    assert actual_stats(filled) == expected_stats(filled)
+    assert filled.check_stats() == {}
+
+
+def test_check_stats_repairs_tables(filled):
+    filled.execute("DELETE FROM TopicStats")
+    filled.commit()
+    differences = filled.check_stats(repair=True)
+    assert list(differences) == ['TopicStats'] and differences['TopicStats']['missing']
+    assert filled.check_stats() == {}
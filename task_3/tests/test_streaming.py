@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.mark.parametrize('page_size', [1, 7, 1000])
+def test_streams_match_lists(filled, page_size):
+    assert list(filled.iter_local(page_size)) == filled.get_all_local()
+    assert list(filled.iter_offsite(page_size)) == filled.get_all_offsite()
+    assert list(filled.iter_teachers(page_size)) == filled.get_all_teachers()
+    assert ''.join(filled.iter_courses_str(page_size)) == filled.get_all_courses_str()
+    assert ''.join(filled.iter_teachers_str(page_size)) == filled.get_all_teachers_str()
+    assert ''.join(filled.iter_topics_str(page_size)) == filled.get_topics_str()
+
+
+def test_stream_is_lazy(filled):
+    stream = filled.iter_local(page_size=5)
+    first = next(stream)
+    assert first == filled.get_all_local()[0]
+    stream.close()
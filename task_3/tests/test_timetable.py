@@ -0,0 +1,45 @@
+import pytest
+from factories import CourseFactory, TeacherFactory
+
+
+@pytest.fixture
+def timetable(academy):
+    """Adds room 2 and a local course in it taught by a new teacher to the academy fixture
+
+    Returns the academy and IDs of the course of the fixture and of the new one"""
+    teacher = TeacherFactory.create_teacher("Sydorenko", "Olena", "Petrivna", "1980-01-21")
+    academy.add_room(2)
+    academy.add_teacher(teacher)
+    first = academy.get_all_local()[0]['id_course']
+    course = CourseFactory.create_local("Data", 2, "pandas")
+    course.add_teacher(teacher)
+    academy.insert_local(course)
+    return academy, first, academy.id_course
+
+
+def test_session_conflicts_are_rejected(timetable):
+    academy, first, second = timetable
+    academy.schedule_session(first, "2030-01-01 10:00", "2030-01-01 11:00")
+    with pytest.raises(ValueError):  # the same room and teachers
+        academy.schedule_session(first, "2030-01-01 10:30", "2030-01-01 11:30")
+    academy.schedule_session(first, "2030-01-01 11:00", "2030-01-01 12:00")  # starts when the other one ends
+    academy.schedule_session(second, "2030-01-01 10:30", "2030-01-01 11:30")  # another room and teacher
+    academy.update_course(second, CourseFactory.create_local("Data", 1, "pandas"))  # now held in room 1
+    with pytest.raises(ValueError):
+        academy.schedule_session(second, "2030-01-01 09:30", "2030-01-01 10:30")
+    assert len(academy.get_room_timetable(1)) == 2 and len(academy.get_course_sessions(second)) == 1
+
+
+def test_teacher_conflict_across_rooms(timetable):
+    academy, first, second = timetable
+    teacher = academy.get_all_teachers()[0]  # teaches the first course
+    course = CourseFactory.create_offsite("Web", "Franka street", "html")
+    course.add_teacher(TeacherFactory.create_teacher(teacher['surname'], teacher['name'], teacher['patronymic'],
+                                                     teacher['birth_date']))
+    academy.insert_offsite(course)
+    academy.schedule_session(first, "2030-01-01 10:00", "2030-01-01 11:00")
+    ids = academy.schedule_sessions([(academy.id_course, "2030-01-01 10:30", "2030-01-01 11:30"),
+                                     (second, "2030-01-01 10:30", "2030-01-01 11:30")], skip_conflicts=True)
+    assert ids[0] is None and ids[1] is not None
+    conflicts = academy.find_conflicts(academy.id_course, "2030-01-01 10:45", "2030-01-01 12:00")
+    assert [session['id_course'] for session in conflicts] == [first]
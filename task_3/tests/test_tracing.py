@@ -0,0 +1,21 @@
+import logging
+
+
+def test_slow_query_log_keeps_row_counts(academy):
+    academy.trace(slow_threshold=0.0, logger=logging.getLogger("test.slow_queries"))
+    id_course = academy.get_all_local()[0]['id_course']
+    id_session = academy.schedule_session(id_course, "2030-01-01 10:00", "2030-01-01 11:00")
+    assert academy.cancel_session(id_session) is True
+    assert academy.cancel_session(id_session) is False
+    id_teacher = academy.get_all_teachers()[0]['id_teacher']
+    assert academy.remove_teacher(id_teacher) is True
+    assert academy.remove_teacher(id_teacher) is False
+    assert academy.delete_course(id_course) is True
+    assert academy.delete_course(id_course) is False
+
+
+def test_slow_query_log_reads_plan(academy, caplog):
+    academy.trace(slow_threshold=0.0)
+    with caplog.at_level(logging.WARNING, logger="academy.slow_queries"):
+        academy.get_all_teachers()
+    assert any("plan: SCAN Teachers" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,102 @@
+import re
+import threading
+from collections import deque
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\b\d+(?:\.\d+)?\b")  # string and number literals
+
+
+def statement_shape(statement: str, sql: str) -> str:
+    """Returns the name of the statement or its query with literals replaced by ? and whitespace collapsed"""
+    if statement != sql:
+        return statement
+    return ' '.join(LITERALS.sub('?', sql).split())
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Returns the sample below which the fraction of the sorted samples lie"""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+class QueryStats:
+    """Query hook that aggregates count, rows and latency percentiles per statement shape
+
+    Keeps the latest samples of every shape to compute percentiles in bounded memory"""
+
+    def __init__(self, samples: int = 1000):
+        """Constructs QueryStats keeping at most samples latencies per statement shape"""
+        if not isinstance(samples, int):
+            raise TypeError
+        if samples <= 0:
+            raise ValueError("Number of samples must be integer and above 0")
+        self.__samples = samples
+        self.__shapes = {}  # shape -> [count, total seconds, max seconds, rows, latest latencies]
+        self.__lock = threading.Lock()
+
+    def __call__(self, statement: str, sql: str, params, rows: int, seconds: float) -> None:
+        """Records execution of the statement"""
+        shape = statement_shape(statement, sql)
+        with self.__lock:
+            stats = self.__shapes.get(shape)
+            if stats is None:
+                stats = self.__shapes[shape] = [0, 0.0, 0.0, 0, deque(maxlen=self.__samples)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] += max(rows, 0)
+            stats[4].append(seconds)
+
+    def report(self) -> dict:
+        """Returns count, rows, total, p50, p99 and max latency in seconds of every statement shape"""
+        with self.__lock:
+            shapes = {shape: (stats[:4], sorted(stats[4])) for shape, stats in self.__shapes.items()}
+        return {shape: {'count': count, 'rows': rows, 'total': total, 'p50': percentile(samples, 0.5),
+                        'p99': percentile(samples, 0.99), 'max': longest}
+                for shape, ((count, total, longest, rows), samples) in shapes.items()}
+
+    def report_str(self) -> str:
+        """Returns statistics of statement shapes ordered by total time as string"""
+        result = f"{'count':>8} {'rows':>10} {'total s':>9} {'p50 ms':>8} {'p99 ms':>8}  statement\n"
+        for shape, stats in sorted(self.report().items(), key=lambda item: -item[1]['total']):
+            result += (f"{stats['count']:>8} {stats['rows']:>10} {stats['total']:>9.3f} {stats['p50'] * 1000:>8.3f} "
+                       f"{stats['p99'] * 1000:>8.3f}  {shape}\n")
+        return result
+
+    def reset(self) -> None:
+        """Forgets all recorded executions"""
+        with self.__lock:
+            self.__shapes.clear()
+
+
+class SlowQueryLog:
+    """Query hook that logs statements running longer than the threshold together with their query plan"""
+
+    def __init__(self, academy, threshold: float, logger=None):
+        """Constructs SlowQueryLog
+
+        Initializes SlowQueryLog with Academy to explain the statements with, threshold in seconds and logger,
+        logging is imported only when the default logger is needed as it is slow to import"""
+        if threshold < 0:
+            raise ValueError("Threshold must not be below 0")
+        self.__academy = academy
+        self.__threshold = threshold
+        if logger is None:
+            import logging
+            logger = logging.getLogger("academy.slow_queries")
+        self.__logger = logger
+        self.__explaining = threading.local()  # query plans are read by Academy and must not be logged themselves
+
+    def __call__(self, statement: str, sql: str, params, rows: int, seconds: float) -> None:
+        """Logs the statement if it ran longer than the threshold"""
+        if seconds < self.__threshold or getattr(self.__explaining, 'active', False):
+            return
+        plan = "not available"
+        if isinstance(params, (tuple, list, dict)) and sql.lstrip()[:7].upper() != 'EXPLAIN':
+            self.__explaining.active = True
+            try:
+                plan = ' / '.join(self.__academy.explain(sql, params))
+            except Exception as err:  # query plan is a hint, a failure to read it must not break the statement
+                plan = f"not available ({err})"
+            finally:
+                self.__explaining.active = False
+        self.__logger.warning("Slow query %s (%.3f ms, %d rows, parameters %r): %s; plan: %s",
+                              statement_shape(statement, sql), seconds * 1000, rows, params, sql, plan)
@@ -0,0 +1,96 @@
+import re
+from itertools import chain, compress, count
+from operator import not_
+from classes import BIRTH_DATE, FULL_NAME
+
+
+def invalid_strings(values: list, pattern: re.Pattern) -> list[int]:
+    """Returns indices of the values that are not strings fully matched by the pattern
+
+    Every distinct value is matched once, names and dates repeat a lot in a column,
+    rows with the invalid values are selected without Python-level iteration"""
+    match = pattern.fullmatch
+    try:
+        invalid = {value for value in set(values) if not (isinstance(value, str) and match(value))}
+    except TypeError:  # a value cannot be put into a set
+        return [i for i, value in enumerate(values) if not (isinstance(value, str) and match(value))]
+    if not invalid:
+        return []
+    return list(compress(count(), map(invalid.__contains__, values)))
+
+
+def invalid_texts(values: list) -> list[int]:
+    """Returns indices of the values that are not non-empty strings"""
+    if set(map(type, values)) <= {str}:
+        return list(compress(count(), map(not_, values)))
+    return [i for i, value in enumerate(values) if not (isinstance(value, str) and value)]
+
+
+def invalid_numbers(values: list) -> list[int]:
+    """Returns indices of the values that are not integers above 0"""
+    if set(map(type, values)) <= {int}:
+        return list(compress(count(), map((0).__ge__, values)))
+    return [i for i, value in enumerate(values) if not (isinstance(value, int) and value > 0)]
+
+
+def invalid_programs(programs: list) -> dict[int, str]:
+    """Returns error of every program that is not a list of distinct non-empty strings by its index"""
+    try:  # all programs are checked at once first, one by one only if some of them are invalid
+        if (set(map(type, programs)) <= {list, tuple}
+                and list(map(len, map(set, programs))) == list(map(len, programs))
+                and not invalid_texts(list(chain.from_iterable(programs)))):
+            return {}
+    except TypeError:  # a topic cannot be put into a set
+        pass
+    errors = {}
+    for i, program in enumerate(programs):
+        if not isinstance(program, (list, tuple)):
+            errors[i] = "must be a list of topics"
+        elif invalid_texts(program):
+            errors[i] = "topics must be non-empty strings"
+        elif len(set(program)) != len(program):
+            errors[i] = "topics must not repeat"
+    return errors
+
+
+def check_lengths(*columns: list) -> int:
+    """Returns number of rows of the columns that must all have the same length"""
+    lengths = {len(column) for column in columns}
+    if len(lengths) > 1:
+        raise ValueError("Columns must have the same number of rows")
+    return lengths.pop() if lengths else 0
+
+
+def report(errors: dict, field: str, rows, message: str) -> None:
+    """Adds the message about the field to the errors of the rows"""
+    for row in rows:
+        errors.setdefault(row, {})[field] = message
+
+
+def validate_teachers(surnames: list, names: list, patronymics: list, birth_dates: list) -> dict[int, dict[str, str]]:
+    """Checks columns of teacher records by the rules of Teacher
+
+    Returns errors of the invalid rows as {row index: {field: message}} ordered by row, empty if all rows are valid"""
+    check_lengths(surnames, names, patronymics, birth_dates)
+    errors = {}
+    for field, column in (('surname', surnames), ('name', names), ('patronymic', patronymics)):
+        report(errors, field, invalid_strings(column, FULL_NAME), "must be a capitalized word")
+    report(errors, 'birth_date', invalid_strings(birth_dates, BIRTH_DATE), "must be a date as YYYY-MM-DD")
+    return dict(sorted(errors.items()))
+
+
+def validate_courses(names: list, places: list, programs: list, local: bool = True) -> dict[int, dict[str, str]]:
+    """Checks columns of local (places are rooms) or offsite (places are addresses) course records
+    by the rules of LocalCourse or OffsiteCourse
+
+    Returns errors of the invalid rows as {row index: {field: message}} ordered by row, empty if all rows are valid"""
+    check_lengths(names, places, programs)
+    errors = {}
+    report(errors, 'name', invalid_texts(names), "must be a non-empty string")
+    if local:
+        report(errors, 'room', invalid_numbers(places), "must be integer and above 0")
+    else:
+        report(errors, 'address', invalid_texts(places), "must be a non-empty string")
+    for row, message in invalid_programs(programs).items():
+        report(errors, 'program', (row,), message)
+    return dict(sorted(errors.items()))